@@ -0,0 +1,12 @@
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 7):
+    # pyhive.aio uses async syntax and asyncio.get_running_loop
+    collect_ignore += [
+        'pyhive/aio/hive.py',
+        'pyhive/aio/presto.py',
+        'pyhive/aio/trino.py',
+        'pyhive/tests/test_aio_hive.py',
+        'pyhive/tests/test_aio_presto.py',
+    ]
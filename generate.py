@@ -38,7 +38,7 @@ def main(hive_server2_url):
     save_url(hive_server2_url)
     hive_server2_path = path.join(here, hive_server2_url.rsplit('/', 1)[-1])
 
-    subprocess.call(['thrift', '-r', '--gen', 'py', hive_server2_path])
+    subprocess.call(['thrift', '-r', '--gen', 'py:slots', hive_server2_path])
     shutil.move(path.join(here, PACKAGE), path.join(here, PACKAGE + '.old'))
     shutil.move(path.join(here, GENERATED, PACKAGE), path.join(here, PACKAGE))
     shutil.rmtree(path.join(here, PACKAGE + '.old'))
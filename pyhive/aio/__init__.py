@@ -0,0 +1 @@
+"""asyncio interfaces to Hive and Presto. These require Python 3.7 or later."""
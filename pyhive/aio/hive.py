@@ -0,0 +1,244 @@
+"""asyncio interface to HiveServer2, built on :py:mod:`pyhive.hive`.
+
+Queries are submitted with ``runAsync=True`` and their status is polled with ``asyncio.sleep`` in
+between, so a running query doesn't hold a thread. Each Thrift call runs in an executor, one at a
+time per connection, since a Thrift client can't be used by several threads at once. Many queries
+can therefore be in flight with only a small thread pool, either on separate connections or
+interleaved on a shared one.
+
+Usage::
+
+    connection = await pyhive.aio.hive.connect('localhost')
+    async with connection.cursor() as cursor:
+        await cursor.execute('SELECT * FROM my_awesome_data LIMIT 10')
+        async for row in cursor:
+            print(row)
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import asyncio
+import functools
+
+from TCLIService import ttypes
+from pyhive import hive
+from pyhive.exc import OperationalError, ProgrammingError
+
+_FAILED_STATES = {
+    ttypes.TOperationState.CANCELED_STATE,
+    ttypes.TOperationState.CLOSED_STATE,
+    ttypes.TOperationState.ERROR_STATE,
+    ttypes.TOperationState.UKNOWN_STATE,
+    ttypes.TOperationState.TIMEDOUT_STATE,
+}
+
+
+async def connect(*args, executor=None, **kwargs):
+    """Open a connection in an executor. See :py:class:`pyhive.hive.Connection` for arguments.
+
+    :param executor: A ``concurrent.futures.Executor`` to run the blocking Thrift calls in.
+        Defaults to the event loop's default executor.
+    :returns: a :py:class:`Connection` object.
+    """
+    loop = asyncio.get_running_loop()
+    connection = await loop.run_in_executor(
+        executor, functools.partial(hive.Connection, *args, **kwargs))
+    return Connection(connection, executor)
+
+
+class Connection(object):
+    """Wraps a :py:class:`pyhive.hive.Connection` for use from coroutines"""
+    _lock = None
+
+    def __init__(self, connection, executor=None):
+        self._connection = connection
+        self._executor = executor
+
+    async def _run(self, fn, *args):
+        """Call ``fn(*args)`` in the executor, after any other call on this connection finished"""
+        if self._lock is None:
+            # Before Python 3.10, a lock belongs to the event loop current when it's created, so
+            # wait until one is running
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self._run(self._connection.close)
+
+    def cursor(self, *args, poll_interval=1, **kwargs):
+        """Return a new :py:class:`Cursor`. See :py:class:`pyhive.hive.Cursor` for arguments.
+
+        :param poll_interval: How many seconds to wait between checks whether a query finished.
+        """
+        return Cursor(self, self._connection.cursor(*args, **kwargs), poll_interval)
+
+
+class Cursor(object):
+    """Asynchronous counterpart of :py:class:`pyhive.hive.Cursor`.
+
+    :py:meth:`execute` returns once the query finished running, so that fetching only waits for
+    the results to be transferred.
+    """
+
+    def __init__(self, connection, cursor, poll_interval=1):
+        self._connection = connection
+        self._cursor = cursor
+        self.poll_interval = poll_interval
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def description(self):
+        """See :py:attr:`pyhive.hive.Cursor.description`. Available once :py:meth:`execute`
+        returned.
+        """
+        return self._cursor._description
+
+    @property
+    def rownumber(self):
+        return self._cursor.rownumber
+
+    @property
+    def arraysize(self):
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value):
+        self._cursor.arraysize = value
+
+    async def execute(self, operation, parameters=None, wait=True, **kwargs):
+        """Submit a query and wait for it to finish running without blocking the event loop.
+        Other keyword arguments like ``configuration`` and ``timeout`` are passed to
+        :py:meth:`pyhive.hive.Cursor.execute`.
+
+        :param wait: If false, return right after submitting the query, e.g. to follow it with
+            :py:meth:`progress`. Call :py:meth:`wait` before fetching then.
+        :raises: ``OperationalError`` if the query failed or was cancelled
+        """
+        await self._connection._run(
+            functools.partial(self._cursor.execute, operation, parameters, async_=True, **kwargs))
+        if wait:
+            await self.wait()
+
+    async def wait(self):
+        """Wait for the submitted query to finish running.
+
+        :raises: ``OperationalError`` if the query failed or was cancelled
+        """
+        cursor = self._cursor
+        while True:
+            response = await self.poll(get_progress_update=False)
+            if response.operationState == ttypes.TOperationState.FINISHED_STATE:
+                break
+            if response.operationState in _FAILED_STATES:
+                raise OperationalError(response)
+            await asyncio.sleep(self.poll_interval)
+        # Look up the schema now so that description doesn't need a Thrift call
+        await self._connection._run(lambda: cursor.description)
+
+    async def progress(self, interval=None, logs=True):
+        """Iterate over :py:class:`pyhive.hive.ProgressEvent` objects for the submitted query
+        until it finished, like :py:meth:`pyhive.hive.Cursor.watch_progress` does from a thread.
+
+        :param interval: Seconds between status requests. Defaults to :py:attr:`poll_interval`.
+        :param logs: Whether to fetch the query log too.
+        """
+        if interval is None:
+            interval = self.poll_interval
+        poll = hive._ProgressPoller(self._cursor, logs)
+        while True:
+            event = await self._connection._run(poll)
+            yield event
+            if event.finished:
+                return
+            await asyncio.sleep(interval)
+
+    async def poll(self, get_progress_update=True):
+        """See :py:meth:`pyhive.hive.Cursor.poll`"""
+        return await self._connection._run(self._cursor.poll, get_progress_update)
+
+    async def fetch_logs(self):
+        """See :py:meth:`pyhive.hive.Cursor.fetch_logs`"""
+        return await self._connection._run(self._cursor.fetch_logs)
+
+    async def cancel(self):
+        await self._connection._run(self._cursor.cancel)
+
+    async def rewind(self):
+        """See :py:meth:`pyhive.hive.Cursor.rewind`"""
+        await self._connection._run(self._cursor.rewind)
+
+    async def scroll(self, value, mode='relative'):
+        """See :py:meth:`pyhive.hive.Cursor.scroll`"""
+        await self._connection._run(self._cursor.scroll, value, mode)
+
+    async def close(self):
+        await self._connection._run(self._cursor.close)
+
+    async def _fill(self):
+        """Make sure a row is buffered unless there are no more"""
+        cursor = self._cursor
+        if cursor._state == cursor._STATE_NONE:
+            raise ProgrammingError("No query yet")
+        if not cursor._data and cursor._state == cursor._STATE_RUNNING:
+            await self._connection._run(cursor._fetch_more)
+
+    async def fetchone(self):
+        """Fetch the next row, or ``None`` when no more data is available"""
+        await self._fill()
+        return self._cursor.fetchone()
+
+    async def fetchmany(self, size=None):
+        """Fetch up to ``size`` rows, defaulting to :py:attr:`arraysize`"""
+        if size is None:
+            size = self.arraysize
+        rows = []
+        while len(rows) < size:
+            await self._fill()
+            # Only take buffered rows, since fetching more would block
+            batch = self._cursor.fetchmany(min(size - len(rows), len(self._cursor._data)))
+            if not batch:
+                break
+            rows += batch
+        return rows
+
+    async def fetchall(self):
+        """Fetch all (remaining) rows"""
+        rows = []
+        async for batch in self.batches():
+            rows += batch
+        return rows
+
+    async def batches(self):
+        """Iterate over the (remaining) rows as lists of rows, one per ``FetchResults`` call"""
+        cursor = self._cursor
+        while True:
+            await self._fill()
+            if not cursor._data:
+                return
+            rows = list(cursor._data)
+            cursor._data.clear()
+            cursor._rownumber += len(rows)
+            yield rows
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        row = await self.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
@@ -0,0 +1,275 @@
+"""asyncio interface to Presto, built on ``aiohttp`` and :py:mod:`pyhive.presto`.
+
+Cursors follow ``nextUri`` with non-blocking HTTP requests and wait with ``asyncio.sleep``, so one
+event loop can drive many queries at once. All cursors of a connection share one
+``aiohttp.ClientSession`` and therefore its connection pool.
+
+Usage::
+
+    async with pyhive.aio.presto.connect('localhost') as connection:
+        cursor = connection.cursor()
+        await cursor.execute('SELECT * FROM my_awesome_data LIMIT 10')
+        print(await cursor.fetchall())
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import asyncio
+import json
+import logging
+import urllib.parse as urlparse
+
+from pyhive import presto
+from pyhive.exc import NotSupportedError, OperationalError, ProgrammingError
+
+_logger = logging.getLogger(__name__)
+
+
+def connect(*args, **kwargs):
+    """Constructor for creating a connection to the database. See class :py:class:`Connection` for
+    arguments.
+
+    :returns: a :py:class:`Connection` object.
+    """
+    return Connection(*args, **kwargs)
+
+
+class Connection(object):
+    """Factory for :py:class:`Cursor` objects that share an HTTP session.
+
+    Takes the same arguments as :py:class:`pyhive.presto.Cursor`, except for the Kerberos ones and
+    ``requests_session`` and ``requests_kwargs``, plus:
+
+    :param session: an ``aiohttp.ClientSession`` to use. If absent, the connection creates one,
+        and closes it in :py:meth:`close`.
+    :param request_kwargs: Additional ``**kwargs`` to pass to each ``aiohttp`` request, e.g.
+        ``ssl`` or ``timeout``.
+    :raises: ``NotSupportedError`` if given Kerberos arguments. ``aiohttp`` has no Kerberos
+        support, so use the synchronous :py:mod:`pyhive.presto` for Kerberos.
+    """
+
+    def __init__(self, *args, session=None, request_kwargs=None, **kwargs):
+        kerberos_args = sorted(
+            k for k, v in kwargs.items() if k.startswith('Kerberos') and v is not None)
+        if kerberos_args:
+            raise NotSupportedError(
+                "Kerberos authentication is not supported, got {}".format(
+                    ', '.join(kerberos_args)))
+        self._args = args
+        self._kwargs = kwargs
+        self._session = session
+        self._owns_session = session is None
+        self._request_kwargs = request_kwargs or {}
+
+    def _get_session(self):
+        if self._session is None:
+            # Defer import so package dependency is optional
+            import aiohttp
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP session if the connection created it"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def cursor(self):
+        """Return a new :py:class:`Cursor` object using the connection."""
+        return Cursor(self)
+
+
+class Cursor(object):
+    """Asynchronous counterpart of :py:class:`pyhive.presto.Cursor`.
+
+    The synchronous cursor keeps the query state and interprets the responses. This class only
+    does the HTTP requests.
+    """
+    _SYNC_CURSOR_CLASS = presto.Cursor
+    _HEADER_PREFIX = 'X-Presto-'
+    _escaper = presto._escaper
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._cursor = self._SYNC_CURSOR_CLASS(*connection._args, **connection._kwargs)
+        self._request_kwargs = dict(connection._request_kwargs)
+        password = connection._kwargs.get('password')
+        if password is not None:
+            # Defer import so package dependency is optional
+            import aiohttp
+            self._request_kwargs['auth'] = aiohttp.BasicAuth(self._cursor._username, password)
+
+    @property
+    def description(self):
+        """See :py:attr:`pyhive.presto.Cursor.description`. This is ``None`` until the server
+        returned the columns, which it does at the latest with the first rows.
+        """
+        if self._cursor._columns is None:
+            return None
+        return self._cursor.description
+
+    @property
+    def rownumber(self):
+        return self._cursor.rownumber
+
+    @property
+    def last_query_id(self):
+        return self._cursor.last_query_id
+
+    @property
+    def arraysize(self):
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value):
+        self._cursor.arraysize = value
+
+    async def close(self):
+        """Cancel the query if it's still running, like :py:meth:`cancel`"""
+        cursor = self._cursor
+        if cursor._state == cursor._STATE_RUNNING and cursor._nextUri is not None:
+            await self.cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _headers(self):
+        cursor = self._cursor
+        prefix = self._HEADER_PREFIX
+        headers = {
+            prefix + 'Catalog': cursor._catalog,
+            prefix + 'Schema': cursor._schema,
+            prefix + 'Source': cursor._source,
+            prefix + 'User': cursor._username,
+        }
+        if cursor._session_props:
+            headers[prefix + 'Session'] = ','.join(
+                '{}={}'.format(propname, propval)
+                for propname, propval in cursor._session_props.items()
+            )
+        return headers
+
+    async def _request(self, method, url, **kwargs):
+        kwargs.update(self._request_kwargs)
+        session = self._connection._get_session()
+        async with session.request(method, url, **kwargs) as response:
+            return _Response(response.status, await response.read(), response.headers)
+
+    async def execute(self, operation, parameters=None):
+        """Prepare and execute a database operation (query or command).
+
+        Return values are not defined.
+        """
+        cursor = self._cursor
+        headers = self._headers()
+        if parameters is None:
+            sql = operation
+        else:
+            sql = operation % self._escaper.escape_args(parameters)
+
+        cursor._reset_state()
+        cursor._state = cursor._STATE_RUNNING
+        url = urlparse.urlunparse((
+            cursor._protocol,
+            '{}:{}'.format(cursor._host, cursor._port), '/v1/statement', None, None, None))
+        _logger.info('%s', sql)
+        _logger.debug("Headers: %s", headers)
+        response = await self._request('POST', url, data=sql.encode('utf-8'), headers=headers)
+        cursor._process_response(response)
+
+    async def cancel(self):
+        cursor = self._cursor
+        if cursor._state == cursor._STATE_NONE:
+            raise ProgrammingError("No query yet")
+        if cursor._nextUri is None:
+            assert cursor._state == cursor._STATE_FINISHED, "Should be finished if nextUri is None"
+            return
+
+        response = await self._request('DELETE', cursor._nextUri)
+        if response.status_code != 204:
+            fmt = "Unexpected status code after cancel {}\n{}"
+            raise OperationalError(fmt.format(response.status_code, response.content))
+
+        cursor._state = cursor._STATE_FINISHED
+        cursor._nextUri = None
+
+    async def poll(self):
+        """See :py:meth:`pyhive.presto.Cursor.poll`"""
+        cursor = self._cursor
+        if cursor._state == cursor._STATE_NONE:
+            raise ProgrammingError("No query yet")
+        if cursor._nextUri is None:
+            assert cursor._state == cursor._STATE_FINISHED, "Should be finished if nextUri is None"
+            return None
+        response = await self._request('GET', cursor._nextUri)
+        cursor._process_response(response)
+        return response.json()
+
+    async def _fill(self):
+        """Follow ``nextUri`` until a row is buffered or the query is finished"""
+        cursor = self._cursor
+        if cursor._state == cursor._STATE_NONE:
+            raise ProgrammingError("No query yet")
+        while not cursor._data and cursor._state != cursor._STATE_FINISHED:
+            cursor._process_response(await self._request('GET', cursor._nextUri))
+            if not cursor._data and cursor._state != cursor._STATE_FINISHED:
+                await asyncio.sleep(cursor._poll_interval)
+
+    async def fetchone(self):
+        """Fetch the next row, or ``None`` when no more data is available"""
+        await self._fill()
+        return self._cursor.fetchone()
+
+    async def fetchmany(self, size=None):
+        """Fetch up to ``size`` rows, defaulting to :py:attr:`arraysize`"""
+        if size is None:
+            size = self.arraysize
+        rows = []
+        while len(rows) < size:
+            await self._fill()
+            # Only take buffered rows, since fetching more would block
+            batch = self._cursor.fetchmany(min(size - len(rows), len(self._cursor._data)))
+            if not batch:
+                break
+            rows += batch
+        return rows
+
+    async def fetchall(self):
+        """Fetch all (remaining) rows"""
+        rows = []
+        while True:
+            await self._fill()
+            if not self._cursor._data:
+                return rows
+            rows += self._cursor.fetchmany(len(self._cursor._data))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        row = await self.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+
+class _Response(object):
+    """The parts of a ``requests.Response`` that the synchronous cursors look at"""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
@@ -0,0 +1,32 @@
+"""asyncio interface to Trino, built on ``aiohttp`` and :py:mod:`pyhive.trino`.
+
+See :py:mod:`pyhive.aio.presto` for details.
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from pyhive import trino
+from pyhive.aio.presto import Connection as PrestoConnection, Cursor as PrestoCursor
+
+
+def connect(*args, **kwargs):
+    """Constructor for creating a connection to the database. See class :py:class:`Connection` for
+    arguments.
+
+    :returns: a :py:class:`Connection` object.
+    """
+    return Connection(*args, **kwargs)
+
+
+class Connection(PrestoConnection):
+    def cursor(self):
+        """Return a new :py:class:`Cursor` object using the connection."""
+        return Cursor(self)
+
+
+class Cursor(PrestoCursor):
+    """Asynchronous counterpart of :py:class:`pyhive.trino.Cursor`"""
+    _SYNC_CURSOR_CLASS = trino.Cursor
+    _HEADER_PREFIX = 'X-Trino-'
+    _escaper = trino._escaper
@@ -13,15 +13,28 @@ from past.builtins import basestring
 from pyhive import exc
 import abc
 import collections
+import contextlib
+import re
+import threading
 import time
 import datetime
+import weakref
 from future.utils import with_metaclass
 from itertools import islice
 
 try:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
 except ImportError:
-    from collections import Iterable
+    from collections import Iterable, Sequence
+
+
+# ``INSERT ... VALUES (<row>)``, which executemany turns into multi-row statements
+_INSERT_VALUES_PATTERN = re.compile(
+    r'^(\s*INSERT\s.+?\sVALUES\s*)(\(.*\))\s*;?\s*$', re.IGNORECASE | re.DOTALL)
+
+# Progress of a batched executemany, see DBAPICursor.executemany
+ChunkResult = collections.namedtuple(
+    'ChunkResult', ['index', 'chunks', 'rows', 'seconds', 'error'])
 
 
 class DBAPICursor(with_metaclass(abc.ABCMeta, object)):
@@ -31,13 +44,22 @@ class DBAPICursor(with_metaclass(abc.ABCMeta, object)):
     _STATE_RUNNING = 1
     _STATE_FINISHED = 2
 
-    def __init__(self, poll_interval=1):
+    # ParamEscaper for building multi-row INSERT statements in executemany
+    _escaper = None
+    # Default maximum length of those statements
+    _MAX_STATEMENT_SIZE = 1000000
+
+    def __init__(self, poll_interval=1, prefetch=0):
         self._poll_interval = poll_interval
+        self._prefetch = prefetch
+        self._prefetcher = None
         self._reset_state()
         self.lastrowid = None
 
     def _reset_state(self):
         """Reset state about the previous query in preparation for running another query"""
+        self._stop_prefetch()
+
         # State to return as part of DB-API
         self._rownumber = 0
 
@@ -47,11 +69,27 @@ class DBAPICursor(with_metaclass(abc.ABCMeta, object)):
         self._columns = None
 
     def _fetch_while(self, fn):
+        if self._prefetch and self._prefetcher is None and self._state == self._STATE_RUNNING:
+            self._prefetcher = _Prefetcher(self, self._prefetch)
+            self._prefetcher.start()
+        if self._prefetcher is not None and self._prefetcher.wait_while(fn):
+            return
         while fn():
             self._fetch_more()
             if fn():
                 time.sleep(self._poll_interval)
 
+    def _stop_prefetch(self):
+        """Stop any background read-ahead, waiting for a fetch in flight to complete. It restarts on
+        the next fetch.
+
+        Call this before anything that uses the connection or changes the query state outside of
+        :py:meth:`_fetch_more`.
+        """
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+
     @abc.abstractproperty
     def description(self):
         raise NotImplementedError  # pragma: no cover
@@ -82,20 +120,128 @@ class DBAPICursor(with_metaclass(abc.ABCMeta, object)):
         """
         raise NotImplementedError  # pragma: no cover
 
-    def executemany(self, operation, seq_of_parameters):
+    def executemany(self, operation, seq_of_parameters, max_statement_size=None, concurrency=1,
+                    callback=None):
         """Prepare a database operation (query or command) and then execute it against all parameter
         sequences or mappings found in the sequence ``seq_of_parameters``.
 
         Only the final result set is retained.
 
         Return values are not defined.
+
+        An ``INSERT ... VALUES (...)`` operation is instead executed as few multi-row ``INSERT``
+        statements, each holding as many rows as fit in ``max_statement_size`` characters. The
+        other arguments only apply to those:
+
+        :param max_statement_size: Maximum length of each statement. A single longer row still
+            gets a statement of its own.
+        :param concurrency: How many statements to run at once. This cursor runs some, and other
+            threads run the rest with cursors of their own. Fewer run at once if the cursor can't
+            provide that many, e.g. when a Hive connection pool is full.
+        :param callback: A function called with a :py:class:`ChunkResult` for each statement,
+            with ``error`` set to the exception if it failed. Without a callback, the first error
+            stops the remaining statements and is raised. With one, all statements run, unless the
+            callback raises.
+
+        .. note::
+            The arguments after ``seq_of_parameters`` are not a part of DB-API.
         """
-        for parameters in seq_of_parameters[:-1]:
-            self.execute(operation, parameters)
-            while self._state != self._STATE_FINISHED:
-                self._fetch_more()
-        if seq_of_parameters:
-            self.execute(operation, seq_of_parameters[-1])
+        match = _INSERT_VALUES_PATTERN.match(operation) if self._escaper is not None else None
+        # Parameters in the part before the row would be substituted only once
+        if match is None or '%' in match.group(1):
+            for parameters in seq_of_parameters[:-1]:
+                self.execute(operation, parameters)
+                self._drain()
+            if seq_of_parameters:
+                self.execute(operation, seq_of_parameters[-1])
+            return
+
+        prefix, row = match.groups()
+        statements = list(self._insert_statements(
+            prefix, row, seq_of_parameters, max_statement_size or self._MAX_STATEMENT_SIZE))
+        self._reset_state()
+        self._execute_statements(statements, concurrency, callback)
+
+    def _insert_statements(self, prefix, row, seq_of_parameters, max_size):
+        """Yield ``(statement, row count)`` for multi-row inserts of up to ``max_size``
+        characters
+        """
+        values = []
+        size = len(prefix)
+        for parameters in seq_of_parameters:
+            value = row % self._escaper.escape_args(parameters)
+            if values and size + len(value) + 2 > max_size:
+                yield prefix + ', '.join(values), len(values)
+                values = []
+                size = len(prefix)
+            size += len(value) + (2 if values else 0)
+            values.append(value)
+        if values:
+            yield prefix + ', '.join(values), len(values)
+
+    def _execute_statements(self, statements, concurrency, callback):
+        """Run ``(statement, row count)`` pairs for :py:meth:`executemany`"""
+        lock = threading.Lock()
+        pending = iter(enumerate(statements))
+        # The first exception that stops everything
+        fatal = []
+
+        def run(cursor):
+            while not fatal:
+                with lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                index, (sql, rows) = item
+                start = time.time()
+                error = None
+                try:
+                    cursor.execute(sql)
+                    cursor._drain()
+                except Exception as e:
+                    if callback is None:
+                        raise
+                    error = e
+                if callback is not None:
+                    with lock:
+                        callback(ChunkResult(
+                            index, len(statements), rows, time.time() - start, error))
+
+        def worker():
+            try:
+                with self._worker_cursor() as cursor:
+                    if cursor is not None:
+                        run(cursor)
+            except Exception as e:
+                fatal.append(e)
+
+        # This thread is one of the workers, so the statements get run even if no other cursor
+        # is available
+        threads = [threading.Thread(target=worker, name='pyhive-executemany')
+                   for _ in range(min(concurrency, len(statements)) - 1)]
+        for thread in threads:
+            thread.start()
+        try:
+            run(self)
+        except Exception as e:
+            fatal.append(e)
+        for thread in threads:
+            thread.join()
+        if fatal:
+            raise fatal[0]
+
+    @contextlib.contextmanager
+    def _worker_cursor(self):
+        """Context manager returning another cursor that can run statements in a separate thread
+        at the same time as this one, or None if no more can
+        """
+        raise exc.NotSupportedError("Concurrent executemany is not supported by this cursor")
+        yield  # pragma: no cover
+
+    def _drain(self):
+        """Wait for the current statement to finish, discarding its rows"""
+        while self._state != self._STATE_FINISHED:
+            self._fetch_more()
 
     def fetchone(self):
         """Fetch the next row of a query result set, returning a single sequence, or ``None`` when
@@ -191,6 +337,356 @@ class DBAPICursor(with_metaclass(abc.ABCMeta, object)):
         """Return self to make cursors compatible to the iteration protocol."""
         return self
 
+    #
+    # Columnar extensions
+    #
+
+    # Maps type codes in ``description``, without any parameters like ``(10,1)``, to NumPy dtypes.
+    # Columns of other types become object arrays.
+    _NUMPY_TYPES = {}
+
+    def fetch_numpy(self):
+        """Fetch all (remaining) rows of a query result as a dict mapping column names to NumPy
+        arrays.
+
+        The dtype of each array is derived from the column's ``type_code``. Columns containing
+        nulls are returned as ``numpy.ma.MaskedArray`` with the nulls masked.
+
+        .. note::
+            This is not a part of DB-API. It requires ``numpy``.
+        """
+        return self._columns_to_numpy(self._fetchmany_columns(None))
+
+    def fetchmany_numpy(self, size=None):
+        """Like :py:meth:`fetch_numpy`, but fetch at most ``size`` rows, defaulting to
+        :py:attr:`arraysize`. The arrays are empty when no more rows are available.
+
+        .. note::
+            This is not a part of DB-API. It requires ``numpy``.
+        """
+        if size is None:
+            size = self.arraysize
+        return self._columns_to_numpy(self._fetchmany_columns(size))
+
+    def _columns_to_numpy(self, columns):
+        return collections.OrderedDict(
+            (col[0], array) for col, array in zip(self.description, self._numpy_arrays(columns))
+        )
+
+    def _numpy_arrays(self, columns):
+        """Convert a list of columns of the current result set to a list of NumPy arrays"""
+        return [
+            _to_numpy(values, self._NUMPY_TYPES.get(col[1].split('(')[0]))
+            for col, values in zip(self.description, columns)
+        ]
+
+    # Maps type codes in ``description``, without any parameters, to the name of a ``pyarrow`` type
+    # factory followed by its arguments. Arrow infers the type of other columns from their values.
+    _ARROW_TYPES = {}
+
+    def iter_arrow_batches(self):
+        """Iterate over the (remaining) rows of a query result as ``pyarrow.RecordBatch`` objects,
+        one per response received from the server.
+
+        All batches share the same schema. Values that the server sends as strings, like dates,
+        are cast to the matching Arrow type.
+
+        .. note::
+            This is not a part of DB-API. It requires ``pyarrow``.
+        """
+        import pyarrow
+
+        description = self._result_description()
+        names = [col[0] for col in description]
+        types = self._arrow_types(pyarrow)
+        while True:
+            batch = self._fetch_column_batch()
+            if batch is None:
+                return
+            arrays = [_to_arrow(pyarrow, values, type_) for values, type_ in zip(batch, types)]
+            # Keep the first inferred type, so that later batches don't infer a different one
+            types = [
+                array.type if type_ is None and not pyarrow.types.is_null(array.type) else type_
+                for array, type_ in zip(arrays, types)
+            ]
+            yield pyarrow.RecordBatch.from_arrays(arrays, names=names)
+
+    def fetch_arrow_table(self):
+        """Fetch all (remaining) rows of a query result as a ``pyarrow.Table``.
+
+        .. note::
+            This is not a part of DB-API. It requires ``pyarrow``.
+        """
+        import pyarrow
+
+        batches = list(self.iter_arrow_batches())
+        if not batches:
+            return pyarrow.schema([
+                (col[0], type_ or pyarrow.null())
+                for col, type_ in zip(self.description, self._arrow_types(pyarrow))
+            ]).empty_table()
+        # Columns that were all null before a type could be inferred are still of the null type
+        schema = batches[-1].schema
+        batches = [
+            batch if batch.schema.equals(schema) else pyarrow.RecordBatch.from_arrays([
+                array if array.type.equals(field.type) else pyarrow.nulls(len(array), field.type)
+                for array, field in zip(batch.columns, schema)
+            ], schema=schema)
+            for batch in batches
+        ]
+        return pyarrow.Table.from_batches(batches, schema=schema)
+
+    def _arrow_types(self, pyarrow):
+        """Return the Arrow type of each result column, or None where it should be inferred"""
+        types = []
+        for col in self.description:
+            spec = self._ARROW_TYPES.get(col[1].split('(')[0])
+            types.append(None if spec is None else getattr(pyarrow, spec[0])(*spec[1:]))
+        return types
+
+    def _result_description(self):
+        """Return ``description``, raising if there is no result set to fetch from"""
+        if self._state == self._STATE_NONE:
+            raise exc.ProgrammingError("No query yet")
+        description = self.description
+        if description is None:
+            raise exc.ProgrammingError("No result set")
+        return description
+
+    def _fetch_column_batch(self):
+        """Return the next batch of rows as a list of columns, or ``None`` when no more rows are
+        available.
+
+        By default this transposes the rows that :py:meth:`_fetch_more` buffered. Subclasses that
+        receive columnar data should override it to skip building row tuples.
+        """
+        if self._state == self._STATE_NONE:
+            raise exc.ProgrammingError("No query yet")
+        self._fetch_while(lambda: not self._data and self._state != self._STATE_FINISHED)
+        if not self._data:
+            return None
+        # Pop rather than swap out the deque, since a prefetch thread may be appending to it
+        popleft = self._data.popleft
+        rows = [popleft() for _ in range(len(self._data))]
+        self._rownumber += len(rows)
+        return list(zip(*rows))
+
+    def _fetchmany_columns(self, size):
+        """Fetch up to ``size`` rows, or all remaining rows if ``size`` is None, as a list of
+        columns
+        """
+        columns = [[] for _ in self._result_description()]
+        count = 0
+        while size is None or count < size:
+            batch = self._fetch_column_batch()
+            if batch is None:
+                break
+            num_rows = len(batch[0]) if batch else 0
+            if size is not None and count + num_rows > size:
+                keep = size - count
+                # Hand the rest back to the next fetch
+                rest = zip(*[islice(values, keep, None) for values in batch])
+                self._data.extendleft(reversed(list(rest)))
+                self._rownumber -= num_rows - keep
+                batch = [islice(values, keep) for values in batch]
+                num_rows = keep
+            for column, values in zip(columns, batch):
+                column.extend(values)
+            count += num_rows
+        return columns
+
+
+def _to_numpy(values, dtype):
+    """Convert a list of values, possibly containing None, to a NumPy array of the given dtype"""
+    import numpy
+
+    if dtype is None:
+        # Assign element by element so that e.g. lists don't become extra dimensions
+        result = numpy.empty(len(values), dtype=object)
+        result[:] = values
+        return result
+    mask = [value is None for value in values]
+    if not any(mask):
+        return numpy.array(values, dtype=dtype)
+    fill = numpy.zeros(1, dtype=dtype)[0]
+    filled = [fill if is_null else value for value, is_null in zip(values, mask)]
+    return numpy.ma.MaskedArray(numpy.array(filled, dtype=dtype), mask=mask)
+
+
+# unicode on Python 2 and str on Python 3, given unicode_literals
+_TEXT_TYPE = type('')
+
+
+def _to_arrow(pyarrow, values, type_):
+    """Convert a sequence of values, possibly containing None, to an Arrow array of the given type,
+    or of an inferred type if ``type_`` is None
+    """
+    if type_ is not None and not pyarrow.types.is_string(type_):
+        first = next((value for value in values if value is not None), None)
+        # Parse text, e.g. dates, but not binary values
+        if isinstance(first, _TEXT_TYPE):
+            return pyarrow.array(values, type=pyarrow.string()).cast(type_)
+    return pyarrow.array(values, type=type_)
+
+
+class _RowBuffer(collections.deque):
+    """Deque of buffered rows that keeps track of the row number following its last row"""
+
+    def __init__(self, rows, end):
+        super(_RowBuffer, self).__init__(rows)
+        self.end = end
+
+    def __iadd__(self, rows):
+        rows = list(rows)
+        self.extend(rows)
+        self.end += len(rows)
+        return self
+
+
+class _Prefetcher(object):
+    """Thread that calls a cursor's :py:meth:`~DBAPICursor._fetch_more` ahead of the consumer,
+    until ``batches`` non-empty batches are buffered or the query is finished.
+
+    While it runs, it is the only caller of ``_fetch_more``. Consumers call :py:meth:`wait_while`
+    instead. Exceptions are re-raised there.
+    """
+
+    def __init__(self, cursor, batches):
+        cursor._data = _RowBuffer(cursor._data, cursor._rownumber + len(cursor._data))
+        # Let an abandoned cursor be garbage collected, which also ends the thread
+        self._cursor = weakref.ref(cursor)
+        self._batches = batches
+        self._cond = threading.Condition()
+        # Row numbers at which the buffered batches end
+        self._batch_ends = collections.deque()
+        self._stopped = False
+        self._done = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='pyhive-prefetch')
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while len(self._batch_ends) >= self._batches and not self._stopped:
+                        if not self._cond.wait(1) and self._cursor() is None:
+                            return
+                    if self._stopped:
+                        return
+                cursor = self._cursor()
+                if cursor is None or cursor._state != cursor._STATE_RUNNING:
+                    return
+                end = cursor._data.end
+                cursor._fetch_more()
+                fetched = cursor._data.end != end
+                end = cursor._data.end
+                idle = not fetched and cursor._state == cursor._STATE_RUNNING
+                poll_interval = cursor._poll_interval
+                del cursor
+                with self._cond:
+                    if fetched:
+                        self._batch_ends.append(end)
+                    self._cond.notify_all()
+                    if idle and not self._stopped:
+                        self._cond.wait(poll_interval)
+        except Exception as e:
+            with self._cond:
+                self._error = e
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def wait_while(self, fn):
+        """Wait until ``fn()`` is false, letting the thread know about consumed batches. Return
+        False if the thread ended before that.
+        """
+        cursor = self._cursor()
+        ends = self._batch_ends
+        if not (ends and ends[0] <= cursor._rownumber) and not fn():
+            return True
+        with self._cond:
+            while ends and ends[0] <= cursor._rownumber:
+                ends.popleft()
+            self._cond.notify_all()
+            while fn():
+                if self._error is not None:
+                    raise self._error
+                if self._done:
+                    return False
+                self._cond.wait()
+        return True
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+class LazyRow(Sequence):
+    """A result row that converts its values from how the server sent them only when they're
+    accessed, caching the results. Returned instead of tuples by cursors created with
+    ``lazy_conversion=True``.
+
+    It behaves like a tuple: it can be indexed, sliced, unpacked and compared with tuples.
+    """
+    __slots__ = ('_values', '_converters', '_pending')
+
+    def __init__(self, values, converters):
+        """
+        :param values: The raw values of the row
+        :param converters: A list with a function converting a non-null raw value for each column,
+            or None where the raw value is returned as is. Usually shared by all rows of a batch.
+        """
+        self._values = values
+        self._converters = converters
+        # Bit set of the columns that still need converting
+        self._pending = -1
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self._values)
+        # Also keeps a negative index from reaching the shift below
+        if not 0 <= index < len(self._values):
+            raise IndexError("tuple index out of range")
+        value = self._values[index]
+        if self._pending >> index & 1:
+            self._pending &= ~(1 << index)
+            converter = self._converters[index]
+            if converter is not None and value is not None:
+                if not isinstance(self._values, list):
+                    self._values = list(self._values)
+                value = self._values[index] = converter(value)
+        return value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._values)))
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyRow, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
 
 class DBAPITypeObject(object):
     # Taken from http://www.python.org/dev/peps/pep-0249/#implementation-hints
@@ -8,9 +8,15 @@ Many docstrings in this file are based on the PEP, which is in the public domain
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import array
 import base64
+import collections
 import datetime
+import hashlib
+import io
+import os
 import re
+import struct
 from decimal import Decimal
 from ssl import CERT_NONE, CERT_OPTIONAL, CERT_REQUIRED, create_default_context
 
@@ -19,20 +25,32 @@ from TCLIService import TCLIService
 from TCLIService import constants
 from TCLIService import ttypes
 from pyhive import common
+from pyhive import sasl_transport
 from pyhive.common import DBAPITypeObject
 # Make all exceptions visible in this module per DB-API
 from pyhive.exc import *  # noqa
 from builtins import range
 import contextlib
-from future.utils import iteritems
+import functools
+from future.utils import native_str
+from past.builtins import basestring
 import getpass
 import logging
 import sys
+import threading
+import time
+from thrift.Thrift import TApplicationException, TMessageType, TType
 import thrift.transport.THttpClient
 import thrift.protocol.TBinaryProtocol
+import thrift.protocol.TCompactProtocol
 import thrift.transport.TSocket
 import thrift.transport.TTransport
 
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
 # PEP 249 module globals
 apilevel = '2.0'
 threadsafety = 2  # Threads may share the module and connections.
@@ -88,7 +106,20 @@ def get_installed_sasl(host, sasl_auth, service=None, username=None, password=No
         return get_pure_sasl_client(host=host, sasl_auth=sasl_auth, service=service, username=username, password=password)
     
 
+_INTERVAL_DAY_TIME_PATTERN = re.compile(r'(-?)(\d+) (\d+):(\d+):(\d+)(?:\.(\d{,6})\d*)?$')
+
+# Missing before Python 3.7
+_datetime_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+_date_fromisoformat = getattr(datetime.date, 'fromisoformat', None)
+
+
 def _parse_timestamp(value):
+    if value and _datetime_fromisoformat is not None:
+        try:
+            return _datetime_fromisoformat(value)
+        except ValueError:
+            # e.g. more than 6 fractional digits before Python 3.11
+            pass
     if value:
         match = _TIMESTAMP_PATTERN.match(value)
         if match:
@@ -107,8 +138,72 @@ def _parse_timestamp(value):
     return value
 
 
+def _parse_date(value):
+    if not value:
+        return None
+    if _date_fromisoformat is not None:
+        return _date_fromisoformat(value)
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _parse_interval_day_time(value):
+    """Parse Hive's ``[-]days hours:minutes:seconds.nanoseconds`` into a ``timedelta``"""
+    if not value:
+        return None
+    match = _INTERVAL_DAY_TIME_PATTERN.match(value)
+    if not match:
+        raise DataError('Cannot convert "{}" into a timedelta'.format(value))
+    sign, days, hours, minutes, seconds, fraction = match.groups()
+    delta = datetime.timedelta(
+        days=int(days), hours=int(hours), minutes=int(minutes), seconds=int(seconds),
+        microseconds=int((fraction or '').ljust(6, '0')))
+    return -delta if sign else delta
+
+
+# Converts the values of the given types from how Thrift returns them. Values of other types, like
+# numbers, strings and binary, already come back as the matching Python type. Complex types and
+# INTERVAL_YEAR_MONTH_TYPE are returned as strings.
 TYPES_CONVERTER = {"DECIMAL_TYPE": Decimal,
-                   "TIMESTAMP_TYPE": _parse_timestamp}
+                   "TIMESTAMP_TYPE": _parse_timestamp,
+                   "DATE_TYPE": _parse_date,
+                   "INTERVAL_DAY_TIME_TYPE": _parse_interval_day_time}
+
+# Types whose values tend to repeat within a result set, so their conversions are memoized
+_MEMOIZED_TYPES = {"TIMESTAMP_TYPE", "DATE_TYPE"}
+_MEMO_SIZE = 10000
+
+
+def _column_converter(type_code):
+    """Return a function converting one raw value of a column of the given type, or None if values
+    need no conversion. Empty and null values are returned as is.
+    """
+    converter = TYPES_CONVERTER.get(type_code)
+    if converter is None:
+        return None
+    if type_code not in _MEMOIZED_TYPES:
+        return lambda value: converter(value) if value else value
+    memo = {}
+
+    def convert(value):
+        if not value:
+            return value
+        converted = memo.get(value)
+        if converted is None:
+            if len(memo) >= _MEMO_SIZE:
+                memo.clear()
+            converted = memo[value] = converter(value)
+        return converted
+    return convert
+
+
+def _column_decoder(type_code):
+    """Return a function converting a list of raw values of a column of the given type, or None if
+    they need no conversion
+    """
+    convert = _column_converter(type_code)
+    if convert is None:
+        return None
+    return lambda values: [convert(value) for value in values]
 
 
 class HiveParamEscaper(common.ParamEscaper):
@@ -133,6 +228,21 @@ class HiveParamEscaper(common.ParamEscaper):
 
 _escaper = HiveParamEscaper()
 
+# oldest version that still contains features we care about
+# "V6 uses binary type for binary payload (was string) and uses columnar result set"
+_MIN_PROTOCOL_VERSION = ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V6
+# V10 may send result sets serialized into TRowSet.binaryColumns
+_MAX_PROTOCOL_VERSION = ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V10
+
+_SERVER_INFO_TYPES = [
+    ttypes.TGetInfoType.CLI_SERVER_NAME,
+    ttypes.TGetInfoType.CLI_DBMS_NAME,
+    ttypes.TGetInfoType.CLI_DBMS_VER,
+]
+# (transport, host, port) -> dict returned by Connection.server_info
+_server_info_cache = {}
+_server_info_lock = threading.Lock()
+
 
 def connect(*args, **kwargs):
     """Constructor for creating a connection to the database. See class :py:class:`Connection` for
@@ -145,6 +255,15 @@ def connect(*args, **kwargs):
 
 class Connection(object):
     """Wraps a Thrift session"""
+    _info_key = None
+    _connect_timings = {}
+    # (pool, connect arguments) if lent out by a ConnectionPool
+    _pool = None
+    # The requests.Session created for http_transport='requests'
+    _owned_requests_session = None
+    _protocol_version = ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V6
+    # Set to False once the server rejects GetLog, so logs go straight to FetchResults
+    _get_log_supported = True
 
     def __init__(
         self,
@@ -159,7 +278,11 @@ class Connection(object):
         password=None,
         check_hostname=None,
         ssl_cert=None,
-        thrift_transport=None
+        thrift_transport=None,
+        fast_connect=False,
+        http_transport='thrift',
+        requests_session=None,
+        requests_kwargs=None,
     ):
         """Connect to HiveServer2
 
@@ -172,36 +295,75 @@ class Connection(object):
         :param password: Use with auth='LDAP' or auth='CUSTOM' only
         :param thrift_transport: A ``TTransportBase`` for custom advanced usage.
             Incompatible with host, port, auth, kerberos_service_name, and password.
+        :param fast_connect: Select the database with the ``use:database`` setting of
+            ``OpenSession`` instead of running a ``USE`` statement afterwards, which saves two
+            round trips. All servers speaking protocol V6 or later (Hive 0.13+) support it.
+        :param http_transport: With ``scheme='http'`` or ``'https'``, whether to send calls with
+            ``thrift``'s ``THttpClient``, which connects anew for every call, or with
+            ``requests``, which keeps connections alive and sends HiveServer2's auth cookie
+            instead of the credentials, see :py:mod:`pyhive.http_transport`. Either way, a
+            rejected Kerberos token is replaced with a new one.
+        :param requests_session: A ``requests.Session`` for ``http_transport='requests'``.
+            Defaults to a new one, closed with the connection. Connections sharing a session
+            share the auth cookie, unless they use Kerberos.
+        :param requests_kwargs: Additional ``**kwargs`` to pass to ``requests`` with
+            ``http_transport='requests'``, e.g. ``timeout``. ``verify`` defaults to whether
+            ``ssl_cert`` asks for verification.
 
         The way to support LDAP and GSSAPI is originated from cloudera/Impyla:
         https://github.com/cloudera/impyla/blob/255b07ed973d47a3395214ed92d35ec0615ebf62
         /impala/_thrift_api.py#L152-L160
         """
+        # Identifies the server for caching its GetInfo values, unless given a custom transport
+        info_key = None
+        socket = None
+        # Opens another HTTP transport, for the client of another thread
+        new_http_transport = None
         if scheme in ("https", "http") and thrift_transport is None:
             port = port or 1000
+            info_key = (scheme, host, port)
             ssl_context = None
             if scheme == "https":
                 ssl_context = create_default_context()
                 ssl_context.check_hostname = check_hostname == "true"
                 ssl_cert = ssl_cert or "none"
                 ssl_context.verify_mode = ssl_cert_parameter_map.get(ssl_cert, CERT_NONE)
-            thrift_transport = thrift.transport.THttpClient.THttpClient(
-                uri_or_host="{scheme}://{host}:{port}/cliservice/".format(
-                    scheme=scheme, host=host, port=port
-                ),
-                ssl_context=ssl_context,
-            )
-
-            if auth in ("BASIC", "NOSASL", "NONE", None):
-                # Always needs the Authorization header
-                self._set_authorization_header(thrift_transport, username, password)
-            elif auth == "KERBEROS" and kerberos_service_name:
-                self._set_kerberos_header(thrift_transport, kerberos_service_name, host)
-            else:
+            if not (
+                auth in ("BASIC", "NOSASL", "NONE", None)
+                or (auth == "KERBEROS" and kerberos_service_name)
+            ):
                 raise ValueError(
                     "Authentication is not valid use one of:"
                     "BASIC, NOSASL, KERBEROS, NONE"
                 )
+            if http_transport == 'requests':
+                if requests_session is None:
+                    # Defer import so package dependency is optional
+                    import requests
+                    requests_session = self._owned_requests_session = requests.Session()
+                requests_kwargs = dict(requests_kwargs or {})
+                if ssl_context is not None:
+                    requests_kwargs.setdefault('verify', ssl_context.verify_mode != CERT_NONE)
+            elif http_transport != 'thrift':
+                raise ValueError("Unknown http_transport {}".format(http_transport))
+            url = "{scheme}://{host}:{port}/cliservice/".format(
+                scheme=scheme, host=host, port=port)
+            if auth == "KERBEROS":
+                authorization = None
+                negotiate = functools.partial(
+                    self._kerberos_authorization, kerberos_service_name, host)
+            else:
+                # Always needs the Authorization header
+                authorization = self._basic_authorization(username, password)
+                negotiate = None
+            credentials = None
+            if requests_session is not None:
+                credentials = self._requests_credentials(
+                    url, authorization, negotiate, requests_session)
+            new_http_transport = functools.partial(
+                self._http_transport, url, ssl_context, authorization, negotiate,
+                requests_session, requests_kwargs, credentials)
+            thrift_transport = new_http_transport()
             host, port, auth, kerberos_service_name, password = (
                 None, None, None, None, None
             )
@@ -233,14 +395,12 @@ class Connection(object):
                 port = 10000
             if auth is None:
                 auth = 'NONE'
+            info_key = ('binary', host, port)
             socket = thrift.transport.TSocket.TSocket(host, port)
             if auth == 'NOSASL':
                 # NOSASL corresponds to hive.server2.authentication=NOSASL in hive-site.xml
                 self._transport = thrift.transport.TTransport.TBufferedTransport(socket)
             elif auth in ('LDAP', 'KERBEROS', 'NONE', 'CUSTOM'):
-                # Defer import so package dependency is optional
-                import thrift_sasl
-
                 if auth == 'KERBEROS':
                     # KERBEROS mode in hive.server2.authentication is GSSAPI in sasl library
                     sasl_auth = 'GSSAPI'
@@ -250,7 +410,11 @@ class Connection(object):
                         # Password doesn't matter in NONE mode, just needs to be nonempty.
                         password = 'x'
                 
-                self._transport = thrift_sasl.TSaslClientTransport(lambda: get_installed_sasl(host=host, sasl_auth=sasl_auth, service=kerberos_service_name, username=username, password=password), sasl_auth, socket)
+                self._transport = sasl_transport.TSaslClientTransport(
+                    lambda: get_installed_sasl(
+                        host=host, sasl_auth=sasl_auth, service=kerberos_service_name,
+                        username=username, password=password),
+                    sasl_auth, socket)
             else:
                 # All HS2 config options:
                 # https://cwiki.apache.org/confluence/display/Hive/Setting+Up+HiveServer2#SettingUpHiveServer2-Configuration
@@ -260,13 +424,32 @@ class Connection(object):
                     "authentication are supported, got {}".format(auth))
 
         protocol = thrift.protocol.TBinaryProtocol.TBinaryProtocol(self._transport)
-        self._client = TCLIService.Client(protocol)
-        # oldest version that still contains features we care about
-        # "V6 uses binary type for binary payload (was string) and uses columnar result set"
-        protocol_version = ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V6
+        self._client = _SynchronizedClient(TCLIService.Client(protocol), new_http_transport)
+        # The server answers with the highest version both sides support
+        protocol_version = _MAX_PROTOCOL_VERSION
+
+        self._info_key = info_key
+        self._connect_timings = collections.OrderedDict()
+        start = [time.time()]
+
+        def mark(phase):
+            now = time.time()
+            self._connect_timings[phase] = now - start[0]
+            start[0] = now
 
+        if fast_connect:
+            configuration = dict(configuration, **{'use:database': database})
         try:
-            self._transport.open()
+            if socket is not None:
+                # Open the socket by itself so that connecting and authenticating are timed apart
+                socket.open()
+                mark('tcp')
+                if auth != 'NOSASL':
+                    self._transport.open()
+                    mark('sasl')
+            else:
+                self._transport.open()
+                mark('tcp')
             open_session_req = ttypes.TOpenSessionReq(
                 client_protocol=protocol_version,
                 configuration=configuration,
@@ -276,16 +459,57 @@ class Connection(object):
             _check_status(response)
             assert response.sessionHandle is not None, "Expected a session from OpenSession"
             self._sessionHandle = response.sessionHandle
-            assert response.serverProtocolVersion == protocol_version, \
+            assert _MIN_PROTOCOL_VERSION <= response.serverProtocolVersion <= protocol_version, \
                 "Unable to handle protocol version {}".format(response.serverProtocolVersion)
-            with contextlib.closing(self.cursor()) as cursor:
-                cursor.execute('USE `{}`'.format(database))
+            self._protocol_version = response.serverProtocolVersion
+            mark('open_session')
+            if not fast_connect:
+                with contextlib.closing(self.cursor()) as cursor:
+                    cursor.execute('USE `{}`'.format(database))
+                mark('use_database')
         except:
             self._transport.close()
             raise
+        _logger.debug("Connect timings: %s", self._connect_timings)
+
+    @staticmethod
+    def _requests_credentials(url, authorization, negotiate, requests_session):
+        """Return the ``HttpCredentials`` for the transports of a connection with ``requests``"""
+        # Defer import so package dependency is optional
+        from pyhive import http_transport
+        if negotiate is not None:
+            # The Kerberos principal comes from the ticket cache, which can change between
+            # connections, so only this connection's threads share the token and cookie
+            return http_transport.HttpCredentials(negotiate=negotiate)
+        # Connections as the same user share HiveServer2's auth cookie. The key outlives the
+        # connection, so it holds a digest of the password instead of the password.
+        key = (url, hashlib.sha256(authorization.encode('utf-8')).hexdigest())
+        return http_transport.shared_credentials(requests_session, key, authorization)
 
     @staticmethod
-    def _set_authorization_header(transport, username=None, password=None):
+    def _http_transport(url, ssl_context, authorization, negotiate, requests_session=None,
+                        requests_kwargs=None, credentials=None):
+        """Return a transport sending each call as an HTTP request to HiveServer2, with
+        ``requests`` if given a session
+        """
+        if requests_session is not None:
+            # Defer import so package dependency is optional
+            from pyhive import http_transport
+            return http_transport.RequestsTransport(
+                url, requests_session, requests_kwargs, credentials)
+        if negotiate is not None:
+            http_client = _NegotiateHttpClient(negotiate, uri_or_host=url, ssl_context=ssl_context)
+        else:
+            http_client = thrift.transport.THttpClient.THttpClient(
+                uri_or_host=url,
+                ssl_context=ssl_context,
+            )
+            http_client.setCustomHeaders({"Authorization": authorization})
+        # Buffer so that string columns are parsed in place, see _read_var_len_buffered
+        return thrift.transport.TTransport.TBufferedTransport(http_client)
+
+    @staticmethod
+    def _basic_authorization(username=None, password=None):
         username = username or "user"
         password = password or "pass"
         auth_credentials = "{username}:{password}".format(
@@ -294,16 +518,12 @@ class Connection(object):
         auth_credentials_base64 = base64.standard_b64encode(auth_credentials).decode(
             "UTF-8"
         )
-        transport.setCustomHeaders(
-            {
-                "Authorization": "Basic {auth_credentials_base64}".format(
-                    auth_credentials_base64=auth_credentials_base64
-                )
-            }
+        return "Basic {auth_credentials_base64}".format(
+            auth_credentials_base64=auth_credentials_base64
         )
 
     @staticmethod
-    def _set_kerberos_header(transport, kerberos_service_name, host):
+    def _kerberos_authorization(kerberos_service_name, host):
         import kerberos
 
         __, krb_context = kerberos.authGSSClientInit(
@@ -314,14 +534,7 @@ class Connection(object):
         kerberos.authGSSClientClean(krb_context, "")
         kerberos.authGSSClientStep(krb_context, "")
         auth_header = kerberos.authGSSClientResponse(krb_context)
-
-        transport.setCustomHeaders(
-            {
-                "Authorization": "Negotiate {auth_header}".format(
-                    auth_header=auth_header
-                )
-            }
-        )
+        return "Negotiate {auth_header}".format(auth_header=auth_header)
 
     def __enter__(self):
         """Transport should already be opened by __init__"""
@@ -335,7 +548,10 @@ class Connection(object):
         """Close the underlying session and Thrift transport"""
         req = ttypes.TCloseSessionReq(sessionHandle=self._sessionHandle)
         response = self._client.CloseSession(req)
+        self._client.close()
         self._transport.close()
+        if self._owned_requests_session is not None:
+            self._owned_requests_session.close()
         _check_status(response)
 
     def commit(self):
@@ -346,8 +562,61 @@ class Connection(object):
         """Return a new :py:class:`Cursor` object using the connection."""
         return Cursor(self, *args, **kwargs)
 
+    @property
+    def connect_timings(self):
+        """Seconds spent in each phase of connecting, in order: ``tcp`` (opening the
+        transport), ``sasl`` (authenticating, unless using NOSASL or a custom or HTTP transport),
+        ``open_session`` and ``use_database`` (unless using ``fast_connect``).
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        return dict(self._connect_timings)
+
+    def server_info(self):
+        """Return a dict of the server's name, DBMS name and DBMS version, keyed by
+        :py:class:`TCLIService.ttypes.TGetInfoType` names.
+
+        They are fetched with ``GetInfo`` calls once per process and server, and cached for later
+        connections to the same server.
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        key = self._info_key
+        with _server_info_lock:
+            if key is not None and key in _server_info_cache:
+                return dict(_server_info_cache[key])
+        info = {}
+        for info_type in _SERVER_INFO_TYPES:
+            req = ttypes.TGetInfoReq(sessionHandle=self._sessionHandle, infoType=info_type)
+            response = self._client.GetInfo(req)
+            _check_status(response)
+            info[ttypes.TGetInfoType._VALUES_TO_NAMES[info_type]] = response.infoValue.stringValue
+        if key is not None:
+            with _server_info_lock:
+                _server_info_cache[key] = info
+        return dict(info)
+
+    @property
+    def protocol_version(self):
+        """The ``TProtocolVersion`` negotiated with the server
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        return self._protocol_version
+
     @property
     def client(self):
+        """The Thrift client. It may be used from several threads at once.
+
+        In binary mode, a call holds a lock on the connection until its response is read, so that
+        the messages of different threads don't interleave on the socket. In HTTP mode, every
+        call is a separate HTTP request, so a call made while the others are busy opens another
+        transport instead, and calls from different threads run in parallel. Those transports are
+        reused by later calls from any thread and closed with the connection.
+        """
         return self._client
 
     @property
@@ -358,6 +627,404 @@ class Connection(object):
         raise NotSupportedError("Hive does not have transactions")  # pragma: no cover
 
 
+class _NegotiateHttpClient(thrift.transport.THttpClient.THttpClient):
+    """``THttpClient`` sending a Kerberos token from ``negotiate``. When the server rejects it,
+    e.g. because the ticket expired, it makes a new one and sends the call again, once.
+    """
+
+    def __init__(self, negotiate, **kwargs):
+        thrift.transport.THttpClient.THttpClient.__init__(self, **kwargs)
+        self._negotiate = negotiate
+        self._authorization = None
+        # THttpClient drops its buffer when sending, so keep the message to send it again
+        self._message = io.BytesIO()
+
+    def write(self, buf):
+        self._message.write(buf)
+
+    def flush(self):
+        data = self._message.getvalue()
+        self._message = io.BytesIO()
+        renew = self._authorization is None
+        while True:
+            if renew:
+                self._authorization = self._negotiate()
+            self.setCustomHeaders({"Authorization": self._authorization})
+            thrift.transport.THttpClient.THttpClient.write(self, data)
+            thrift.transport.THttpClient.THttpClient.flush(self)
+            if self.code != 401 or renew:
+                return
+            renew = True
+
+
+class _SynchronizedClient(object):
+    """Proxy for a ``TCLIService.Client`` that threads can share, see :py:attr:`Connection.client`
+
+    :param new_transport: Returns a new transport, for opening another client when the others are
+        busy instead of waiting for one. Without it, threads take turns on ``client``.
+    """
+
+    def __init__(self, client, new_transport=None):
+        self._client = client
+        self._lock = threading.Lock()
+        self._new_transport = new_transport
+        # Clients not in use, most recently used last
+        self._idle = [client]
+        # Transports opened for more clients, to close with the connection
+        self._transports = []
+
+    @contextlib.contextmanager
+    def _checkout(self):
+        """Lend a client to the current thread until the block exits.
+
+        Clients aren't tied to threads, so short-lived threads like prefetchers reuse the
+        transports opened before them, and there are only as many as calls made at once.
+        """
+        if self._new_transport is None:
+            with self._lock:
+                yield self._client
+            return
+        with self._lock:
+            client = self._idle.pop() if self._idle else None
+        if client is None:
+            transport = self._new_transport()
+            transport.open()
+            with self._lock:
+                self._transports.append(transport)
+            client = TCLIService.Client(
+                thrift.protocol.TBinaryProtocol.TBinaryProtocol(transport))
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._idle.append(client)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._checkout() as client:
+                return getattr(client, name)(*args, **kwargs)
+        return call
+
+    def close(self):
+        """Close the transports opened for more clients"""
+        with self._lock:
+            transports, self._transports = self._transports, []
+            self._idle = [self._client]
+        for transport in transports:
+            transport.close()
+
+
+# Returned by ConnectionPool._checkout when it would have to wait
+_POOL_FULL = object()
+
+
+class ConnectionPool(object):
+    """Keeps open :py:class:`Connection` objects around for reuse, to save the cost of connecting,
+    authenticating, opening a session and switching databases for every use.
+
+    Connections are keyed by their :py:func:`connect` arguments, e.g. host, username, database and
+    configuration, and only lent out for the same arguments. Usage::
+
+        pool = hive.ConnectionPool(host='localhost', max_size=4)
+        with pool.connection(database='default') as connection:
+            ...
+
+    .. note::
+        This is not a part of DB-API.
+    """
+
+    def __init__(self, max_size=10, max_age=None, max_idle=None, timeout=None, validate=True,
+                 prewarm=0, **kwargs):
+        """
+        :param max_size: Maximum number of connections, lent out or idle. When reached, idle
+            connections with other arguments are closed to make room, or else callers wait.
+        :param max_age: Seconds after which a connection is closed instead of reused.
+        :param max_idle: Seconds after which an unused connection is closed.
+        :param timeout: Seconds to wait for a connection before raising ``OperationalError``.
+            Defaults to waiting forever.
+        :param validate: Whether to check that an idle connection still works with a cheap
+            ``GetInfo`` call before lending it.
+        :param prewarm: How many connections to open right away, with ``kwargs``.
+        :param kwargs: Default arguments to :py:func:`connect`.
+        """
+        self._max_size = max_size
+        self._max_age = max_age
+        self._max_idle = max_idle
+        self._timeout = timeout
+        self._validate = validate
+        self._kwargs = kwargs
+        self._closed = False
+        self._reset()
+        if prewarm:
+            self.prewarm(prewarm)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        # key -> deque of (connection, created, last released), most recently released last
+        self._idle = collections.defaultdict(collections.deque)
+        # connection -> (key, created)
+        self._in_use = {}
+        self._size = 0
+        self._stats = collections.Counter()
+        self._wait_time = 0.0
+
+    def _check_fork(self):
+        """Forget connections inherited from a parent process. Their sockets belong to the parent,
+        so they're neither used nor closed.
+        """
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def stats(self):
+        """Return a dict of counters: ``hits`` and ``misses`` of :py:meth:`acquire`, how many
+        connections were ``discarded``, how many calls ``waited`` and their total ``wait_time`` in
+        seconds, how many ``timeouts`` occurred, and the current ``size``, ``idle`` and ``in_use``
+        connection counts.
+        """
+        self._check_fork()
+        with self._cond:
+            stats = {name: self._stats[name]
+                     for name in ('hits', 'misses', 'discarded', 'waited', 'timeouts')}
+            stats.update(
+                wait_time=self._wait_time,
+                size=self._size,
+                idle=sum(len(entries) for entries in self._idle.values()),
+                in_use=len(self._in_use),
+            )
+            return stats
+
+    @contextlib.contextmanager
+    def connection(self, **kwargs):
+        """Context manager lending a connection for the given :py:func:`connect` arguments. The
+        connection is returned to the pool afterwards, or closed if an exception was raised.
+        """
+        connection = self.acquire(**kwargs)
+        try:
+            yield connection
+        except:  # noqa: E722
+            self.release(connection, discard=True)
+            raise
+        self.release(connection)
+
+    def acquire(self, **kwargs):
+        """Return a connection for the given :py:func:`connect` arguments, opening one if no idle
+        one is available. Pass it to :py:meth:`release` when done.
+        """
+        return self._acquire(dict(self._kwargs, **kwargs))
+
+    def _acquire(self, kwargs, wait=True):
+        """Implement :py:meth:`acquire` for the complete ``kwargs``. Without ``wait``, return None
+        when the pool is full instead of waiting.
+        """
+        key = _pool_key(kwargs)
+        while True:
+            entry = self._checkout(key, wait)
+            if entry is _POOL_FULL:
+                return None
+            if entry is None:
+                try:
+                    connection = connect(**kwargs)
+                except:  # noqa: E722
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify_all()
+                    raise
+                with self._cond:
+                    self._stats['misses'] += 1
+                    self._in_use[connection] = (key, time.time())
+                connection._pool = (self, kwargs)
+                return connection
+            connection, created, _released = entry
+            if not self._validate or _is_alive(connection):
+                with self._cond:
+                    self._stats['hits'] += 1
+                    self._in_use[connection] = (key, created)
+                connection._pool = (self, kwargs)
+                return connection
+            self._discard(connection)
+
+    def _checkout(self, key, wait=True):
+        """Reserve an idle connection for ``key`` and return its entry, or reserve room for a new
+        one and return None. Without ``wait``, return ``_POOL_FULL`` if neither is possible.
+        """
+        self._check_fork()
+        stale = []
+        start = time.time()
+        waited = False
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise ProgrammingError("Connection pool is closed")
+                    stale += self._pop_expired()
+                    idle = self._idle.get(key)
+                    if idle:
+                        return idle.pop()
+                    if self._size < self._max_size:
+                        self._size += 1
+                        return None
+                    oldest = self._pop_oldest_idle()
+                    if oldest is not None:
+                        stale.append(oldest)
+                        continue
+                    if not wait:
+                        return _POOL_FULL
+                    remaining = None
+                    if self._timeout is not None:
+                        remaining = start + self._timeout - time.time()
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            raise OperationalError(
+                                "Timed out waiting for a connection from the pool")
+                    waited = True
+                    self._cond.wait(remaining)
+        finally:
+            if waited:
+                with self._cond:
+                    self._stats['waited'] += 1
+                    self._wait_time += time.time() - start
+            for connection in stale:
+                _close_quietly(connection)
+
+    def _pop_expired(self):
+        """Remove idle connections that are too old or idle for too long and return them"""
+        now = time.time()
+        expired = []
+        for key, entries in list(self._idle.items()):
+            kept = collections.deque()
+            for connection, created, released in entries:
+                if (
+                    (self._max_age is not None and now - created >= self._max_age)
+                    or (self._max_idle is not None and now - released >= self._max_idle)
+                ):
+                    expired.append(connection)
+                else:
+                    kept.append((connection, created, released))
+            if kept:
+                self._idle[key] = kept
+            else:
+                del self._idle[key]
+        self._size -= len(expired)
+        self._stats['discarded'] += len(expired)
+        return expired
+
+    def _pop_oldest_idle(self):
+        """Remove the least recently released idle connection and return it, if any"""
+        entries = [entries for entries in self._idle.values() if entries]
+        if not entries:
+            return None
+        oldest = min(entries, key=lambda entries: entries[0][2])
+        self._size -= 1
+        self._stats['discarded'] += 1
+        return oldest.popleft()[0]
+
+    def _discard(self, connection):
+        with self._cond:
+            self._size -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify_all()
+        _close_quietly(connection)
+
+    def release(self, connection, discard=False):
+        """Return a connection from :py:meth:`acquire` to the pool.
+
+        :param discard: Close the connection instead, e.g. because it is in a bad state.
+        """
+        self._check_fork()
+        with self._cond:
+            if connection not in self._in_use:
+                # Lent out before a fork, or already released
+                return
+            key, created = self._in_use.pop(connection)
+            now = time.time()
+            if not (
+                discard or self._closed
+                or (self._max_age is not None and now - created >= self._max_age)
+            ):
+                self._idle[key].append((connection, created, now))
+                self._cond.notify_all()
+                return
+        self._discard(connection)
+
+    def prewarm(self, count, **kwargs):
+        """Open connections for the given :py:func:`connect` arguments until ``count`` of them are
+        idle, or the pool is full
+        """
+        kwargs = dict(self._kwargs, **kwargs)
+        key = _pool_key(kwargs)
+        self._check_fork()
+        while True:
+            with self._cond:
+                if len(self._idle[key]) >= count or self._size >= self._max_size:
+                    return
+                self._size += 1
+            try:
+                connection = connect(**kwargs)
+            except:  # noqa: E722
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle[key].append((connection, time.time(), time.time()))
+                self._cond.notify_all()
+
+    def close(self):
+        """Close all idle connections. Lent out connections are closed when released."""
+        self._check_fork()
+        with self._cond:
+            self._closed = True
+            idle = [entry[0] for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            _close_quietly(connection)
+
+
+def _pool_key(kwargs):
+    """Return a hashable key for a dict of :py:func:`connect` arguments"""
+    return _frozen(kwargs)
+
+
+def _frozen(value):
+    """Return a hashable equivalent of ``value``, recursively turning dicts into sorted tuples of
+    items, lists into tuples and sets into frozensets
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _frozen(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_frozen(v) for v in value)
+    return value
+
+
+def _is_alive(connection):
+    """Check whether a connection's session still works, with a cheap round trip"""
+    req = ttypes.TGetInfoReq(sessionHandle=connection.sessionHandle,
+                             infoType=ttypes.TGetInfoType.CLI_SERVER_NAME)
+    try:
+        _check_status(connection.client.GetInfo(req))
+    except Exception:
+        _logger.debug("Discarding broken pooled connection", exc_info=True)
+        return False
+    return True
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        _logger.debug("Failed to close pooled connection", exc_info=True)
+
+
 class Cursor(common.DBAPICursor):
     """These objects represent a database cursor, which is used to manage the context of a fetch
     operation.
@@ -366,16 +1033,80 @@ class Cursor(common.DBAPICursor):
     visible by other cursors or connections.
     """
 
-    def __init__(self, connection, arraysize=1000):
+    # Rows to ask for in the first FetchResults call of a query when fetch_bytes is set
+    _INITIAL_FETCH_ROWS = 100
+    _escaper = _escaper
+    # Set by watch_progress
+    _progress_watcher = None
+
+    def __init__(self, connection, arraysize=1000, prefetch=0, fetch_bytes=None,
+                 lazy_conversion=False, configuration=None):
+        """
+        :param arraysize: How many rows to ask for in each ``FetchResults`` call.
+        :param prefetch: If positive, fetch results in a background thread, keeping up to this
+            many batches buffered ahead of the caller, so that fetching overlaps with processing
+            the rows. :py:meth:`cancel`, :py:meth:`poll` and :py:meth:`fetch_logs` pause it.
+        :param fetch_bytes: If set, size ``FetchResults`` calls adaptively instead of using
+            ``arraysize``: start with a small batch for a quick first row, then double the batch
+            size each call, up to about this many bytes based on the bytes per row seen so far.
+            ``fetchmany(size)`` with no rows buffered asks for exactly ``size`` rows.
+        :param lazy_conversion: If true, return rows as :py:class:`pyhive.common.LazyRow` objects,
+            which convert values like decimals, timestamps and dates only when they're accessed.
+            This saves time when only a few columns of wide rows are used.
+        :param configuration: A dictionary of Hive settings (functionally same as the `set`
+            command) sent with every statement of this cursor, see :py:meth:`execute`.
+        """
         self._operationHandle = None
-        super(Cursor, self).__init__()
+        self._configuration = configuration or {}
+        self._fetch_bytes = fetch_bytes
+        self._lazy_conversion = lazy_conversion
+        super(Cursor, self).__init__(prefetch=prefetch)
         self._arraysize = arraysize
         self._connection = connection
 
+    _NUMPY_TYPES = {
+        'BOOLEAN_TYPE': 'bool',
+        'TINYINT_TYPE': 'int8',
+        'SMALLINT_TYPE': 'int16',
+        'INT_TYPE': 'int32',
+        'BIGINT_TYPE': 'int64',
+        'FLOAT_TYPE': 'float32',
+        'DOUBLE_TYPE': 'float64',
+        'TIMESTAMP_TYPE': 'datetime64[us]',
+        'DATE_TYPE': 'datetime64[D]',
+        'INTERVAL_DAY_TIME_TYPE': 'timedelta64[us]',
+    }
+
+    _ARROW_TYPES = {
+        'BOOLEAN_TYPE': ('bool_',),
+        'TINYINT_TYPE': ('int8',),
+        'SMALLINT_TYPE': ('int16',),
+        'INT_TYPE': ('int32',),
+        'BIGINT_TYPE': ('int64',),
+        'FLOAT_TYPE': ('float32',),
+        'DOUBLE_TYPE': ('float64',),
+        'STRING_TYPE': ('string',),
+        'VARCHAR_TYPE': ('string',),
+        'CHAR_TYPE': ('string',),
+        'TIMESTAMP_TYPE': ('timestamp', 'us'),
+        'DATE_TYPE': ('date32',),
+        'BINARY_TYPE': ('binary',),
+        'INTERVAL_DAY_TIME_TYPE': ('duration', 'us'),
+    }
+
     def _reset_state(self):
         """Reset state about the previous query in preparation for running another query"""
+        self._stop_progress()
         super(Cursor, self)._reset_state()
         self._description = None
+        self._type_qualifiers = None
+        self._decoders = None
+        self._converters = None
+        self._metadata_operation = False
+        # FETCH_FIRST after rewind
+        self._orientation = ttypes.TFetchOrientation.FETCH_NEXT
+        self._fetch_rows = self._INITIAL_FETCH_ROWS
+        self._requested_rows = None
         if self._operationHandle is not None:
             request = ttypes.TCloseOperationReq(self._operationHandle)
             try:
@@ -425,14 +1156,19 @@ class Cursor(common.DBAPICursor):
             _check_status(response)
             columns = response.schema.columns
             self._description = []
+            self._type_qualifiers = []
             for col in columns:
                 primary_type_entry = col.typeDesc.types[0]
+                qualifiers = {}
                 if primary_type_entry.primitiveEntry is None:
                     # All fancy stuff maps to string
                     type_code = ttypes.TTypeId._VALUES_TO_NAMES[ttypes.TTypeId.STRING_TYPE]
                 else:
                     type_id = primary_type_entry.primitiveEntry.type
                     type_code = ttypes.TTypeId._VALUES_TO_NAMES[type_id]
+                    if primary_type_entry.primitiveEntry.typeQualifiers is not None:
+                        qualifiers = primary_type_entry.primitiveEntry.typeQualifiers.qualifiers
+                self._type_qualifiers.append(qualifiers or {})
                 self._description.append((
                     col.columnName.decode('utf-8') if sys.version_info[0] == 2 else col.columnName,
                     type_code.decode('utf-8') if sys.version_info[0] == 2 else type_code,
@@ -440,6 +1176,15 @@ class Cursor(common.DBAPICursor):
                 ))
         return self._description
 
+    def _arrow_types(self, pyarrow):
+        types = super(Cursor, self)._arrow_types(pyarrow)
+        for i, (col, qualifiers) in enumerate(zip(self.description, self._type_qualifiers)):
+            precision = qualifiers.get(constants.PRECISION)
+            scale = qualifiers.get(constants.SCALE)
+            if col[1] == 'DECIMAL_TYPE' and precision is not None and scale is not None:
+                types[i] = pyarrow.decimal128(precision.i32Value, scale.i32Value)
+        return types
+
     def __enter__(self):
         return self
 
@@ -450,10 +1195,18 @@ class Cursor(common.DBAPICursor):
         """Close the operation handle"""
         self._reset_state()
 
-    def execute(self, operation, parameters=None, **kwargs):
+    def execute(self, operation, parameters=None, configuration=None, timeout=None, **kwargs):
         """Prepare and execute a database operation (query or command).
 
         Return values are not defined.
+
+        :param configuration: A dictionary of Hive settings that apply to this statement only,
+            on top of the cursor's ``configuration``. This saves the round trips of separate
+            ``SET`` statements.
+        :param timeout: If set, the server cancels the statement after this many seconds.
+
+        .. note::
+            ``configuration`` and ``timeout`` are not a part of DB-API.
         """
         # backward compatibility with Python < 3.7
         for kw in ['async', 'async_']:
@@ -474,44 +1227,263 @@ class Cursor(common.DBAPICursor):
         self._state = self._STATE_RUNNING
         _logger.info('%s', sql)
 
+        conf_overlay = dict(self._configuration)
+        conf_overlay.update(configuration or {})
         req = ttypes.TExecuteStatementReq(self._connection.sessionHandle,
-                                          sql, runAsync=async_)
+                                          sql, confOverlay=conf_overlay or None, runAsync=async_,
+                                          queryTimeout=timeout or 0)
         _logger.debug(req)
         response = self._connection.client.ExecuteStatement(req)
         _check_status(response)
         self._operationHandle = response.operationHandle
 
+    def _drain(self):
+        if not self._operationHandle.hasResultSet:
+            # execute already waited for the statement to finish
+            self._state = self._STATE_FINISHED
+        else:
+            super(Cursor, self)._drain()
+
+    @contextlib.contextmanager
+    def _worker_cursor(self):
+        """Return a cursor for another executemany thread, or None if there's no room for one.
+
+        If this cursor's connection came from a pool, the cursor is on another connection from
+        it, since a connection in binary mode runs one call at a time. There's no room if the
+        pool would have to wait for a connection, which could wait forever when the pool is full
+        of connections held by the caller. Otherwise, the cursor is on the same connection, which
+        runs calls in parallel in HTTP mode.
+        """
+        if self._connection._pool is None:
+            with contextlib.closing(
+                    self._connection.cursor(configuration=self._configuration)) as cursor:
+                yield cursor
+            return
+        pool, kwargs = self._connection._pool
+        connection = pool._acquire(kwargs, wait=False)
+        if connection is None:
+            yield None
+            return
+        try:
+            with contextlib.closing(connection.cursor(configuration=self._configuration)) as cursor:
+                yield cursor
+        except:  # noqa: E722
+            pool.release(connection, discard=True)
+            raise
+        pool.release(connection)
+
+    def schemas(self, schema=None, catalog=None):
+        """Fetch the schemas (databases) with a ``GetSchemas`` call, instead of a query. The rows
+        are read with the usual fetch methods and have the columns ``TABLE_SCHEM`` and
+        ``TABLE_CATALOG``.
+
+        :param schema: A SQL ``LIKE`` pattern for the schema names. Defaults to all.
+        :param catalog: A catalog name. Hive has none.
+        :returns: self
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        return self._execute_metadata(
+            'GetSchemas', ttypes.TGetSchemasReq, catalogName=catalog, schemaName=schema)
+
+    def tables(self, schema=None, table=None, table_types=None, catalog=None):
+        """Fetch tables and views with a ``GetTables`` call, instead of a query. The rows have the
+        columns ``TABLE_CAT``, ``TABLE_SCHEM``, ``TABLE_NAME``, ``TABLE_TYPE`` and ``REMARKS``,
+        plus more on newer servers.
+
+        :param schema: A SQL ``LIKE`` pattern for the schema names. Defaults to all.
+        :param table: A SQL ``LIKE`` pattern for the table names. Defaults to all.
+        :param table_types: A list of table types to include, e.g. ``['TABLE', 'VIEW']``, or
+            ``['MANAGED_TABLE', 'EXTERNAL_TABLE', 'VIRTUAL_VIEW']`` depending on the server's
+            ``hive.server2.table.type.mapping``. Defaults to all.
+        :param catalog: A catalog name. Hive has none.
+        :returns: self
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        return self._execute_metadata(
+            'GetTables', ttypes.TGetTablesReq, catalogName=catalog, schemaName=schema,
+            tableName=table, tableTypes=table_types)
+
+    def columns(self, schema=None, table=None, column=None, catalog=None):
+        """Fetch the columns of tables with a ``GetColumns`` call, instead of a query. The rows have
+        the columns of JDBC's ``DatabaseMetaData.getColumns``, including ``TABLE_SCHEM``,
+        ``TABLE_NAME``, ``COLUMN_NAME``, ``TYPE_NAME``, ``REMARKS`` and ``ORDINAL_POSITION``.
+
+        :param schema: A SQL ``LIKE`` pattern for the schema names. Defaults to all.
+        :param table: A SQL ``LIKE`` pattern for the table names. Defaults to all.
+        :param column: A SQL ``LIKE`` pattern for the column names. Defaults to all.
+        :param catalog: A catalog name. Hive has none.
+        :returns: self
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        return self._execute_metadata(
+            'GetColumns', ttypes.TGetColumnsReq, catalogName=catalog, schemaName=schema,
+            tableName=table, columnName=column)
+
+    def _execute_metadata(self, method, req_class, **kwargs):
+        """Start a metadata operation, to be fetched like a query"""
+        self._reset_state()
+        self._state = self._STATE_RUNNING
+        req = req_class(sessionHandle=self._connection.sessionHandle, **kwargs)
+        _logger.debug(req)
+        response = getattr(self._connection.client, method)(req)
+        _check_status(response)
+        self._operationHandle = response.operationHandle
+        self._metadata_operation = True
+        return self
+
     def cancel(self):
+        self._stop_prefetch()
+        self._stop_progress()
         req = ttypes.TCancelOperationReq(
             operationHandle=self._operationHandle,
         )
         response = self._connection.client.CancelOperation(req)
         _check_status(response)
 
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        self._request_rows(size)
+        return super(Cursor, self).fetchmany(size)
+
+    def _fetchmany_columns(self, size):
+        self._request_rows(size)
+        return super(Cursor, self)._fetchmany_columns(size)
+
+    def _request_rows(self, size):
+        """Make the next FetchResults call ask for exactly ``size`` rows, if adaptive sizing is on
+        and they would all come from that call
+        """
+        if self._fetch_bytes and size and not self._data and not self._prefetch:
+            self._requested_rows = size
+
+    def _fetch_size(self):
+        """Return how many rows the next FetchResults call should ask for"""
+        if not self._fetch_bytes:
+            return self.arraysize
+        if self._requested_rows is not None:
+            size, self._requested_rows = self._requested_rows, None
+            return size
+        return self._fetch_rows
+
+    def _adapt_fetch_size(self, num_rows, columns):
+        """Grow the adaptive batch size given the raw ``TColumn`` list of the latest response"""
+        bytes_per_row = max(float(sum(_column_size(col) for col in columns)) / num_rows, 1)
+        budget_rows = max(int(self._fetch_bytes / bytes_per_row), 1)
+        self._fetch_rows = min(self._fetch_rows * 2, budget_rows)
+
     def _fetch_more(self):
         """Send another TFetchResultsReq and update state"""
+        if not self._lazy_conversion:
+            self._data += zip(*self._fetch_more_columns())
+            return
+        columns = self._fetch_more_columns(decode=False)
+        if self._converters is None:
+            self._converters = [_column_converter(col[1]) for col in self.description]
+        converters = self._converters
+        self._data += [common.LazyRow(row, converters) for row in zip(*columns)]
+
+    def _fetch_column_batch(self):
+        """Return the next batch of rows as columns, straight from the columnar Thrift payload"""
+        if self._data or self._state != self._STATE_RUNNING or self._prefetch:
+            return super(Cursor, self)._fetch_column_batch()
+        columns = self._fetch_more_columns()
+        if not columns or not len(columns[0]):
+            return None
+        self._rownumber += len(columns[0])
+        return columns
+
+    def _fetch_more_columns(self, decode=True):
+        """Send another TFetchResultsReq, update state, and return the new rows as a list of
+        columns, with their values converted unless ``decode`` is false
+        """
         assert(self._state == self._STATE_RUNNING), "Should be running when in _fetch_more"
         assert(self._operationHandle is not None), "Should have an op handle in _fetch_more"
         if not self._operationHandle.hasResultSet:
             raise ProgrammingError("No result set")
+        watcher = self._progress_watcher
+        if watcher is not None:
+            # Results are only available once the query finished
+            watcher.join()
         req = ttypes.TFetchResultsReq(
             operationHandle=self._operationHandle,
-            orientation=ttypes.TFetchOrientation.FETCH_NEXT,
-            maxRows=self.arraysize,
+            orientation=self._orientation,
+            maxRows=self._fetch_size(),
         )
-        response = self._connection.client.FetchResults(req)
+        response = _fetch_results(self._connection.client, req)
         _check_status(response)
+        self._orientation = ttypes.TFetchOrientation.FETCH_NEXT
         schema = self.description
         assert not response.results.rows, 'expected data in columnar format'
-        columns = [_unwrap_column(col, col_schema[1]) for col, col_schema in
-                   zip(response.results.columns, schema)]
-        new_data = list(zip(*columns))
-        self._data += new_data
+        raw_columns = _row_set_columns(response.results)
+        if not decode:
+            decoders = [None] * len(schema)
+        else:
+            if self._decoders is None:
+                # Look up the conversions once per result set rather than per batch
+                self._decoders = [_column_decoder(col[1]) for col in schema]
+            decoders = self._decoders
+        columns = [_unwrap_column(col, decoder) for col, decoder in zip(raw_columns, decoders)]
+        if self._fetch_bytes and columns and len(columns[0]):
+            self._adapt_fetch_size(len(columns[0]), raw_columns)
         # response.hasMoreRows seems to always be False, so we instead check the number of rows
         # https://github.com/apache/hive/blob/release-1.2.1/service/src/java/org/apache/hive/service/cli/thrift/ThriftCLIService.java#L678
         # if not response.hasMoreRows:
-        if not new_data:
+        if (
+            not columns or not len(columns[0])
+            # Metadata results are complete on the server, so a short batch is the last one.
+            # This also saves asking for more, which some servers never answer.
+            or (self._metadata_operation and len(columns[0]) < req.maxRows)
+        ):
             self._state = self._STATE_FINISHED
+        return columns
+
+    def rewind(self):
+        """Go back to the first row of the result set. The next fetch asks the server to restart
+        the open operation's results with ``FETCH_FIRST``, so the query doesn't run again.
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        if self._state == self._STATE_NONE:
+            raise ProgrammingError("No query yet")
+        if not self._operationHandle.hasResultSet:
+            raise ProgrammingError("No result set")
+        self._stop_prefetch()
+        self._data.clear()
+        self._rownumber = 0
+        self._state = self._STATE_RUNNING
+        self._orientation = ttypes.TFetchOrientation.FETCH_FIRST
+
+    def scroll(self, value, mode='relative'):
+        """Move to another row of the result set, like the optional DB-API extension.
+
+        Moving back uses :py:meth:`rewind` and then skips rows, as does ``mode='absolute'`` to an
+        earlier row. Moving forward fetches and discards rows.
+
+        :param value: The number of rows to move by, or the row number with ``mode='absolute'``.
+        :param mode: ``relative`` or ``absolute``.
+        :raises: ``IndexError`` if the target row is outside the result set.
+        """
+        if mode == 'relative':
+            target = self._rownumber + value
+        elif mode == 'absolute':
+            target = value
+        else:
+            raise ProgrammingError("Unknown scroll mode {}".format(mode))
+        if target < 0:
+            raise IndexError("Cannot scroll before the first row")
+        if target < self._rownumber or (mode == 'absolute' and target == 0):
+            self.rewind()
+        while self._rownumber < target:
+            if not self.fetchmany(min(target - self._rownumber, self.arraysize)):
+                raise IndexError("Cannot scroll past the last row")
 
     def poll(self, get_progress_update=True):
         """Poll for and return the raw status data provided by the Hive Thrift REST API.
@@ -522,6 +1494,8 @@ class Cursor(common.DBAPICursor):
         """
         if self._state == self._STATE_NONE:
             raise ProgrammingError("No query yet")
+        self._stop_prefetch()
+        self._stop_progress()
 
         req = ttypes.TGetOperationStatusReq(
             operationHandle=self._operationHandle,
@@ -542,32 +1516,227 @@ class Cursor(common.DBAPICursor):
         """
         if self._state == self._STATE_NONE:
             raise ProgrammingError("No query yet")
+        self._stop_prefetch()
+        self._stop_progress()
+        return self._fetch_logs()[0]
 
-        try:  # Older Hive instances require logs to be retrieved using GetLog
-            req = ttypes.TGetLogReq(operationHandle=self._operationHandle)
-            logs = self._connection.client.GetLog(req).log.splitlines()
-        except ttypes.TApplicationException as e:  # Otherwise, retrieve logs using newer method
-            if e.type != ttypes.TApplicationException.UNKNOWN_METHOD:
-                raise
-            logs = []
-            while True:
-                req = ttypes.TFetchResultsReq(
-                    operationHandle=self._operationHandle,
-                    orientation=ttypes.TFetchOrientation.FETCH_NEXT,
-                    maxRows=self.arraysize,
-                    fetchType=1  # 0: results, 1: logs
-                )
-                response = self._connection.client.FetchResults(req)
-                _check_status(response)
-                assert not response.results.rows, 'expected data in columnar format'
-                assert len(response.results.columns) == 1, response.results.columns
-                new_logs = _unwrap_column(response.results.columns[0])
-                logs += new_logs
+    def _fetch_logs(self):
+        """Return a list of log lines, and whether it is the whole log so far rather than the lines
+        produced since the previous call
+        """
+        if self._connection._get_log_supported:
+            try:  # Older Hive instances require logs to be retrieved using GetLog
+                req = ttypes.TGetLogReq(operationHandle=self._operationHandle)
+                return self._connection.client.GetLog(req).log.splitlines(), True
+            except ttypes.TApplicationException as e:  # Otherwise, retrieve logs using newer method
+                if e.type != ttypes.TApplicationException.UNKNOWN_METHOD:
+                    raise
+                self._connection._get_log_supported = False
+        logs = []
+        while True:
+            req = ttypes.TFetchResultsReq(
+                operationHandle=self._operationHandle,
+                orientation=ttypes.TFetchOrientation.FETCH_NEXT,
+                maxRows=self.arraysize,
+                fetchType=1  # 0: results, 1: logs
+            )
+            response = _fetch_results(self._connection.client, req)
+            _check_status(response)
+            assert not response.results.rows, 'expected data in columnar format'
+            columns = _row_set_columns(response.results)
+            assert len(columns) == 1, columns
+            new_logs = _unwrap_column(columns[0])
+            logs += new_logs
 
-                if not new_logs:
-                    break
+            if not new_logs:
+                break
+        return logs, False
+
+    def watch_progress(self, callback=None, interval=1, logs=True):
+        """Start reporting the progress of the running query from a background thread, until it
+        finished. Use with ``execute(..., async_=True)``.
 
-        return logs
+        Every ``interval`` seconds, the thread gets the query status, including a
+        ``TProgressUpdateResp`` if the server provides one, and optionally the new log lines, and
+        turns them into a :py:class:`ProgressEvent`. Events are passed to ``callback``, or else
+        can be iterated over from the returned :py:class:`ProgressWatcher`.
+
+        While the thread runs, fetching results waits for the query to finish, and
+        :py:meth:`cancel`, :py:meth:`poll`, :py:meth:`fetch_logs` and :py:meth:`execute` stop it.
+
+        :param callback: A function called with each :py:class:`ProgressEvent`, from the thread.
+        :param interval: Seconds between status requests.
+        :param logs: Whether to fetch the query log too.
+        :returns: a :py:class:`ProgressWatcher`
+
+        .. note::
+            This is not a part of DB-API.
+        """
+        if self._state == self._STATE_NONE:
+            raise ProgrammingError("No query yet")
+        self._stop_prefetch()
+        self._stop_progress()
+        self._progress_watcher = ProgressWatcher(self, callback, interval, logs)
+        self._progress_watcher.start()
+        return self._progress_watcher
+
+    def _stop_progress(self):
+        """Stop the thread started by :py:meth:`watch_progress`, if any"""
+        if self._progress_watcher is not None:
+            self._progress_watcher.stop()
+            self._progress_watcher = None
+
+
+# States after which a query makes no more progress
+_TERMINAL_STATES = {
+    ttypes.TOperationState.FINISHED_STATE,
+    ttypes.TOperationState.CANCELED_STATE,
+    ttypes.TOperationState.CLOSED_STATE,
+    ttypes.TOperationState.ERROR_STATE,
+    ttypes.TOperationState.UKNOWN_STATE,
+    ttypes.TOperationState.TIMEDOUT_STATE,
+}
+
+
+class ProgressEvent(collections.namedtuple('ProgressEvent', [
+    'state', 'progress', 'elapsed', 'vertices', 'footer', 'logs', 'response',
+])):
+    """The status of a running query, as reported by :py:meth:`Cursor.watch_progress`.
+
+    - ``state``: the ``TOperationState`` name, e.g. ``RUNNING_STATE``
+    - ``progress``: the fraction of the work done from 0 to 1, or None if unknown
+    - ``elapsed``: seconds since the query started on the server, or None if unknown
+    - ``vertices``: a list of dicts, one per Tez vertex or MapReduce stage, keyed by the column
+      headers of Beeline's progress bar, e.g. ``VERTICES``, ``STATUS`` and ``COMPLETED``
+    - ``footer``: the summary line under Beeline's progress bar, or None
+    - ``logs``: the log lines produced since the previous event
+    - ``response``: the raw ``TGetOperationStatusResp``
+
+    .. note::
+        This is not a part of DB-API.
+    """
+    __slots__ = ()
+
+    @property
+    def finished(self):
+        """Whether the query is done running, successfully or not"""
+        return self.response.operationState in _TERMINAL_STATES
+
+    @property
+    def remaining(self):
+        """Estimated seconds until the query finishes, assuming steady progress, or None"""
+        if not self.progress or self.elapsed is None:
+            return None
+        return self.elapsed * (1 - self.progress) / self.progress
+
+
+def _progress_event(response, logs):
+    """Return a :py:class:`ProgressEvent` for a ``TGetOperationStatusResp`` and new log lines"""
+    update = response.progressUpdateResponse
+    progress = elapsed = footer = None
+    vertices = []
+    if update is not None:
+        progress = update.progressedPercentage
+        if update.startTime:
+            elapsed = max(time.time() - update.startTime / 1000.0, 0)
+        footer = update.footerSummary
+        vertices = [collections.OrderedDict(zip(update.headerNames or [], row))
+                    for row in update.rows or []]
+    state = ttypes.TOperationState._VALUES_TO_NAMES.get(response.operationState)
+    return ProgressEvent(state, progress, elapsed, vertices, footer, logs, response)
+
+
+class _ProgressPoller(object):
+    """Get the status and new log lines of a query as a :py:class:`ProgressEvent` on each call"""
+
+    def __init__(self, cursor, logs):
+        self._cursor = cursor
+        self._logs = logs
+        # How many lines of a whole log were reported already
+        self._log_lines = 0
+
+    def __call__(self):
+        cursor = self._cursor
+        req = ttypes.TGetOperationStatusReq(
+            operationHandle=cursor._operationHandle, getProgressUpdate=True)
+        response = cursor._connection.client.GetOperationStatus(req)
+        _check_status(response)
+        logs = []
+        if self._logs:
+            logs, whole = cursor._fetch_logs()
+            if whole:
+                logs, self._log_lines = logs[self._log_lines:], len(logs)
+        return _progress_event(response, logs)
+
+
+class ProgressWatcher(object):
+    """Thread polling the status of a query for :py:meth:`Cursor.watch_progress`.
+
+    Without a callback, iterating over it yields the :py:class:`ProgressEvent` objects until the
+    query finished, and re-raises any error from the thread.
+
+    .. note::
+        This is not a part of DB-API.
+    """
+
+    def __init__(self, cursor, callback, interval, logs):
+        self._poll = _ProgressPoller(cursor, logs)
+        self._callback = callback
+        self._interval = interval
+        self._events = None if callback is not None else queue.Queue()
+        self._stopped = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='pyhive-progress')
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                event = self._poll()
+                if self._callback is not None:
+                    self._callback(event)
+                else:
+                    self._events.put(event)
+                if event.finished:
+                    return
+                self._stopped.wait(self._interval)
+        except Exception as e:
+            self._error = e
+        finally:
+            if self._events is not None:
+                self._events.put(None)
+
+    def __iter__(self):
+        if self._events is None:
+            raise ProgrammingError("Events are passed to the callback")
+        while True:
+            event = self._events.get()
+            if event is None:
+                # Let later iterations end too
+                self._events.put(None)
+                if self._error is not None:
+                    raise self._error
+                return
+            yield event
+
+    def join(self, timeout=None):
+        """Wait for the thread to end, which it does once the query finished"""
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def wait(self):
+        """Wait for the query to finish, raising any error from the thread"""
+        self.join()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """Stop polling and wait for the thread to end"""
+        self._stopped.set()
+        self.join()
 
 
 #
@@ -585,25 +1754,358 @@ for type_id in constants.PRIMITIVE_TYPES:
 #
 
 
-def _unwrap_column(col, type_=None):
-    """Return a list of raw values from a TColumn instance."""
-    for attr, wrapper in iteritems(col.__dict__):
+# For every possible byte of a null bitmap, the bit positions that are set
+_NULL_BITS = tuple(tuple(b for b in range(8) if byte & (1 << b)) for byte in range(256))
+_NONZERO_BYTE = re.compile(b'[^\\x00]')
+
+
+def _null_indexes(nulls):
+    """Return the indexes flagged in a null bitmap.
+
+    Bit ``b`` of byte ``i`` flags value ``i * 8 + b``. Each byte is expanded with a lookup table.
+    When most bytes are zero, as in a typical bitmap, those are skipped by the regex engine instead
+    of being visited in Python.
+    """
+    nonzero = len(nulls) - nulls.count(b'\x00')
+    if not nonzero:
+        return []
+    if nonzero * 4 < len(nulls):
+        return [
+            match.start() * 8 + b
+            for match in _NONZERO_BYTE.finditer(nulls)
+            for b in _NULL_BITS[ord(match.group())]
+        ]
+    return [i * 8 + b for i, byte in enumerate(bytearray(nulls)) if byte for b in _NULL_BITS[byte]]
+
+
+# The value fields of a TColumn. Bindings generated with slots don't have a __dict__.
+_COLUMN_ATTRS = [spec[2] for spec in ttypes.TColumn.thrift_spec if spec is not None]
+
+
+def _unwrap_column(col, decode=None):
+    """Return a list of raw values from a TColumn instance, converted by ``decode`` from
+    :py:func:`_column_decoder` if given
+    """
+    for attr in _COLUMN_ATTRS:
+        wrapper = getattr(col, attr)
         if wrapper is not None:
             result = wrapper.values
             nulls = wrapper.nulls  # bit set describing what's null
             assert isinstance(nulls, bytes)
-            for i, char in enumerate(nulls):
-                byte = ord(char) if sys.version_info[0] == 2 else char
-                for b in range(8):
-                    if byte & (1 << b):
-                        result[i * 8 + b] = None
-            converter = TYPES_CONVERTER.get(type_, None)
-            if converter and type_:
-                result = [converter(row) if row else row for row in result]
+            null_indexes = _null_indexes(nulls)
+            if null_indexes and not isinstance(result, list):
+                # Values decoded by _fetch_results are read-only buffers
+                result = list(result)
+            for i in null_indexes:
+                result[i] = None
+            if decode is not None:
+                result = decode(result)
             return result
     raise DataError("Got empty column value {}".format(col))  # pragma: no cover
 
 
+def _row_set_columns(row_set):
+    """Return the ``TColumn`` list of a ``TRowSet``.
+
+    Servers speaking protocol V10 may send the columns serialized with the compact protocol into
+    ``binaryColumns`` instead (``hive.server2.thrift.resultset.serialize.in.tasks``).
+    """
+    if row_set.binaryColumns is None:
+        return row_set.columns
+    iprot = thrift.protocol.TCompactProtocol.TCompactProtocol(
+        thrift.transport.TTransport.TMemoryBuffer(row_set.binaryColumns))
+    columns = []
+    for _ in range(row_set.columnCount):
+        col = ttypes.TColumn()
+        col.read(iprot)
+        columns.append(col)
+    return columns
+
+
+def _column_size(col):
+    """Estimate how many bytes a TColumn took up in a response"""
+    for attr in _COLUMN_ATTRS:
+        wrapper = getattr(col, attr)
+        if wrapper is not None:
+            values = wrapper.values
+            size = len(wrapper.nulls)
+            if isinstance(values, array.array):
+                return size + values.itemsize * len(values)
+            if isinstance(values, _VarLenValues):
+                return size + values.nbytes
+            # Decoded value by value by the generated code
+            return size + sum(
+                4 + len(value) if isinstance(value, basestring) else 8 for value in values)
+    return 0
+
+
+def _fetch_results(client, req):
+    """Send a ``TFetchResultsReq`` and return its ``TFetchResultsResp``.
+
+    This is equivalent to ``client.FetchResults(req)``, except that column values are read off the
+    transport in bulk: fixed-width columns go straight into an ``array.array`` and string/binary
+    columns into one bytes buffer plus offsets, instead of one Python object per value. The
+    generated code is used as is when the protocol isn't the binary protocol.
+    """
+    if isinstance(client, _SynchronizedClient):
+        # Hold on to the client from sending the request until the whole response is read
+        with client._checkout() as thread_client:
+            return _fetch_results(thread_client, req)
+    iprot = client._iprot
+    if not isinstance(iprot, thrift.protocol.TBinaryProtocol.TBinaryProtocol):
+        return client.FetchResults(req)
+    client.send_FetchResults(req)
+    _fname, mtype, _rseqid = iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+        x = TApplicationException()
+        x.read(iprot)
+        iprot.readMessageEnd()
+        raise x
+    result = _read_struct(iprot, TCLIService.FetchResults_result(), _FETCH_RESULTS_RESULT_FIELDS)
+    iprot.readMessageEnd()
+    if result.success is not None:
+        return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT,
+                                "FetchResults failed: unknown result")
+
+
+def _read_struct(iprot, obj, fields):
+    """Read a struct into ``obj``.
+
+    ``fields`` maps field ids to ``(type, attribute name, read function)``. Unknown fields are
+    skipped like the generated code does.
+    """
+    iprot.readStructBegin()
+    while True:
+        _fname, ftype, fid = iprot.readFieldBegin()
+        if ftype == TType.STOP:
+            break
+        field = fields.get(fid)
+        if field is not None and field[0] == ftype:
+            setattr(obj, field[1], field[2](iprot))
+        else:
+            iprot.skip(ftype)
+        iprot.readFieldEnd()
+    iprot.readStructEnd()
+    return obj
+
+
+def _struct_reader(cls, fields=None):
+    """Return a read function for struct ``cls``, using the generated code if ``fields`` is None"""
+    def read(iprot):
+        if fields is not None:
+            return _read_struct(iprot, cls(), fields)
+        obj = cls()
+        obj.read(iprot)
+        return obj
+    return read
+
+
+def _list_reader(read_element):
+    def read(iprot):
+        _etype, size = iprot.readListBegin()
+        result = [read_element(iprot) for _ in range(size)]
+        iprot.readListEnd()
+        return result
+    return read
+
+
+def _column_reader(cls, read_values):
+    """Return a read function for a ``TXxxColumn`` whose values list is read by
+    ``read_values(trans, size)``
+    """
+    def read_list(iprot):
+        _etype, size = iprot.readListBegin()
+        values = read_values(iprot.trans, size)
+        iprot.readListEnd()
+        return values
+    return _struct_reader(cls, {
+        1: (TType.LIST, 'values', read_list),
+        2: (TType.STRING, 'nulls', lambda iprot: iprot.readBinary()),
+    })
+
+
+def _read_bools(trans, size):
+    return list(map(bool, bytearray(trans.readAll(size))))
+
+
+def _signed_typecode(itemsize):
+    """Return the ``array`` typecode for signed integers of ``itemsize`` bytes"""
+    for typecode in 'bhilq':
+        try:
+            if array.array(native_str(typecode)).itemsize == itemsize:
+                return native_str(typecode)
+        except ValueError:  # pragma: no cover
+            # 'q' is missing on Python 2
+            pass
+    raise NotImplementedError("No array type of size {}".format(itemsize))  # pragma: no cover
+
+
+_INT64_TYPECODE = _signed_typecode(8)
+
+
+def _fixed_width_reader(typecode):
+    """Return a function reading ``size`` big endian values of the given ``array`` typecode"""
+    itemsize = array.array(typecode).itemsize
+
+    def read(trans, size):
+        values = array.array(typecode, trans.readAll(itemsize * size))
+        if sys.byteorder == 'little':
+            values.byteswap()
+        return values
+    return read
+
+
+_I32 = struct.Struct(native_str('!i'))
+
+
+def _var_len_reader(decode):
+    """Return a function reading ``size`` length-prefixed strings into a :py:class:`_VarLenValues`
+    """
+    def read(trans, size):
+        if (
+            isinstance(trans, thrift.transport.TTransport.CReadableTransport)
+            and hasattr(trans.cstringio_buf, 'getbuffer')
+        ):
+            data, starts, ends = _read_var_len_buffered(trans, size)
+        else:
+            data, starts, ends = _read_var_len(trans, size)
+        return _VarLenValues(data, starts, ends, decode)
+    return read
+
+
+def _read_var_len(trans, size):
+    read_all = trans.readAll
+    data = bytearray()
+    starts = array.array(_INT64_TYPECODE)
+    ends = array.array(_INT64_TYPECODE)
+    for _ in range(size):
+        length, = _I32.unpack(read_all(4))
+        starts.append(len(data))
+        data += read_all(length)
+        ends.append(len(data))
+    return bytes(data), starts, ends
+
+
+def _read_var_len_buffered(trans, size):
+    """Like :py:func:`_read_var_len`, but parse the transport's read buffer in place.
+
+    The length prefixes stay in the returned data and the offsets skip over them, so values aren't
+    copied one by one. The buffer is refilled the same way the Thrift C extension does it.
+    """
+    unpack_from = _I32.unpack_from
+    starts = array.array(_INT64_TYPECODE)
+    ends = array.array(_INT64_TYPECODE)
+    pieces = []
+    buf = trans.cstringio_buf
+    view = buf.getbuffer()
+    try:
+        pos = first = buf.tell()
+        # offset in the returned data = offset in view + shift
+        shift = -first
+        available = len(view)
+        for _ in range(size):
+            if pos + 4 > available:
+                view, pos, first, shift, available, buf = _refill(
+                    trans, buf, view, pos, first, shift, pieces, 4)
+            length, = unpack_from(view, pos)
+            end = pos + 4 + length
+            if end > available:
+                view, pos, first, shift, available, buf = _refill(
+                    trans, buf, view, pos, first, shift, pieces, 4 + length)
+                end = pos + 4 + length
+            starts.append(pos + 4 + shift)
+            ends.append(end + shift)
+            pos = end
+        pieces.append(bytes(view[first:pos]))
+    finally:
+        view.release()
+    buf.seek(pos)
+    return b''.join(pieces), starts, ends
+
+
+def _refill(trans, buf, view, pos, first, shift, pieces, reqlen):
+    """Keep the consumed part of the current buffer and get one holding at least ``reqlen`` bytes
+    """
+    pieces.append(bytes(view[first:pos]))
+    prefix = bytes(view[pos:])
+    shift += pos
+    view.release()
+    buf.seek(0, 2)
+    buf = trans.cstringio_refill(prefix, reqlen)
+    view = buf.getbuffer()
+    pos = first = buf.tell()
+    return view, pos, first, shift - first, len(view), buf
+
+
+class _VarLenValues(object):
+    """Read-only sequence of the strings or binary values of a column, stored as a single buffer
+    plus offsets
+    """
+    __slots__ = ('_data', '_starts', '_ends', '_decode')
+
+    def __init__(self, data, starts, ends, decode):
+        self._data = data
+        self._starts = starts
+        self._ends = ends
+        self._decode = decode
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # A list, like the generated code reads
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = self._data[self._starts[index]:self._ends[index]]
+        return value.decode('utf-8') if self._decode else value
+
+    @property
+    def nbytes(self):
+        """Size of the values as sent, including their length prefixes"""
+        return sum(self._ends) - sum(self._starts) + 4 * len(self._starts)
+
+    def __iter__(self):
+        data = self._data
+        bounds = zip(self._starts, self._ends)
+        if self._decode:
+            return (data[start:end].decode('utf-8') for start, end in bounds)
+        return (data[start:end] for start, end in bounds)
+
+
+_COLUMN_FIELDS = {
+    1: (TType.STRUCT, 'boolVal', _column_reader(ttypes.TBoolColumn, _read_bools)),
+    2: (TType.STRUCT, 'byteVal',
+        _column_reader(ttypes.TByteColumn, _fixed_width_reader(_signed_typecode(1)))),
+    3: (TType.STRUCT, 'i16Val',
+        _column_reader(ttypes.TI16Column, _fixed_width_reader(_signed_typecode(2)))),
+    4: (TType.STRUCT, 'i32Val',
+        _column_reader(ttypes.TI32Column, _fixed_width_reader(_signed_typecode(4)))),
+    5: (TType.STRUCT, 'i64Val',
+        _column_reader(ttypes.TI64Column, _fixed_width_reader(_INT64_TYPECODE))),
+    6: (TType.STRUCT, 'doubleVal',
+        _column_reader(ttypes.TDoubleColumn, _fixed_width_reader(native_str('d')))),
+    7: (TType.STRUCT, 'stringVal', _column_reader(ttypes.TStringColumn, _var_len_reader(True))),
+    8: (TType.STRUCT, 'binaryVal', _column_reader(ttypes.TBinaryColumn, _var_len_reader(False))),
+}
+
+_ROW_SET_FIELDS = {
+    1: (TType.I64, 'startRowOffset', lambda iprot: iprot.readI64()),
+    2: (TType.LIST, 'rows', _list_reader(_struct_reader(ttypes.TRow))),
+    3: (TType.LIST, 'columns', _list_reader(_struct_reader(ttypes.TColumn, _COLUMN_FIELDS))),
+    4: (TType.STRING, 'binaryColumns', lambda iprot: iprot.readBinary()),
+    5: (TType.I32, 'columnCount', lambda iprot: iprot.readI32()),
+}
+
+_FETCH_RESULTS_RESULT_FIELDS = {
+    0: (TType.STRUCT, 'success', _struct_reader(ttypes.TFetchResultsResp, {
+        1: (TType.STRUCT, 'status', _struct_reader(ttypes.TStatus)),
+        2: (TType.BOOL, 'hasMoreRows', lambda iprot: iprot.readBool()),
+        3: (TType.STRUCT, 'results', _struct_reader(ttypes.TRowSet, _ROW_SET_FIELDS)),
+    })),
+}
+
+
 def _check_status(response):
     """Raise an OperationalError if the status is not success"""
     _logger.debug(response)
@@ -0,0 +1,235 @@
+"""Thrift HTTP transport built on ``requests``, for HiveServer2 in HTTP mode.
+
+``thrift.transport.THttpClient`` opens a new connection for every call, paying for the TCP and TLS
+handshakes each time. This transport sends calls through a ``requests.Session`` instead, whose
+connection pool keeps connections alive between calls and threads, so the handshakes happen once
+per pooled connection. Compressed responses are decoded, and ``requests`` arguments such as
+``timeout``, ``verify`` and ``cert`` are configurable.
+
+It also keeps the cookie HiveServer2 sets once it authenticated a client (see
+``hive.server2.thrift.http.cookie.auth.enabled``) and sends it instead of the credentials, so the
+server doesn't check a password or Kerberos ticket on every call. See :py:class:`HttpCredentials`.
+``THttpClient`` in ``thrift`` 0.10 sends no cookies at all.
+
+Use it with ``hive.connect(..., scheme='https', http_transport='requests')``.
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import threading
+import weakref
+
+from thrift.transport import TTransport
+
+# requests.Session -> {key: HttpCredentials}, see shared_credentials
+_shared_credentials = weakref.WeakKeyDictionary()
+_shared_credentials_lock = threading.Lock()
+
+
+def shared_credentials(session, key, authorization=None, negotiate=None):
+    """Return the :py:class:`HttpCredentials` for ``key`` in ``session``, creating them with the
+    given arguments on first use, so that connections using the same session to the same server
+    as the same user share one cookie. They're forgotten along with the session.
+
+    :param session: The ``requests.Session`` the credentials are used with.
+    :param key: A hashable identifying the server and user, e.g. ``(url, username)``. It's kept
+        as long as the session, so it shouldn't hold secrets such as a password.
+    """
+    with _shared_credentials_lock:
+        by_key = _shared_credentials.setdefault(session, {})
+        credentials = by_key.get(key)
+        if credentials is None:
+            credentials = by_key[key] = HttpCredentials(authorization, negotiate)
+        return credentials
+
+
+class HttpCredentials(object):
+    """How a :py:class:`RequestsTransport` authenticates, and the auth cookie it got from the
+    server. Safe to share between transports and threads.
+
+    Requests carry the cookie if there is one, and the ``Authorization`` header otherwise. When
+    the server rejects the cookie, the request is sent again with the header. When it rejects a
+    Kerberos token, e.g. because the ticket expired, a new token is generated once.
+
+    :param authorization: A fixed ``Authorization`` header value, e.g. for basic authentication.
+    :param negotiate: A function returning a new ``Authorization`` header value, e.g. with a
+        SPNEGO token. Called on first use and whenever the server rejects the last one.
+    """
+
+    def __init__(self, authorization=None, negotiate=None):
+        # Defer import so package dependency is optional
+        from requests.cookies import RequestsCookieJar
+        self._authorization = authorization
+        self._negotiate = negotiate
+        self._cookies = RequestsCookieJar()
+        self._lock = threading.Lock()
+
+    def authorization(self):
+        """Return the ``Authorization`` header value, or None to send none"""
+        with self._lock:
+            if self._authorization is None and self._negotiate is not None:
+                self._authorization = self._negotiate()
+            return self._authorization
+
+    def renew(self, rejected):
+        """Return a new ``Authorization`` header value to replace ``rejected``, or None if there
+        is no way to make one
+        """
+        if self._negotiate is None:
+            return None
+        with self._lock:
+            # Another thread may have renewed it already
+            if self._authorization == rejected:
+                self._authorization = self._negotiate()
+            return self._authorization
+
+    def cookies(self):
+        """Return a copy of the cookies to send"""
+        with self._lock:
+            return self._cookies.copy()
+
+    def update_cookies(self, cookies):
+        with self._lock:
+            self._cookies.update(cookies)
+
+    def clear_cookies(self):
+        with self._lock:
+            self._cookies.clear()
+
+
+class RequestsTransport(TTransport.TTransportBase, TTransport.CReadableTransport):
+    """Sends each Thrift message as a POST request and buffers the whole response.
+
+    :param url: The HiveServer2 endpoint, e.g. ``https://host:10001/cliservice/``.
+    :param session: A ``requests.Session`` to share between transports, e.g. those of a
+        connection's threads. If absent, the transport creates one and closes it in
+        :py:meth:`close`.
+    :param requests_kwargs: Additional ``**kwargs`` to pass to ``requests`` for each call, e.g.
+        ``timeout``, ``verify`` or ``auth``.
+    :param credentials: :py:class:`HttpCredentials`, e.g. from :py:func:`shared_credentials`.
+        If absent, the transport keeps the auth cookie to itself and sends only the headers given
+        to :py:meth:`setCustomHeaders`.
+    """
+
+    def __init__(self, url, session=None, requests_kwargs=None, credentials=None):
+        # Defer import so package dependency is optional
+        import requests
+        self._requests = requests
+        if session is None:
+            session = requests.Session()
+            self._owns_session = True
+        else:
+            self._owns_session = False
+        self._url = url
+        self._session = session
+        kwargs = dict(requests_kwargs or {})
+        # Like Session.prepare_request, but once
+        self._auth = kwargs.pop('auth', None) or session.auth
+        if self._auth is None and session.trust_env:
+            self._auth = requests.utils.get_netrc_auth(url)
+        # Session.request looks up proxy settings in the environment on every call, which takes
+        # longer than a call to a nearby server. Look them up once and send through the session's
+        # adapter instead.
+        settings = session.merge_environment_settings(
+            url, kwargs.pop('proxies', {}), kwargs.pop('stream', None), kwargs.pop('verify', None),
+            kwargs.pop('cert', None))
+        self._send_kwargs = dict(kwargs, **settings)
+        self._credentials = credentials or HttpCredentials()
+        self._custom_headers = {}
+        self._wbuf = io.BytesIO()
+        self._rbuf = io.BytesIO()
+        self._is_open = False
+        # Status of the last response, like THttpClient
+        self.code = None
+        self.message = None
+        self.headers = None
+
+    def isOpen(self):
+        return self._is_open
+
+    def open(self):
+        """Connections are opened by the session's pool when needed"""
+        self._is_open = True
+
+    def close(self):
+        self._is_open = False
+        if self._owns_session:
+            self._session.close()
+
+    def setCustomHeaders(self, headers):
+        """Set headers to send with every request, like ``THttpClient.setCustomHeaders``"""
+        self._custom_headers = dict(headers)
+
+    def read(self, sz):
+        return self._rbuf.read(sz)
+
+    def write(self, buf):
+        self._wbuf.write(buf)
+
+    def flush(self):
+        data = self._wbuf.getvalue()
+        self._wbuf = io.BytesIO()
+        credentials = self._credentials
+        cookies = credentials.cookies()
+        # Leave out the credentials if the cookie vouches for them
+        authorization = None if cookies else credentials.authorization()
+        renewed = False
+        while True:
+            response = self._post(data, authorization, cookies)
+            if response.status_code != 401:
+                break
+            if cookies:
+                # The cookie expired
+                credentials.clear_cookies()
+                cookies = None
+                authorization = credentials.authorization()
+            elif not renewed and authorization is not None:
+                # The Kerberos ticket may have expired
+                authorization = credentials.renew(authorization)
+                renewed = True
+                if authorization is None:
+                    break
+            else:
+                break
+        if response.cookies:
+            credentials.update_cookies(response.cookies)
+        self.code = response.status_code
+        self.message = response.reason
+        self.headers = response.headers
+        if response.status_code != 200:
+            raise TTransport.TTransportException(
+                TTransport.TTransportException.UNKNOWN,
+                "HTTP request failed with {} {}".format(response.status_code, response.reason))
+        self._rbuf = io.BytesIO(response.content)
+
+    def _post(self, data, authorization, cookies):
+        headers = {
+            'Content-Type': 'application/x-thrift',
+            'Accept': 'application/x-thrift',
+            'User-Agent': 'PyHive',
+        }
+        headers.update(self._custom_headers)
+        if authorization is not None:
+            headers['Authorization'] = authorization
+        # Leave out the session's cookie jar, and bypass Session.send, which stores the cookies of
+        # responses in it. The auth cookie belongs to the credentials, and other users of the
+        # session must not send it.
+        request = self._requests.PreparedRequest()
+        request.prepare(
+            method='POST', url=self._url, data=data, cookies=cookies, auth=self._auth,
+            headers=self._requests.sessions.merge_setting(
+                headers, self._session.headers,
+                dict_class=self._requests.structures.CaseInsensitiveDict))
+        return self._session.get_adapter(self._url).send(request, **self._send_kwargs)
+
+    # The Thrift C extension reads straight from the response buffer
+
+    @property
+    def cstringio_buf(self):
+        return self._rbuf
+
+    def cstringio_refill(self, partialread, reqlen):
+        # The whole response is buffered already, so there is nothing more to read
+        raise EOFError()
@@ -0,0 +1,56 @@
+"""Read query results into pandas DataFrames.
+
+Unlike ``pandas.read_sql`` over the SQLAlchemy dialects, this builds each DataFrame column by column
+from the cursor's columnar batches, without creating row objects or converting one value at a time.
+Column dtypes are derived once from the cursor's ``description``.
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import contextlib
+
+
+def read_sql(sql, conn, chunksize=None, parameters=None):
+    """Execute a query and return its result set as a ``pandas.DataFrame``.
+
+    :param sql: The query to execute.
+    :param conn: A PyHive DB-API connection, e.g. from :py:func:`pyhive.hive.connect` or
+        :py:func:`pyhive.presto.connect`.
+    :param chunksize: If given, return an iterator of DataFrames of at most ``chunksize`` rows
+        each instead of a single DataFrame, so that only one chunk is held in memory at a time.
+    :param parameters: Parameters to bind to ``sql``, as for ``cursor.execute``.
+
+    Integer columns containing nulls become ``float64`` columns with ``NaN``, like in
+    ``pandas.read_sql``. Columns whose type has no NumPy equivalent have the ``object`` dtype.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, parameters)
+        if chunksize is None:
+            with contextlib.closing(cursor):
+                return _to_frame(cursor, cursor._fetchmany_columns(None))
+    except:  # noqa: E722
+        cursor.close()
+        raise
+    return _iter_frames(cursor, chunksize)
+
+
+def _iter_frames(cursor, chunksize):
+    with contextlib.closing(cursor):
+        while True:
+            columns = cursor._fetchmany_columns(chunksize)
+            if not columns or not len(columns[0]):
+                return
+            yield _to_frame(cursor, columns)
+
+
+def _to_frame(cursor, columns):
+    # Defer import so package dependency is optional
+    import pandas
+
+    arrays = cursor._numpy_arrays(columns)
+    # Key by position so that duplicate column names don't clobber each other
+    frame = pandas.DataFrame(dict(enumerate(arrays)), columns=range(len(arrays)))
+    frame.columns = [col[0] for col in cursor.description]
+    return frame
@@ -0,0 +1,232 @@
+"""Read large tables faster by splitting a scan into disjoint queries that run at the same time.
+
+A single cursor streams a ``SELECT`` through one HiveServer2 operation or Presto query, which caps
+throughput at what one connection can do. :py:func:`read_table` instead runs one query per split,
+each filtering the table with a predicate such as a Hive partition, a hash bucket or a range of a
+column, on several connections at once.
+
+Usage::
+
+    connect = functools.partial(hive.connect, 'localhost')
+    with connect() as connection:
+        splits = parallel.partition_splits(connection, 'logs')
+    for rows in parallel.read_table(connect, 'logs', splits, concurrency=8):
+        ...
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import contextlib
+import importlib
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+try:  # Python 3
+    from urllib.parse import unquote
+except ImportError:  # Python 2
+    from urllib import unquote
+
+# How Hive names the partition of null values
+_HIVE_DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+
+def read_table(connect, table, splits, columns=None, where=None, concurrency=4, ordered=False,
+               arraysize=1000):
+    """Scan ``table`` with one query per split, running up to ``concurrency`` queries at once, and
+    yield the rows as lists of up to ``arraysize`` rows.
+
+    :param connect: A function returning a new DB-API connection, e.g.
+        ``functools.partial(pyhive.hive.connect, 'localhost')``, or a context manager lending one,
+        like :py:meth:`pyhive.hive.ConnectionPool.connection`. Each worker thread uses one
+        connection for all its splits, and closes or returns it when done.
+    :param table: The table name, quoted as needed.
+    :param splits: SQL predicates that together select every row exactly once, e.g. from
+        :py:func:`partition_splits`, :py:func:`hash_splits` or :py:func:`range_splits`.
+    :param columns: A list of column expressions to select. Defaults to all columns.
+    :param where: A predicate all rows must match, in addition to the split.
+    :param ordered: If true, yield all batches of the first split, then of the second and so on.
+        Batches of later splits are buffered in memory meanwhile. Otherwise, batches are yielded
+        as they arrive.
+    :param arraysize: How many rows to fetch at a time.
+
+    Stopping the iteration early stops the queries after their current batch.
+    """
+    select = 'SELECT {} FROM {} WHERE '.format(', '.join(columns) if columns else '*', table)
+    queries = [select + ('({}) AND ({})'.format(where, split) if where else split)
+               for split in splits]
+    concurrency = min(concurrency, len(queries))
+    return _SplitReader(connect, queries, arraysize, concurrency).read(ordered)
+
+
+class _SplitReader(object):
+    """Runs queries from worker threads and hands their batches to the caller's thread"""
+
+    def __init__(self, connect, queries, arraysize, concurrency):
+        self._connect = connect
+        self._queries = queries
+        self._arraysize = arraysize
+        self._pending = iter(enumerate(queries))
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        # (split index, batch of rows), or (split index, None) once a split is done, or
+        # (None, exception)
+        self._batches = queue.Queue(maxsize=concurrency * 2 or 1)
+        self._concurrency = concurrency
+
+    def read(self, ordered):
+        threads = [threading.Thread(target=self._work, name='pyhive-split-reader')
+                   for _ in range(self._concurrency)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            if ordered:
+                for batch in self._ordered_batches():
+                    yield batch
+            else:
+                remaining = len(self._queries)
+                while remaining:
+                    index, batch = self._get()
+                    if batch is None:
+                        remaining -= 1
+                    else:
+                        yield batch
+        finally:
+            self._stopped.set()
+            # Unblock workers waiting for room in the queue
+            while any(thread.is_alive() for thread in threads):
+                try:
+                    self._batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _ordered_batches(self):
+        buffered = [[] for _ in self._queries]
+        done = [False] * len(self._queries)
+        for current in range(len(self._queries)):
+            while True:
+                while buffered[current]:
+                    yield buffered[current].pop(0)
+                if done[current]:
+                    break
+                index, batch = self._get()
+                if batch is None:
+                    done[index] = True
+                else:
+                    buffered[index].append(batch)
+
+    def _get(self):
+        index, batch = self._batches.get()
+        if index is None:
+            raise batch
+        return index, batch
+
+    def _put(self, item):
+        """Queue ``item`` unless the reader stopped, and return whether it did"""
+        while not self._stopped.is_set():
+            try:
+                self._batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _next_query(self):
+        with self._lock:
+            return next(self._pending, (None, None))
+
+    def _work(self):
+        try:
+            with _opened(self._connect()) as connection:
+                while not self._stopped.is_set():
+                    index, sql = self._next_query()
+                    if sql is None:
+                        return
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(sql)
+                        while True:
+                            rows = cursor.fetchmany(self._arraysize)
+                            if not rows:
+                                break
+                            if not self._put((index, rows)):
+                                return
+                    finally:
+                        cursor.close()
+                    self._put((index, None))
+        except Exception as e:
+            self._put((None, e))
+
+
+def _opened(connection):
+    """Return a context manager for a connection, or the context manager lending one"""
+    if hasattr(connection, '__enter__'):
+        return connection
+    return contextlib.closing(connection)
+
+
+def partition_splits(connection, table):
+    """Return one split per partition of a Hive table, listed with ``SHOW PARTITIONS``.
+
+    :param connection: A :py:class:`pyhive.hive.Connection`.
+    """
+    # Defer import so package dependency is optional
+    from pyhive import hive
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute('SHOW PARTITIONS {}'.format(table))
+        names = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    splits = []
+    for name in names:
+        predicates = []
+        for part in name.split('/'):
+            column, value = (unquote(s) for s in part.split('=', 1))
+            if value == _HIVE_DEFAULT_PARTITION:
+                predicates.append('{} IS NULL'.format(column))
+            else:
+                predicates.append('{} = {}'.format(column, hive._escaper.escape_item(value)))
+        splits.append(' AND '.join(predicates))
+    return splits
+
+
+def hash_splits(column, count, dialect='hive'):
+    """Return ``count`` splits that divide the rows by a hash of ``column``.
+
+    :param column: The column expression to hash.
+    :param dialect: ``hive``, ``presto`` or ``trino``, for the hash function to use.
+    """
+    if dialect == 'hive':
+        # hash(NULL) is 0, so nulls are in the first split
+        return ['pmod(hash({}), {}) = {}'.format(column, count, i) for i in range(count)]
+    # mod() takes the sign of the hash, so each split has a positive and a negative remainder
+    hashed = 'from_big_endian_64(xxhash64(to_utf8(CAST({} AS varchar))))'.format(column)
+    splits = ['mod({}, {}) IN ({}, {})'.format(hashed, count, i, i - count)
+              for i in range(count)]
+    splits[0] = '{} OR {} IS NULL'.format(splits[0], column)
+    return splits
+
+
+def range_splits(column, bounds, dialect='hive'):
+    """Return ``len(bounds) + 1`` splits of ``column`` values: below the first bound, between
+    consecutive bounds, and from the last bound on. Nulls are in the first split.
+
+    :param bounds: Sorted values, e.g. dates or numbers.
+    :param dialect: ``hive``, ``presto`` or ``trino``, for escaping the bounds.
+    """
+    escaper = importlib.import_module('pyhive.' + dialect)._escaper
+    bounds = [escaper.escape_item(bound) for bound in bounds]
+    if not bounds:
+        return ['TRUE']
+    splits = ['{0} < {1} OR {0} IS NULL'.format(column, bounds[0])]
+    for low, high in zip(bounds, bounds[1:]):
+        splits.append('{0} >= {1} AND {0} < {2}'.format(column, low, high))
+    splits.append('{} >= {}'.format(column, bounds[-1]))
+    return splits
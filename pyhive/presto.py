@@ -16,12 +16,15 @@ from pyhive.common import DBAPITypeObject
 # Make all exceptions visible in this module per DB-API
 from pyhive.exc import *  # noqa
 import base64
+import contextlib
+import copy
 import getpass
 import datetime
 import logging
 import requests
 from requests.auth import HTTPBasicAuth
 import os
+import re
 
 try:  # Python 3
     import urllib.parse as urlparse
@@ -42,6 +45,9 @@ TYPES_CONVERTER = {
     "varbinary": base64.b64decode
 }
 
+_DECIMAL_PATTERN = re.compile(r'decimal\((\d+),\s*(\d+)\)$')
+
+
 class PrestoParamEscaper(common.ParamEscaper):
     def escape_datetime(self, item, format):
         _type = "timestamp" if isinstance(item, datetime.datetime) else "date"
@@ -95,13 +101,15 @@ class Cursor(common.DBAPICursor):
     Cursors are not isolated, i.e., any changes done to the database by a cursor are immediately
     visible by other cursors or connections.
     """
+    _escaper = _escaper
 
     def __init__(self, host, port='8080', username=None, principal_username=None, catalog='hive',
                  schema='default', poll_interval=1, source='pyhive', session_props=None,
                  protocol='http', password=None, requests_session=None, requests_kwargs=None,
                  KerberosRemoteServiceName=None, KerberosPrincipal=None,
                  KerberosConfigPath=None, KerberosKeytabPath=None,
-                 KerberosCredentialCachePath=None, KerberosUseCanonicalHostname=None):
+                 KerberosCredentialCachePath=None, KerberosUseCanonicalHostname=None,
+                 prefetch=0, lazy_conversion=False):
         """
         :param host: hostname to connect to, e.g. ``presto.example.com``
         :param port: int -- port, defaults to 8080
@@ -135,8 +143,15 @@ class Cursor(common.DBAPICursor):
             Presto coordinator for the Kerberos service principal by first resolving the
             hostname to an IP address and then doing a reverse DNS lookup for that IP address.
             This is enabled by default.
+        :param prefetch: int -- if positive, fetch pages in a background thread, keeping up to
+            this many pages of results buffered ahead of the caller. :py:meth:`cancel` and
+            :py:meth:`poll` pause it. Defaults to 0 (disabled).
+        :param lazy_conversion: bool -- if true, return rows as :py:class:`pyhive.common.LazyRow`
+            objects, which convert decimal and varbinary values only when they're accessed.
+            Defaults to ``False``.
         """
-        super(Cursor, self).__init__(poll_interval)
+        super(Cursor, self).__init__(poll_interval, prefetch)
+        self._lazy_conversion = lazy_conversion
         # Config
         self._host = host
         self._port = port
@@ -205,12 +220,48 @@ class Cursor(common.DBAPICursor):
 
         self._reset_state()
 
+    _NUMPY_TYPES = {
+        'boolean': 'bool',
+        'tinyint': 'int8',
+        'smallint': 'int16',
+        'integer': 'int32',
+        'bigint': 'int64',
+        'real': 'float32',
+        'double': 'float64',
+        'date': 'datetime64[D]',
+        'timestamp': 'datetime64[ms]',
+    }
+
+    _ARROW_TYPES = {
+        'boolean': ('bool_',),
+        'tinyint': ('int8',),
+        'smallint': ('int16',),
+        'integer': ('int32',),
+        'bigint': ('int64',),
+        'real': ('float32',),
+        'double': ('float64',),
+        'varchar': ('string',),
+        'char': ('string',),
+        'varbinary': ('binary',),
+        'date': ('date32',),
+        'timestamp': ('timestamp', 'ms'),
+    }
+
     def _reset_state(self):
         """Reset state about the previous query in preparation for running another query"""
         super(Cursor, self)._reset_state()
         self._nextUri = None
         self._columns = None
 
+    @contextlib.contextmanager
+    def _worker_cursor(self):
+        """Return a copy of this cursor, since each query is independent"""
+        cursor = copy.copy(self)
+        cursor._session_props = dict(self._session_props)
+        cursor._prefetcher = None
+        cursor._reset_state()
+        yield cursor
+
     @property
     def description(self):
         """This read-only attribute is a sequence of 7-item sequences.
@@ -241,6 +292,14 @@ class Cursor(common.DBAPICursor):
             for col in self._columns
         ]
 
+    def _arrow_types(self, pyarrow):
+        types = super(Cursor, self)._arrow_types(pyarrow)
+        for i, col in enumerate(self.description):
+            match = _DECIMAL_PATTERN.match(col[1])
+            if match:
+                types[i] = pyarrow.decimal128(int(match.group(1)), int(match.group(2)))
+        return types
+
     def execute(self, operation, parameters=None):
         """Prepare and execute a database operation (query or command).
 
@@ -280,6 +339,7 @@ class Cursor(common.DBAPICursor):
     def cancel(self):
         if self._state == self._STATE_NONE:
             raise ProgrammingError("No query yet")
+        self._stop_prefetch()
         if self._nextUri is None:
             assert self._state == self._STATE_FINISHED, "Should be finished if nextUri is None"
             return
@@ -303,6 +363,7 @@ class Cursor(common.DBAPICursor):
         """
         if self._state == self._STATE_NONE:
             raise ProgrammingError("No query yet")
+        self._stop_prefetch()
         if self._nextUri is None:
             assert self._state == self._STATE_FINISHED, "Should be finished if nextUri is None"
             return None
@@ -314,6 +375,16 @@ class Cursor(common.DBAPICursor):
         """Fetch the next URI and update state"""
         self._process_response(self._requests_session.get(self._nextUri, **self._requests_kwargs))
 
+    def _rows(self, data):
+        """Return the rows for the ``data`` of a response"""
+        if not self._lazy_conversion:
+            self._process_data(data)
+            return map(tuple, data)
+        converters = [
+            TYPES_CONVERTER.get(col[1].split("(")[0].lower()) for col in self.description
+        ]
+        return [common.LazyRow(row, converters) for row in data]
+
     def _process_data(self, rows):
         for i, col in enumerate(self.description):
             col_type = col[1].split("(")[0].lower()
@@ -346,9 +417,7 @@ class Cursor(common.DBAPICursor):
             self._session_props[propname] = propval
         if 'data' in response_json:
             assert self._columns
-            new_data = response_json['data']
-            self._process_data(new_data)
-            self._data += map(tuple, new_data)
+            self._data += self._rows(response_json['data'])
         if 'nextUri' not in response_json:
             self._state = self._STATE_FINISHED
         if 'error' in response_json:
@@ -30,6 +30,7 @@ except ImportError:
     from sqlalchemy.dialects import mysql
     mysql_tinyinteger = mysql.base.MSTinyInteger
 from sqlalchemy.engine import default
+from sqlalchemy.engine import reflection
 from sqlalchemy.sql import compiler
 from sqlalchemy.sql.compiler import SQLCompiler
 
@@ -151,6 +152,9 @@ _type_map = {
     'decimal': HiveDecimal,
 }
 
+# TABLE_TYPE values of views, which depend on hive.server2.table.type.mapping
+_VIEW_TYPES = {'VIEW', 'VIRTUAL_VIEW', 'MATERIALIZED_VIEW'}
+
 
 class HiveCompiler(SQLCompiler):
     def visit_concat_op_binary(self, binary, operator, **kw):
@@ -279,21 +283,103 @@ class HiveDialect(default.DefaultDialect):
         kwargs.update(url.query)
         return [], kwargs
 
+    def _get_default_schema_name(self, connection):
+        return connection.execute(text('SELECT current_database()')).scalar()
+
+    def _get_metadata(self, connection, method, **kwargs):
+        """Call a metadata method of :py:class:`pyhive.hive.Cursor` and return its rows as dicts
+        keyed by column name
+        """
+        cursor = connection.connection.cursor()
+        try:
+            getattr(cursor, method)(**kwargs)
+            names = [col[0] for col in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def _get_tables(self, connection, schema, table=None):
+        schema = schema or self.default_schema_name or 'default'
+        rows = self._get_metadata(connection, 'tables', schema=schema, table=table)
+        # The names are LIKE patterns, where _ matches any character
+        return [
+            row for row in rows
+            if row['TABLE_SCHEM'].lower() == schema.lower()
+            and (table is None or row['TABLE_NAME'].lower() == table.lower())
+        ]
+
+    @reflection.cache
+    def _get_schema_tables(self, connection, schema, **kw):
+        """Return all tables and views of a schema, with one ``GetTables`` call per reflection"""
+        return self._get_tables(connection, schema)
+
+    def _get_column_rows(self, connection, table_name, schema, **kw):
+        """Return the ``GetColumns`` rows of a table in column order, or None if it doesn't exist.
+
+        While reflecting with an ``Inspector``, e.g. from ``MetaData.reflect``, the columns of all
+        tables in the schema are fetched with a single call and cached for the other tables.
+        """
+        schema = schema or self.default_schema_name or 'default'
+        if kw.get('info_cache') is None:
+            columns = self._group_columns(
+                self._get_metadata(connection, 'columns', schema=schema, table=table_name),
+                schema)
+        else:
+            columns = self._get_schema_columns(connection, schema, **kw)
+        return columns.get(table_name.lower())
+
+    @reflection.cache
+    def _get_schema_columns(self, connection, schema, **kw):
+        return self._group_columns(self._get_metadata(connection, 'columns', schema=schema), schema)
+
+    @staticmethod
+    def _group_columns(rows, schema):
+        """Return a dict of lists of column rows in column order, keyed by lowercase table name"""
+        columns = {}
+        for row in rows:
+            # The names are LIKE patterns, where _ matches any character
+            if row['TABLE_SCHEM'].lower() == schema.lower():
+                columns.setdefault(row['TABLE_NAME'].lower(), []).append(row)
+        for rows in columns.values():
+            rows.sort(key=lambda row: row['ORDINAL_POSITION'])
+        return columns
+
+    @reflection.cache
+    def _get_schema_partition_columns(self, connection, schema, **kw):
+        """Return a dict of partition column names keyed by lowercase table name, for all tables
+        of a schema with one ``SHOW TABLE EXTENDED`` statement. ``GetColumns`` lists partition
+        columns like the others, without telling them apart.
+        """
+        partition_columns = {}
+        try:
+            rows = connection.execute(text(
+                "SHOW TABLE EXTENDED IN {} LIKE '*'".format(schema))).fetchall()
+        except exc.DBAPIError:
+            # e.g. a table whose files can't be listed. Tables fall back to DESCRIBE.
+            return partition_columns
+        table = None
+        for row in rows:
+            line = (row[0] or '').strip()
+            if line.startswith('tableName:'):
+                table = line[len('tableName:'):].lower()
+                partition_columns[table] = []
+            elif line.startswith('partitionColumns:') and table is not None:
+                partition_columns[table] = _parse_struct_field_names(
+                    line[len('partitionColumns:'):])
+        return partition_columns
+
     def get_schema_names(self, connection, **kw):
-        # Equivalent to SHOW DATABASES
-        return [row[0] for row in connection.execute(text('SHOW SCHEMAS'))]
+        return [row['TABLE_SCHEM'] for row in self._get_metadata(connection, 'schemas')]
 
     def get_view_names(self, connection, schema=None, **kw):
-        # Hive does not provide functionality to query tableType
-        # This allows reflection to not crash at the cost of being inaccurate
-        return self.get_table_names(connection, schema, **kw)
+        return [row['TABLE_NAME'] for row in self._get_schema_tables(connection, schema, **kw)
+                if row['TABLE_TYPE'] in _VIEW_TYPES]
 
     def _get_table_columns(self, connection, table_name, schema):
         full_table = table_name
         if schema:
             full_table = schema + '.' + table_name
-        # TODO using TGetColumnsReq hangs after sending TFetchResultsReq.
-        # Using DESCRIBE works but is uglier.
+        # Partition columns are only available from DESCRIBE
         try:
             # This needs the table name to be unescaped (no backticks).
             rows = connection.execute(text('DESCRIBE {}'.format(full_table))).fetchall()
@@ -313,26 +399,20 @@ class HiveDialect(default.DefaultDialect):
             return rows
 
     def has_table(self, connection, table_name, schema=None, **kw):
-        try:
-            self._get_table_columns(connection, table_name, schema)
-            return True
-        except exc.NoSuchTableError:
-            return False
+        return bool(self._get_tables(connection, schema, table_name))
 
     def get_columns(self, connection, table_name, schema=None, **kw):
-        rows = self._get_table_columns(connection, table_name, schema)
-        # Strip whitespace
-        rows = [[col.strip() if col else None for col in row] for row in rows]
-        # Filter out empty rows and comment
-        rows = [row for row in rows if row[0] and row[0] != '# col_name']
+        rows = self._get_column_rows(connection, table_name, schema, **kw)
+        if not rows:
+            raise exc.NoSuchTableError(
+                (schema or self.default_schema_name or 'default') + '.' + table_name)
         result = []
-        for (col_name, col_type, _comment) in rows:
-            if col_name == '# Partition Information':
-                break
+        for row in rows:
+            col_name = row['COLUMN_NAME']
             # Take out the more detailed type information
-            # e.g. 'map<int,int>' -> 'map'
-            #      'decimal(10,1)' -> decimal
-            col_type = re.search(r'^\w+', col_type).group(0)
+            # e.g. 'MAP<INT,INT>' -> 'map'
+            #      'DECIMAL(10,1)' -> decimal
+            col_type = re.search(r'^\w+', row['TYPE_NAME'].lower()).group(0)
             try:
                 coltype = _type_map[col_type]
             except KeyError:
@@ -356,6 +436,14 @@ class HiveDialect(default.DefaultDialect):
         return []
 
     def get_indexes(self, connection, table_name, schema=None, **kw):
+        if kw.get('info_cache') is not None:
+            partition_columns = self._get_schema_partition_columns(
+                connection, schema or self.default_schema_name or 'default', **kw)
+            col_names = partition_columns.get(table_name.lower())
+            if col_names is not None:
+                if col_names:
+                    return [{'name': 'partition', 'column_names': col_names, 'unique': False}]
+                return []
         rows = self._get_table_columns(connection, table_name, schema)
         # Strip whitespace
         rows = [[col.strip() if col else None for col in row] for row in rows]
@@ -374,10 +462,8 @@ class HiveDialect(default.DefaultDialect):
             return []
 
     def get_table_names(self, connection, schema=None, **kw):
-        query = 'SHOW TABLES'
-        if schema:
-            query += ' IN ' + self.identifier_preparer.quote_identifier(schema)
-        return [row[0] for row in connection.execute(text(query))]
+        return [row['TABLE_NAME'] for row in self._get_schema_tables(connection, schema, **kw)
+                if row['TABLE_TYPE'] not in _VIEW_TYPES]
 
     def do_rollback(self, dbapi_connection):
         # No transactions for Hive
@@ -392,6 +478,30 @@ class HiveDialect(default.DefaultDialect):
         return True
 
 
+def _parse_struct_field_names(ddl):
+    """Return the field names of a struct type as Hive shows it, e.g. ``ds`` and ``hr`` for
+    ``struct partition_columns { string ds, decimal(2,0) hr}``
+    """
+    match = re.search(r'\{(.*)\}', ddl)
+    if not match:
+        return []
+    names = []
+    depth = 0
+    field = ''
+    for char in match.group(1) + ',':
+        if char in '(<':
+            depth += 1
+        elif char in ')>':
+            depth -= 1
+        if char == ',' and depth == 0:
+            if field.strip():
+                names.append(field.split()[-1])
+            field = ''
+        else:
+            field += char
+    return names
+
+
 class HiveHTTPDialect(HiveDialect):
 
     name = "hive"
@@ -45,6 +45,30 @@ class DBAPITestCase(with_metaclass(abc.ABCMeta, object)):
         cursor.execute('SELECT a FROM many_rows ORDER BY a')
         self.assertEqual(cursor.fetchall(), [(i,) for i in range(10000)])
 
+    @with_cursor
+    def test_fetch_numpy(self, cursor):
+        cursor.execute('SELECT a FROM many_rows ORDER BY a')
+        first, = cursor.fetchmany_numpy(10).values()
+        self.assertEqual(first.tolist(), list(range(10)))
+        self.assertEqual(cursor.fetchone(), (10,))
+        rest, = cursor.fetch_numpy().values()
+        self.assertEqual(rest.tolist(), list(range(11, 10000)))
+        empty, = cursor.fetchmany_numpy().values()
+        self.assertEqual(len(empty), 0)
+
+    @with_cursor
+    def test_fetch_arrow(self, cursor):
+        cursor.execute('SELECT a FROM many_rows ORDER BY a')
+        self.assertEqual(cursor.fetchone(), (0,))
+        batches = list(cursor.iter_arrow_batches())
+        self.assertTrue(batches)
+        values = [value for batch in batches for value in batch.column(0).to_pylist()]
+        self.assertEqual(values, list(range(1, 10000)))
+        cursor.execute('SELECT a FROM many_rows ORDER BY a')
+        table = cursor.fetch_arrow_table()
+        self.assertEqual(table.column(0).to_pylist(), list(range(10000)))
+        self.assertEqual(cursor.fetch_arrow_table().num_rows, 0)
+
     @with_cursor
     def test_null_param(self, cursor):
         cursor.execute('SELECT %s FROM one_row', (None,))
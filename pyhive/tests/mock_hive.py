@@ -0,0 +1,68 @@
+"""Fake Hive connections for tests that don't need a server."""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+
+from TCLIService import ttypes
+from pyhive import hive
+
+
+def mock_connection(schema, *batches):
+    """Return a :py:class:`hive.Connection` around a mock Thrift client.
+
+    Every query on it has a result set with the given ``(name, TTypeId)`` or ``(name, TTypeId,
+    qualifiers)`` columns and returns ``batches`` of column values, with None for nulls.
+    """
+    status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+    client = mock.Mock()
+    client.ExecuteStatement.return_value = ttypes.TExecuteStatementResp(
+        status=status, operationHandle=ttypes.TOperationHandle(hasResultSet=True))
+    client.CloseOperation.return_value = ttypes.TCloseOperationResp(status=status)
+    client.GetResultSetMetadata.return_value = ttypes.TGetResultSetMetadataResp(
+        status=status,
+        schema=ttypes.TTableSchema(columns=[
+            ttypes.TColumnDesc(
+                columnName=col[0],
+                typeDesc=ttypes.TTypeDesc(types=[ttypes.TTypeEntry(
+                    primitiveEntry=ttypes.TPrimitiveTypeEntry(
+                        type=col[1],
+                        typeQualifiers=ttypes.TTypeQualifiers({
+                            key: ttypes.TTypeQualifierValue(i32Value=value)
+                            for key, value in col[2].items()
+                        }) if len(col) > 2 else None,
+                    ))]),
+                position=i,
+            )
+            for i, col in enumerate(schema)
+        ]))
+    column_types = {
+        ttypes.TTypeId.BOOLEAN_TYPE: ('boolVal', ttypes.TBoolColumn),
+        ttypes.TTypeId.INT_TYPE: ('i32Val', ttypes.TI32Column),
+        ttypes.TTypeId.BIGINT_TYPE: ('i64Val', ttypes.TI64Column),
+        ttypes.TTypeId.DOUBLE_TYPE: ('doubleVal', ttypes.TDoubleColumn),
+    }
+
+    def make_column(type_id, values):
+        attr, cls = column_types.get(type_id, ('stringVal', ttypes.TStringColumn))
+        nulls = bytearray((len(values) + 7) // 8)
+        for i, value in enumerate(values):
+            if value is None:
+                nulls[i // 8] |= 1 << (i % 8)
+        values = [(0 if cls is not ttypes.TStringColumn else '') if value is None else value
+                  for value in values]
+        return ttypes.TColumn(**{attr: cls(values=values, nulls=bytes(nulls))})
+
+    client.FetchResults.side_effect = [
+        ttypes.TFetchResultsResp(
+            status=status,
+            results=ttypes.TRowSet(startRowOffset=0, rows=[], columns=[
+                make_column(col[1], values) for col, values in zip(schema, batch)
+            ]))
+        for batch in batches + ([[] for _ in schema],)
+    ]
+    connection = hive.Connection.__new__(hive.Connection)
+    connection._client = client
+    connection._sessionHandle = ttypes.TSessionHandle()
+    return connection
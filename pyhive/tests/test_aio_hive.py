@@ -0,0 +1,115 @@
+"""Tests for the asyncio Hive interface, against a mock Thrift client."""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import asyncio
+import threading
+import unittest
+
+import mock
+
+from TCLIService import ttypes
+from pyhive.aio import hive
+from pyhive.exc import OperationalError
+from pyhive.tests.mock_hive import mock_connection
+
+
+def _status_response(state, progress=None):
+    return ttypes.TGetOperationStatusResp(
+        status=ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS),
+        operationState=state,
+        progressUpdateResponse=None if progress is None else ttypes.TProgressUpdateResp(
+            headerNames=[], rows=[], progressedPercentage=progress),
+    )
+
+
+class TestAioHive(unittest.TestCase):
+    def connect(self, *states):
+        connection = mock_connection(
+            [('a', ttypes.TTypeId.INT_TYPE)], [[1, 2, 3]], [[4, 5]])
+        connection.client.GetOperationStatus.side_effect = [
+            _status_response(state) for state in states]
+        return connection
+
+    def test_execute_and_fetch(self):
+        connection = self.connect(ttypes.TOperationState.RUNNING_STATE,
+                                  ttypes.TOperationState.FINISHED_STATE)
+
+        async def run():
+            async with hive.Connection(connection).cursor(poll_interval=0) as cursor:
+                await cursor.execute('SELECT a FROM t')
+                self.assertEqual(cursor.description,
+                                 [('a', 'INT_TYPE', None, None, None, None, True)])
+                self.assertEqual(await cursor.fetchone(), (1,))
+                self.assertEqual(await cursor.fetchmany(3), [(2,), (3,), (4,)])
+                self.assertEqual([row async for row in cursor], [(5,)])
+                self.assertIsNone(await cursor.fetchone())
+                self.assertEqual(cursor.rownumber, 5)
+
+        asyncio.run(run())
+        req = connection.client.ExecuteStatement.call_args[0][0]
+        self.assertTrue(req.runAsync)
+        self.assertEqual(connection.client.GetOperationStatus.call_count, 2)
+
+    def test_batches(self):
+        # Created outside the event loop, which asyncio.run creates
+        connection = hive.Connection(self.connect(ttypes.TOperationState.FINISHED_STATE))
+
+        async def run():
+            cursor = connection.cursor()
+            await cursor.execute('SELECT a FROM t')
+            return [batch async for batch in cursor.batches()]
+
+        self.assertEqual(asyncio.run(run()), [[(1,), (2,), (3,)], [(4,), (5,)]])
+
+    def test_rewind(self):
+        connection = self.connect(ttypes.TOperationState.FINISHED_STATE)
+        batch, _batch, end = connection.client.FetchResults.side_effect
+        connection.client.FetchResults.side_effect = [batch, end, batch]
+        threads = []
+
+        async def run():
+            cursor = hive.Connection(connection).cursor()
+            await cursor.execute('SELECT a FROM t')
+            rows = await cursor.fetchall()
+            # Stopping a prefetch waits for its round trip
+            stop_prefetch = cursor._cursor._stop_prefetch
+            with mock.patch.object(cursor._cursor, '_stop_prefetch', lambda: (
+                    threads.append(threading.current_thread()), stop_prefetch())):
+                await cursor.rewind()
+            return rows + [await cursor.fetchone()]
+
+        self.assertEqual(asyncio.run(run()), [(1,), (2,), (3,), (1,)])
+        # ... so it happens in the executor, not on the event loop
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_failed_query(self):
+        connection = self.connect(ttypes.TOperationState.ERROR_STATE)
+
+        async def run():
+            await hive.Connection(connection).cursor().execute('SELECT a FROM t')
+
+        self.assertRaises(OperationalError, asyncio.run, run())
+
+    def test_progress(self):
+        connection = self.connect()
+        connection.client.GetOperationStatus.side_effect = [
+            _status_response(ttypes.TOperationState.RUNNING_STATE, 0.5),
+            _status_response(ttypes.TOperationState.FINISHED_STATE, 1.0),
+            _status_response(ttypes.TOperationState.FINISHED_STATE),
+        ]
+
+        async def run():
+            cursor = hive.Connection(connection).cursor(poll_interval=0)
+            await cursor.execute('SELECT a FROM t', wait=False)
+            progress = [(event.state, event.progress)
+                        async for event in cursor.progress(logs=False)]
+            await cursor.wait()
+            return progress, await cursor.fetchall()
+
+        self.assertEqual(asyncio.run(run()), (
+            [('RUNNING_STATE', 0.5), ('FINISHED_STATE', 1.0)],
+            [(1,), (2,), (3,), (4,), (5,)],
+        ))
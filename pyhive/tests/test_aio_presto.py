@@ -0,0 +1,147 @@
+"""Tests for the asyncio Presto and Trino interfaces, against a fake server."""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import asyncio
+import unittest
+from decimal import Decimal
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pyhive.aio import presto
+from pyhive.aio import trino
+from pyhive.exc import DatabaseError
+from pyhive.exc import NotSupportedError
+
+_COLUMNS = [{'name': 'a', 'type': 'integer'}, {'name': 'b', 'type': 'decimal(10,1)'}]
+
+
+def _fake_server(pages, requests):
+    """Return a server that answers each query with the given pages of rows, or dicts to put in
+    the response instead, and appends the requests it gets to ``requests``
+    """
+    def page(request, i):
+        response = {'id': 'query', 'stats': {'state': 'RUNNING'}}
+        if i > 0 and isinstance(pages[i - 1], dict):
+            response.update(pages[i - 1])
+        elif i > 0:
+            response['columns'] = _COLUMNS
+            response['data'] = pages[i - 1]
+        if i < len(pages):
+            response['nextUri'] = str(request.url.with_path('/v1/statement/query/{}'.format(i + 1)))
+        return web.json_response(response)
+
+    async def post(request):
+        requests.append((request.method, dict(request.headers), await request.text()))
+        return page(request, 0)
+
+    async def get(request):
+        requests.append((request.method, dict(request.headers), None))
+        return page(request, int(request.match_info['page']))
+
+    async def delete(request):
+        requests.append((request.method, dict(request.headers), None))
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post('/v1/statement', post)
+    app.router.add_get('/v1/statement/query/{page}', get)
+    app.router.add_delete('/v1/statement/query/{page}', delete)
+    return TestServer(app)
+
+
+class TestAioPresto(unittest.TestCase):
+    module = presto
+    header_prefix = 'X-Presto-'
+
+    def run_with_server(self, pages, fn):
+        requests = []
+
+        async def run():
+            async with _fake_server(pages, requests) as server:
+                async with self.module.connect(
+                        server.host, port=server.port, source='test', poll_interval=0,
+                        session_props={'query_max_run_time': '1m'}) as connection:
+                    return await fn(connection)
+
+        return asyncio.run(run()), requests
+
+    def test_fetch(self):
+        async def fn(connection):
+            cursor = connection.cursor()
+            await cursor.execute('SELECT a, b FROM t WHERE a > %s', (0,))
+            self.assertIsNone(cursor.description)
+            first = await cursor.fetchone()
+            self.assertEqual([col[:2] for col in cursor.description],
+                             [('a', 'integer'), ('b', 'decimal(10,1)')])
+            rest = await cursor.fetchmany(2)
+            return first, rest, [row async for row in cursor], cursor.last_query_id
+
+        result, requests = self.run_with_server([[[1, '0.5'], [2, None]], [[3, '1.5']]], fn)
+        self.assertEqual(result, (
+            (1, Decimal('0.5')), [(2, None), (3, Decimal('1.5'))], [], 'query'))
+        method, headers, body = requests[0]
+        self.assertEqual((method, body), ('POST', 'SELECT a, b FROM t WHERE a > 0'))
+        self.assertEqual(headers[self.header_prefix + 'Source'], 'test')
+        self.assertEqual(headers[self.header_prefix + 'Session'], 'query_max_run_time=1m')
+        self.assertEqual([method for method, _, _ in requests], ['POST', 'GET', 'GET'])
+
+    def test_concurrent_queries(self):
+        async def fn(connection):
+            async def query(i):
+                cursor = connection.cursor()
+                await cursor.execute('SELECT {}'.format(i))
+                return await cursor.fetchall()
+            return await asyncio.gather(*[query(i) for i in range(20)])
+
+        result, requests = self.run_with_server([[[1, None]], [[2, None]]], fn)
+        self.assertEqual(result, [[(1, None), (2, None)]] * 20)
+        self.assertEqual(len(requests), 60)
+
+    def test_cancel(self):
+        async def fn(connection):
+            cursor = connection.cursor()
+            await cursor.execute('SELECT 1')
+            self.assertEqual((await cursor.poll())['data'], [[1, None]])
+            await cursor.cancel()
+            self.assertIsNone(await cursor.poll())
+            return await cursor.fetchall()
+
+        result, requests = self.run_with_server([[[1, None]], [[2, None]]], fn)
+        self.assertEqual(result, [(1, None)])
+        self.assertEqual([method for method, _, _ in requests], ['POST', 'GET', 'DELETE'])
+
+    def test_close_cancels(self):
+        async def fn(connection):
+            async with connection.cursor() as cursor:
+                await cursor.execute('SELECT 1')
+                self.assertEqual(await cursor.fetchone(), (1, None))
+            # Finished queries have nothing to cancel
+            async with connection.cursor() as cursor:
+                await cursor.execute('SELECT 1')
+                await cursor.fetchall()
+
+        _result, requests = self.run_with_server([[[1, None]], [[2, None]]], fn)
+        self.assertEqual([method for method, _, _ in requests],
+                         ['POST', 'GET', 'DELETE', 'POST', 'GET', 'GET'])
+
+    def test_kerberos(self):
+        self.assertRaisesRegexp(
+            NotSupportedError, 'KerberosRemoteServiceName', self.module.connect,
+            'localhost', KerberosRemoteServiceName='presto')
+
+    def test_query_error(self):
+        async def fn(connection):
+            cursor = connection.cursor()
+            await cursor.execute('SELECT x')
+            with self.assertRaisesRegexp(DatabaseError, 'Column x cannot be resolved'):
+                await cursor.fetchall()
+
+        self.run_with_server([{'error': {'message': 'Column x cannot be resolved'}}], fn)
+
+
+class TestAioTrino(TestAioPresto):
+    module = trino
+    header_prefix = 'X-Trino-'
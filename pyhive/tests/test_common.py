@@ -3,10 +3,37 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from pyhive import common
 import datetime
+import mock
 import unittest
 
 
 class TestCommon(unittest.TestCase):
+    def test_lazy_row(self):
+        convert = mock.Mock(side_effect=lambda value: value * 2)
+        row = common.LazyRow(('a', 'b', None), [convert, None, convert])
+        self.assertEqual(len(row), 3)
+        self.assertEqual(row[0], 'aa')
+        self.assertEqual(row[-3], 'aa')
+        convert.assert_called_once_with('a')
+        self.assertEqual(row, ('aa', 'b', None))
+        self.assertEqual(row[1:], ('b', None))
+        a, b, c = row
+        self.assertEqual((a, b, c), ('aa', 'b', None))
+        self.assertNotEqual(row, ('a', 'b', None))
+        self.assertEqual(repr(row), repr(('aa', 'b', None)))
+        self.assertEqual(hash(row), hash(('aa', 'b', None)))
+        self.assertEqual(convert.call_count, 1)
+        for index in [3, -4]:
+            self.assertRaises(IndexError, lambda: row[index])
+
+    def test_to_arrow(self):
+        import pyarrow
+        dates = common._to_arrow(pyarrow, ['2020-01-02', None], pyarrow.date32())
+        self.assertEqual(dates.to_pylist(), [datetime.date(2020, 1, 2), None])
+        binary = common._to_arrow(pyarrow, [b'\xff', None], pyarrow.binary())
+        self.assertEqual(binary.to_pylist(), [b'\xff', None])
+        self.assertEqual(common._to_arrow(pyarrow, [1, 2], None).type, pyarrow.int64())
+
     def test_escape_args(self):
         escaper = common.ParamEscaper()
         self.assertEqual(escaper.escape_args({'foo': 'bar'}),
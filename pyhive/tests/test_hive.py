@@ -9,23 +9,36 @@ from __future__ import unicode_literals
 
 import contextlib
 import datetime
+import gc
 import os
 import socket
 import subprocess
+import threading
 import time
 import unittest
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
 
 import mock
+import requests
 import thrift.transport.TSocket
+from thrift.transport import THttpClient
 import thrift.transport.TTransport
-import thrift_sasl
+from thrift.Thrift import TMessageType
+from thrift.protocol.TBinaryProtocol import TBinaryProtocol
+from thrift.protocol.TCompactProtocol import TCompactProtocol
+from thrift.transport.TTransport import TMemoryBuffer
 from thrift.transport.TTransport import TTransportException
 
+from TCLIService import TCLIService
 from TCLIService import ttypes
 from pyhive import hive
+from pyhive import http_transport
+from pyhive import sasl_transport
 from pyhive.tests.dbapi_test_case import DBAPITestCase
 from pyhive.tests.dbapi_test_case import with_cursor
+from pyhive.tests.mock_hive import mock_connection
 
 _HOST = 'localhost'
 
@@ -85,6 +98,33 @@ class TestHive(unittest.TestCase, DBAPITestCase):
         # catch unicode/str
         self.assertEqual(list(map(type, rows[0])), list(map(type, expected[0])))
 
+    def test_prefetch_many_rows(self):
+        with contextlib.closing(self.connect()) as connection:
+            with contextlib.closing(connection.cursor(arraysize=1000, prefetch=2)) as cursor:
+                cursor.execute('SELECT a FROM many_rows ORDER BY a')
+                self.assertEqual(cursor.fetchmany(5), [(i,) for i in range(5)])
+                self.assertEqual(cursor.fetchall(), [(i,) for i in range(5, 10000)])
+                self.assertEqual(cursor.rownumber, 10000)
+
+    def test_fetch_bytes_many_rows(self):
+        with contextlib.closing(self.connect()) as connection:
+            with contextlib.closing(connection.cursor(fetch_bytes=4096)) as cursor:
+                cursor.execute('SELECT a FROM many_rows ORDER BY a')
+                self.assertEqual(cursor.fetchmany(7), [(i,) for i in range(7)])
+                self.assertEqual(cursor.fetchall(), [(i,) for i in range(7, 10000)])
+
+    def test_lazy_conversion_complex(self):
+        with contextlib.closing(self.connect()) as connection:
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.execute('SELECT * FROM one_row_complex')
+                expected = cursor.fetchall()
+            with contextlib.closing(connection.cursor(lazy_conversion=True)) as cursor:
+                cursor.execute('SELECT * FROM one_row_complex')
+                rows = cursor.fetchall()
+        self.assertEqual(rows, expected)
+        self.assertEqual([tuple(row) for row in rows], expected)
+        self.assertEqual(list(map(type, rows[0])), list(map(type, expected[0])))
+
     @with_cursor
     def test_async(self, cursor):
         cursor.execute('SELECT * FROM one_row', async_=True)
@@ -190,6 +230,792 @@ class TestHive(unittest.TestCase, DBAPITestCase):
         self.assertRaisesRegexp(ValueError, 'kerberos_service_name.*KERBEROS',
                                 lambda: hive.connect(_HOST, auth='KERBEROS'))
 
+    def test_unwrap_column_nulls(self):
+        def unwrap(nulls):
+            col = ttypes.TColumn(i64Val=ttypes.TI64Column(values=list(range(20)), nulls=nulls))
+            return hive._unwrap_column(col, hive._column_decoder('BIGINT_TYPE'))
+
+        self.assertEqual(unwrap(b''), list(range(20)))
+        self.assertEqual(unwrap(b'\x00\x00\x00'), list(range(20)))
+        # sparse bitmap: values 9 and 19 are null
+        self.assertEqual(
+            unwrap(b'\x00\x02\x08' + b'\x00' * 16),
+            [None if i in (9, 19) else i for i in range(20)])
+        # dense bitmap: everything but value 2 is null
+        self.assertEqual(unwrap(b'\xfb\xff\x0f'), [None, None, 2] + [None] * 17)
+
+    def test_unwrap_column_converter(self):
+        col = ttypes.TColumn(stringVal=ttypes.TStringColumn(values=['0.1', '', '2'], nulls=b'\x02'))
+        self.assertEqual(
+            hive._unwrap_column(col, hive._column_decoder('DECIMAL_TYPE')),
+            [Decimal('0.1'), None, Decimal(2)])
+
+    def test_lazy_conversion(self):
+        connection = mock_connection(
+            [('a', ttypes.TTypeId.INT_TYPE), ('b', ttypes.TTypeId.DECIMAL_TYPE),
+             ('c', ttypes.TTypeId.TIMESTAMP_TYPE)],
+            [[1, 2], ['0.5', None], ['2020-01-01 00:00:00', '']])
+        cursor = connection.cursor(lazy_conversion=True)
+        cursor.execute('SELECT a, b, c FROM t')
+        parse = mock.Mock(side_effect=hive._parse_timestamp)
+        with mock.patch.dict(hive.TYPES_CONVERTER, {'TIMESTAMP_TYPE': parse}):
+            row = cursor.fetchone()
+        self.assertEqual(row[:2], (1, Decimal('0.5')))
+        parse.assert_not_called()
+        self.assertEqual(row[2], datetime.datetime(2020, 1, 1))
+        self.assertEqual(row, (1, Decimal('0.5'), datetime.datetime(2020, 1, 1)))
+        parse.assert_called_once_with('2020-01-01 00:00:00')
+        self.assertEqual(cursor.fetchall(), [(2, None, '')])
+
+    def test_execute_configuration(self):
+        connection = mock_connection([('a', ttypes.TTypeId.INT_TYPE)], [[1]])
+        cursor = connection.cursor(configuration={'hive.exec.parallel': 'true', 'x': 'a'})
+        cursor.execute('SELECT a FROM t', configuration={'x': 'b'}, timeout=60)
+        req = connection.client.ExecuteStatement.call_args[0][0]
+        self.assertEqual(req.confOverlay, {'hive.exec.parallel': 'true', 'x': 'b'})
+        self.assertEqual(req.queryTimeout, 60)
+        connection.cursor().execute('SELECT a FROM t')
+        req = connection.client.ExecuteStatement.call_args[0][0]
+        self.assertEqual((req.confOverlay, req.queryTimeout), (None, 0))
+
+    def test_executemany_batches(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+        error = ttypes.TStatus(statusCode=ttypes.TStatusCode.ERROR_STATUS, errorMessage='boom')
+        connection = mock_connection([])
+        connection.client.ExecuteStatement.side_effect = lambda req: (
+            ttypes.TExecuteStatementResp(
+                status=error if "'bad'" in req.statement else status,
+                operationHandle=ttypes.TOperationHandle(hasResultSet=False)))
+        cursor = connection.cursor()
+        rows = [(1, 'a'), (2, "b'"), (3, None)]
+        cursor.executemany('INSERT INTO t VALUES (%s, %s);', rows, max_statement_size=50)
+        self.assertEqual(
+            [call[0][0].statement for call in connection.client.ExecuteStatement.call_args_list],
+            ["INSERT INTO t VALUES (1, 'a'), (2, 'b\\'')", 'INSERT INTO t VALUES (3, NULL)'])
+
+        # errors are reported per statement
+        results = []
+        cursor.executemany('INSERT INTO t VALUES (%(a)s)', [{'a': 'ok'}, {'a': 'bad'}, {'a': 'ok'}],
+                           max_statement_size=1, callback=results.append)
+        self.assertEqual([(r.index, r.chunks, r.rows) for r in results],
+                         [(0, 3, 1), (1, 3, 1), (2, 3, 1)])
+        self.assertEqual([type(r.error) for r in results],
+                         [type(None), hive.OperationalError, type(None)])
+        self.assertRaises(hive.OperationalError, cursor.executemany,
+                          'INSERT INTO t VALUES (%s)', [('bad',), ('ok',)], max_statement_size=1)
+        # without a pool, other threads use cursors on the same connection
+        connection.client.ExecuteStatement.reset_mock()
+        cursor.executemany('INSERT INTO t VALUES (%s)', [(1,), (2,), (3,)], max_statement_size=1,
+                           concurrency=2)
+        self.assertEqual(
+            sorted(call[0][0].statement
+                   for call in connection.client.ExecuteStatement.call_args_list),
+            ['INSERT INTO t VALUES (1)', 'INSERT INTO t VALUES (2)', 'INSERT INTO t VALUES (3)'])
+
+    def test_executemany_concurrency(self):
+        connections = []
+
+        def connect(**kwargs):
+            status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+            connection = mock_connection([])
+            connection.client.ExecuteStatement.return_value = ttypes.TExecuteStatementResp(
+                status=status, operationHandle=ttypes.TOperationHandle(hasResultSet=False))
+            connection.client.GetInfo.return_value = ttypes.TGetInfoResp(status=status)
+            connections.append(connection)
+            return connection
+
+        def run(max_size, concurrency):
+            del connections[:]
+            with mock.patch.object(hive, 'connect', side_effect=connect):
+                pool = hive.ConnectionPool(host='localhost', max_size=max_size)
+                with pool.connection() as connection:
+                    connection.cursor().executemany(
+                        'INSERT INTO t VALUES (%s)', [(i,) for i in range(10)],
+                        max_statement_size=30, concurrency=concurrency)
+                stats = pool.stats()
+                pool.close()
+            statements = [call[0][0].statement for c in connections
+                          for call in c.client.ExecuteStatement.call_args_list]
+            self.assertEqual(sorted(statements), sorted(
+                'INSERT INTO t VALUES ({}), ({})'.format(i, i + 1) for i in range(0, 10, 2)))
+            self.assertEqual(stats['waited'], 0)
+            return stats['size']
+
+        # the caller's connection, plus others from the pool
+        self.assertLessEqual(run(max_size=3, concurrency=2), 2)
+        self.assertLessEqual(run(max_size=3, concurrency=5), 3)
+        # a full pool leaves the caller's connection to run everything, instead of waiting
+        self.assertEqual(run(max_size=1, concurrency=4), 1)
+        self.assertEqual(len(connections), 1)
+
+    def test_synchronized_client(self):
+        entered = threading.Event()
+        arrived = threading.Event()
+
+        class Client(object):
+            def __init__(self, transport=None):
+                self.transport = transport
+
+            def GetInfo(self, timeout):
+                """Wait up to ``timeout`` for a call from another thread, or make that call"""
+                if timeout is None:
+                    arrived.set()
+                    return self
+                entered.set()
+                return arrived.wait(timeout)
+
+        def overlapped(client, timeout):
+            """Return whether a second call ran while a first one waited"""
+            entered.clear()
+            arrived.clear()
+            results = []
+            thread = threading.Thread(target=lambda: results.append(client.GetInfo(timeout)))
+            thread.start()
+            entered.wait()
+            client.GetInfo(None)
+            thread.join()
+            return results[0]
+
+        # binary mode: the second call waits for the first
+        self.assertFalse(overlapped(hive._SynchronizedClient(Client()), 0.05))
+
+        # HTTP mode: calls in parallel, opening another transport while the first is busy
+        transports = []
+
+        def new_transport():
+            transports.append(mock.Mock())
+            return transports[-1]
+
+        client = hive._SynchronizedClient(Client(), new_transport)
+        with mock.patch.object(TCLIService, 'Client', Client):
+            self.assertIsNone(client.GetInfo(None).transport)
+            self.assertTrue(overlapped(client, 10))
+            self.assertEqual(len(transports), 1)
+            # Later threads reuse the transports, however many come and go
+            for _ in range(5):
+                self.assertTrue(overlapped(client, 10))
+            self.assertEqual(len(transports), 1)
+        client.close()
+        transports[0].open.assert_called_once_with()
+        transports[0].close.assert_called_once_with()
+
+    def test_rewind(self):
+        connection = mock_connection([('a', ttypes.TTypeId.INT_TYPE)], [[1, 2, 3]])
+        batch, end = connection.client.FetchResults.side_effect
+        connection.client.FetchResults.side_effect = [batch, end, batch, batch, end]
+        cursor = connection.cursor()
+        cursor.execute('SELECT a FROM t')
+        self.assertEqual(cursor.fetchall(), [(1,), (2,), (3,)])
+        cursor.rewind()
+        self.assertEqual(cursor.rownumber, 0)
+        self.assertEqual(cursor.fetchone(), (1,))
+        cursor.scroll(1)
+        self.assertEqual(cursor.fetchone(), (3,))
+        cursor.scroll(1, mode='absolute')
+        self.assertEqual(cursor.fetchall(), [(2,), (3,)])
+        self.assertRaises(IndexError, cursor.scroll, 1)
+        self.assertRaises(IndexError, cursor.scroll, -5)
+        orientations = [call[0][0].orientation
+                        for call in connection.client.FetchResults.call_args_list]
+        first, next_ = ttypes.TFetchOrientation.FETCH_FIRST, ttypes.TFetchOrientation.FETCH_NEXT
+        self.assertEqual(orientations, [next_, next_, first, first, next_])
+        # the query ran once
+        self.assertEqual(connection.client.ExecuteStatement.call_count, 1)
+
+    def test_metadata(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+        connection = mock_connection(
+            [('TABLE_SCHEM', ttypes.TTypeId.STRING_TYPE),
+             ('TABLE_NAME', ttypes.TTypeId.STRING_TYPE)],
+            [['default', 'default'], ['a', 'b']])
+        connection.client.GetTables.return_value = ttypes.TGetTablesResp(
+            status=status, operationHandle=ttypes.TOperationHandle(hasResultSet=True))
+        cursor = connection.cursor()
+        self.assertIs(cursor.tables(schema='default', table_types=['TABLE']), cursor)
+        self.assertEqual(cursor.fetchall(), [('default', 'a'), ('default', 'b')])
+        req = connection.client.GetTables.call_args[0][0]
+        self.assertEqual((req.schemaName, req.tableName, req.tableTypes),
+                         ('default', None, ['TABLE']))
+        # a short batch is the last one
+        self.assertEqual(connection.client.FetchResults.call_count, 1)
+
+    def test_watch_progress(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+        connection = mock_connection([('a', ttypes.TTypeId.INT_TYPE)], [[1, 2]])
+        start = (time.time() - 10) * 1000
+        connection.client.GetOperationStatus.side_effect = [
+            ttypes.TGetOperationStatusResp(
+                status=status, operationState=state,
+                progressUpdateResponse=ttypes.TProgressUpdateResp(
+                    headerNames=['VERTICES', 'STATUS'], rows=[['Map 1', status_name]],
+                    progressedPercentage=progress, status=ttypes.TJobExecutionStatus.IN_PROGRESS,
+                    footerSummary='VERTICES: 00/01', startTime=start))
+            for state, status_name, progress in [
+                (ttypes.TOperationState.RUNNING_STATE, 'RUNNING', 0.25),
+                (ttypes.TOperationState.FINISHED_STATE, 'SUCCEEDED', 1.0),
+            ]
+        ]
+        # GetLog returns the whole log each time
+        connection.client.GetLog.side_effect = [
+            ttypes.TGetLogResp(status=status, log='a\nb'),
+            ttypes.TGetLogResp(status=status, log='a\nb\nc'),
+        ]
+        cursor = connection.cursor()
+        cursor.execute('SELECT a FROM t', async_=True)
+        events = list(cursor.watch_progress(interval=0))
+        self.assertEqual([(e.state, e.progress, e.logs, e.finished) for e in events], [
+            ('RUNNING_STATE', 0.25, ['a', 'b'], False),
+            ('FINISHED_STATE', 1.0, ['c'], True),
+        ])
+        self.assertEqual(events[0].vertices, [{'VERTICES': 'Map 1', 'STATUS': 'RUNNING'}])
+        self.assertEqual(events[0].footer, 'VERTICES: 00/01')
+        self.assertAlmostEqual(events[0].elapsed, 10, delta=5)
+        self.assertAlmostEqual(events[0].remaining, events[0].elapsed * 3)
+        self.assertEqual(events[1].remaining, 0)
+        self.assertTrue(
+            connection.client.GetOperationStatus.call_args[0][0].getProgressUpdate)
+        self.assertEqual(cursor.fetchall(), [(1,), (2,)])
+
+    def test_watch_progress_callback(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+        connection = mock_connection([('a', ttypes.TTypeId.INT_TYPE)], [[1]])
+        connection.client.GetOperationStatus.side_effect = [
+            ttypes.TGetOperationStatusResp(status=status, operationState=state)
+            for state in [ttypes.TOperationState.RUNNING_STATE,
+                          ttypes.TOperationState.ERROR_STATE]
+        ]
+        events = []
+        cursor = connection.cursor()
+        cursor.execute('SELECT a FROM t', async_=True)
+        watcher = cursor.watch_progress(events.append, interval=0, logs=False)
+        watcher.wait()
+        self.assertEqual([(e.state, e.progress, e.vertices) for e in events], [
+            ('RUNNING_STATE', None, []), ('ERROR_STATE', None, []),
+        ])
+        self.assertRaises(hive.ProgrammingError, list, watcher)
+        connection.client.GetLog.assert_not_called()
+
+    def test_fetch_logs_fallback(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+        connection = mock_connection([('a', ttypes.TTypeId.INT_TYPE)], [[1]])
+        connection.client.GetLog.side_effect = ttypes.TApplicationException(
+            ttypes.TApplicationException.UNKNOWN_METHOD)
+        cursor = connection.cursor()
+        cursor.execute('SELECT a FROM t', async_=True)
+
+        def logs_response(lines):
+            return ttypes.TFetchResultsResp(
+                status=status,
+                results=ttypes.TRowSet(startRowOffset=0, rows=[], columns=[
+                    ttypes.TColumn(stringVal=ttypes.TStringColumn(values=lines, nulls=b'')),
+                ]))
+        connection.client.FetchResults.side_effect = [
+            logs_response(['a']), logs_response([]), logs_response(['b']), logs_response([]),
+        ]
+        self.assertEqual(cursor.fetch_logs(), ['a'])
+        self.assertEqual(cursor.fetch_logs(), ['b'])
+        # The connection remembers that GetLog isn't supported
+        self.assertEqual(connection.client.GetLog.call_count, 1)
+        self.assertEqual(
+            [call[0][0].fetchType for call in connection.client.FetchResults.call_args_list],
+            [1, 1, 1, 1])
+
+    def test_column_decoders(self):
+        for type_code in ['BOOLEAN_TYPE', 'INT_TYPE', 'DOUBLE_TYPE', 'STRING_TYPE', 'BINARY_TYPE',
+                          'ARRAY_TYPE', 'INTERVAL_YEAR_MONTH_TYPE']:
+            self.assertIsNone(hive._column_decoder(type_code))
+        decode = hive._column_decoder('TIMESTAMP_TYPE')
+        values = decode(['2020-01-02 03:04:05.123456789', '2020-01-02 03:04:05', None, ''])
+        self.assertEqual(values, [datetime.datetime(2020, 1, 2, 3, 4, 5, 123456),
+                                  datetime.datetime(2020, 1, 2, 3, 4, 5), None, ''])
+        # repeated values are converted once
+        self.assertIs(decode(['2020-01-02 03:04:05'])[0], values[1])
+        self.assertEqual(hive._column_decoder('DATE_TYPE')(['2020-01-02', None]),
+                         [datetime.date(2020, 1, 2), None])
+        self.assertEqual(
+            hive._column_decoder('INTERVAL_DAY_TIME_TYPE')(
+                ['1 02:03:04.500000000', '-0 00:00:01.000000000', '3 00:00:00']),
+            [datetime.timedelta(days=1, hours=2, minutes=3, seconds=4.5),
+             datetime.timedelta(seconds=-1), datetime.timedelta(days=3)])
+
+    def test_fetch_results_columnar(self):
+        columns = [
+            ttypes.TColumn(boolVal=ttypes.TBoolColumn(values=[True, False, True], nulls=b'')),
+            ttypes.TColumn(byteVal=ttypes.TByteColumn(values=[-128, 0, 127], nulls=b'')),
+            ttypes.TColumn(i16Val=ttypes.TI16Column(values=[-1, 0, 32767], nulls=b'')),
+            ttypes.TColumn(i32Val=ttypes.TI32Column(values=[-1, 0, 2 ** 31 - 1], nulls=b'')),
+            ttypes.TColumn(i64Val=ttypes.TI64Column(values=[-1, 0, 2 ** 63 - 1], nulls=b'\x02')),
+            ttypes.TColumn(doubleVal=ttypes.TDoubleColumn(values=[0.5, -1e300, 0], nulls=b'')),
+            ttypes.TColumn(stringVal=ttypes.TStringColumn(values=['a', '', '你好' * 10],
+                                                          nulls=b'')),
+            ttypes.TColumn(binaryVal=ttypes.TBinaryColumn(values=[b'\x00\xff', b'', b'x' * 50],
+                                                          nulls=b'\x01')),
+        ]
+        response = ttypes.TFetchResultsResp(
+            status=ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS),
+            hasMoreRows=False,
+            results=ttypes.TRowSet(startRowOffset=0, rows=[], columns=columns),
+        )
+        buf = thrift.transport.TTransport.TMemoryBuffer()
+        protocol = TBinaryProtocol(buf)
+        protocol.writeMessageBegin('FetchResults', TMessageType.REPLY, 0)
+        TCLIService.FetchResults_result(success=response).write(protocol)
+        protocol.writeMessageEnd()
+        req = ttypes.TFetchResultsReq(orientation=ttypes.TFetchOrientation.FETCH_NEXT, maxRows=3)
+
+        def fetch(transport, fn):
+            client = TCLIService.Client(
+                TBinaryProtocol(transport),
+                TBinaryProtocol(thrift.transport.TTransport.TMemoryBuffer()))
+            response = fn(client)
+            return [list(hive._unwrap_column(col)) for col in response.results.columns]
+
+        expected = fetch(thrift.transport.TTransport.TMemoryBuffer(buf.getvalue()),
+                         lambda client: client.FetchResults(req))
+        self.assertEqual(expected[4], [-1, None, 2 ** 63 - 1])
+        # tiny read buffers make string values straddle refills
+        for buffer_size in (1, 7, 4096):
+            transport = thrift.transport.TTransport.TBufferedTransport(
+                thrift.transport.TTransport.TMemoryBuffer(buf.getvalue()), buffer_size)
+            result = fetch(transport, lambda client: hive._fetch_results(client, req))
+            self.assertEqual(result, expected)
+            self.assertEqual([list(map(type, col)) for col in result],
+                             [list(map(type, col)) for col in expected])
+        client = TCLIService.Client(
+            TBinaryProtocol(thrift.transport.TTransport.TMemoryBuffer(buf.getvalue())),
+            TBinaryProtocol(thrift.transport.TTransport.TMemoryBuffer()))
+        values = hive._fetch_results(client, req).results.columns[6].stringVal.values
+        self.assertEqual(values[1:], ['', '你好' * 10])
+        self.assertEqual(values[::-2], ['你好' * 10, 'a'])
+
+    def test_fetch_numpy_types(self):
+        import numpy
+
+        connection = mock_connection(
+            [('t.a', ttypes.TTypeId.BIGINT_TYPE),
+             ('t.b', ttypes.TTypeId.STRING_TYPE),
+             ('t.c', ttypes.TTypeId.TIMESTAMP_TYPE)],
+            [[1, None, 3], ['x', 'y', None], ['2020-01-01 00:00:00', None, '2020-01-03 04:05:06']],
+            [[4], ['z'], ['2020-01-04 00:00:00']],
+        )
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute('SELECT * FROM t')
+            result = cursor.fetchmany_numpy(2)
+            self.assertEqual(list(result), ['t.a', 't.b', 't.c'])
+            self.assertEqual(result['t.a'].dtype, numpy.int64)
+            self.assertEqual(result['t.a'].tolist(), [1, None])
+            self.assertEqual(result['t.b'].dtype, numpy.object_)
+            self.assertEqual(result['t.b'].tolist(), ['x', 'y'])
+            self.assertEqual(result['t.c'].dtype, numpy.dtype('datetime64[us]'))
+            self.assertEqual(result['t.c'][0], numpy.datetime64('2020-01-01'))
+            self.assertIs(result['t.c'][1], numpy.ma.masked)
+            self.assertEqual(cursor.rownumber, 2)
+            # the rest of the first batch is still there for row-wise fetches
+            self.assertEqual(cursor.fetchone(),
+                             (3, None, datetime.datetime(2020, 1, 3, 4, 5, 6)))
+            result = cursor.fetch_numpy()
+            self.assertEqual(result['t.a'].tolist(), [4])
+            self.assertNotIsInstance(result['t.a'], numpy.ma.MaskedArray)
+            self.assertEqual(len(cursor.fetch_numpy()['t.a']), 0)
+            self.assertEqual(cursor.rownumber, 4)
+
+    def test_fetch_arrow_types(self):
+        import pyarrow
+
+        def connect():
+            return mock_connection(
+                [('t.a', ttypes.TTypeId.BIGINT_TYPE),
+                 ('t.b', ttypes.TTypeId.DECIMAL_TYPE, {'precision': 10, 'scale': 1}),
+                 ('t.c', ttypes.TTypeId.DATE_TYPE),
+                 ('t.d', ttypes.TTypeId.INTERVAL_DAY_TIME_TYPE)],
+                [[1, None], ['0.5', '1.5'], ['2020-01-01', None], [None, None]],
+                [[3], ['12.5'], ['2020-01-03'], ['1 00:00:00.000000000']],
+            )
+
+        with contextlib.closing(connect().cursor()) as cursor:
+            cursor.execute('SELECT * FROM t')
+            batches = list(cursor.iter_arrow_batches())
+            self.assertEqual([batch.num_rows for batch in batches], [2, 1])
+            self.assertEqual(batches[0].schema.names, ['t.a', 't.b', 't.c', 't.d'])
+            self.assertEqual(batches[0].schema.types[:3],
+                             [pyarrow.int64(), pyarrow.decimal128(10, 1), pyarrow.date32()])
+            self.assertEqual(batches[0].column(0).to_pylist(), [1, None])
+            self.assertEqual(batches[0].column(2).to_pylist(), [datetime.date(2020, 1, 1), None])
+            self.assertEqual(cursor.rownumber, 3)
+
+        with contextlib.closing(connect().cursor()) as cursor:
+            cursor.execute('SELECT * FROM t')
+            table = cursor.fetch_arrow_table()
+            self.assertEqual(table.num_rows, 3)
+            self.assertEqual(table.schema.field('t.d').type, pyarrow.duration('us'))
+            self.assertEqual(table.column('t.b').to_pylist(),
+                             [Decimal('0.5'), Decimal('1.5'), Decimal('12.5')])
+            self.assertEqual(table.column('t.d').to_pylist(),
+                             [None, None, datetime.timedelta(days=1)])
+            self.assertEqual(cursor.fetch_arrow_table().num_rows, 0)
+
+    def test_read_sql_pandas(self):
+        from pyhive.pandas import read_sql
+
+        def connect():
+            return mock_connection(
+                [('t.a', ttypes.TTypeId.BIGINT_TYPE),
+                 ('t.a', ttypes.TTypeId.STRING_TYPE),
+                 ('t.c', ttypes.TTypeId.TIMESTAMP_TYPE)],
+                [[1, None, 3], ['x', 'y', None], ['2020-01-01 00:00:00', None, None]],
+                [[4], ['z'], ['2020-01-04 00:00:00']],
+            )
+
+        frame = read_sql('SELECT * FROM t', connect())
+        self.assertEqual(list(frame.columns), ['t.a', 't.a', 't.c'])
+        self.assertEqual(frame.shape, (4, 3))
+        self.assertEqual(str(frame.dtypes.iloc[0]), 'float64')
+        self.assertEqual(frame.iloc[:, 1].isnull().tolist(), [False, False, True, False])
+        self.assertEqual(frame.iloc[:, 1].dropna().tolist(), ['x', 'y', 'z'])
+        self.assertEqual(frame.iloc[0, 2], datetime.datetime(2020, 1, 1))
+        self.assertEqual(frame.iloc[:, 2].isnull().tolist(), [False, True, True, False])
+
+        chunks = list(read_sql('SELECT * FROM t', connect(), chunksize=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2])
+        self.assertEqual(str(chunks[1].dtypes.iloc[0]), 'int64')
+        self.assertEqual(chunks[1].iloc[:, 0].tolist(), [3, 4])
+
+    def test_prefetch(self):
+        connection = mock_connection(
+            [('a', ttypes.TTypeId.BIGINT_TYPE)], [[1, 2, 3]], [[4, 5]], [[6]])
+        fetch_results = connection.client.FetchResults
+        with contextlib.closing(connection.cursor(prefetch=1)) as cursor:
+            cursor.execute('SELECT a FROM t')
+            self.assertEqual(cursor.fetchone(), (1,))
+            time.sleep(0.1)
+            # one batch is buffered, so nothing more is fetched until it's consumed
+            self.assertEqual(fetch_results.call_count, 1)
+            self.assertEqual(cursor.fetchall(), [(2,), (3,), (4,), (5,), (6,)])
+            self.assertEqual(cursor.rownumber, 6)
+            self.assertEqual(fetch_results.call_count, 4)
+
+    def test_prefetch_error(self):
+        connection = mock_connection([('a', ttypes.TTypeId.BIGINT_TYPE)], [[1, 2, 3]])
+        fetch_results = connection.client.FetchResults
+        fetch_results.side_effect = [next(fetch_results.side_effect), IOError('boom')]
+        with contextlib.closing(connection.cursor(prefetch=2)) as cursor:
+            cursor.execute('SELECT a FROM t')
+            self.assertEqual(cursor.fetchmany(3), [(1,), (2,), (3,)])
+            self.assertRaisesRegexp(IOError, 'boom', cursor.fetchone)
+            self.assertRaisesRegexp(IOError, 'boom', cursor.fetchone)
+
+    def test_adaptive_fetch_size(self):
+        connection = mock_connection(
+            [('a', ttypes.TTypeId.BIGINT_TYPE)], *[[list(range(10))] for _ in range(4)])
+        with contextlib.closing(connection.cursor(fetch_bytes=2000)) as cursor:
+            cursor.execute('SELECT a FROM t')
+            self.assertEqual(len(cursor.fetchmany(5)), 5)
+            # the rest of the batch is buffered, so this doesn't change the next request
+            self.assertEqual(len(cursor.fetchmany(7)), 7)
+            self.assertEqual(len(cursor.fetchall()), 28)
+        max_rows = [call[0][0].maxRows for call in connection.client.FetchResults.call_args_list]
+        # 10 * 8 bytes of values plus a 2 byte null bitmap is 8.2 bytes per row, so 2000 bytes
+        # fit 243 rows
+        self.assertEqual(max_rows, [5, 200, 243, 243, 243])
+
+    def test_fast_connect(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+        client = mock.Mock()
+        client.OpenSession.return_value = ttypes.TOpenSessionResp(
+            status=status, sessionHandle=ttypes.TSessionHandle(),
+            serverProtocolVersion=ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V8)
+        client.GetInfo.return_value = ttypes.TGetInfoResp(
+            status=status, infoValue=ttypes.TGetInfoValue(stringValue='Hive'))
+        with mock.patch('thrift.transport.TSocket.TSocket') as tsocket, \
+                mock.patch.object(TCLIService, 'Client', return_value=client), \
+                mock.patch.dict(hive._server_info_cache, clear=True):
+            for _ in range(2):
+                connection = hive.connect(
+                    host='fast', auth='NOSASL', database='db', configuration={'a': 'b'},
+                    fast_connect=True)
+                self.assertEqual(connection.server_info()['CLI_DBMS_NAME'], 'Hive')
+            tsocket.return_value.open.assert_called_with()
+        req = client.OpenSession.call_args[0][0]
+        self.assertEqual(req.configuration, {'a': 'b', 'use:database': 'db'})
+        self.assertEqual(req.client_protocol, ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V10)
+        self.assertEqual(connection.protocol_version,
+                         ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V8)
+        client.ExecuteStatement.assert_not_called()
+        self.assertEqual(list(connection.connect_timings), ['tcp', 'open_session'])
+        # cached from the first connection
+        self.assertEqual(client.GetInfo.call_count, len(hive._SERVER_INFO_TYPES))
+
+    def test_requests_transport(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+
+        def reply(name, result):
+            buf = TMemoryBuffer()
+            protocol = TBinaryProtocol(buf)
+            protocol.writeMessageBegin(name, TMessageType.REPLY, 0)
+            result.write(protocol)
+            protocol.writeMessageEnd()
+            return mock.Mock(status_code=200, reason='OK', content=buf.getvalue(), cookies={})
+
+        session = requests.Session()
+        adapter = mock.Mock()
+        session.mount('https://', adapter)
+        adapter.send.side_effect = [
+            reply('OpenSession', TCLIService.OpenSession_result(success=ttypes.TOpenSessionResp(
+                status=status, sessionHandle=ttypes.TSessionHandle(),
+                serverProtocolVersion=ttypes.TProtocolVersion.HIVE_CLI_SERVICE_PROTOCOL_V10))),
+            reply('CloseSession', TCLIService.CloseSession_result(
+                success=ttypes.TCloseSessionResp(status=status))),
+            mock.Mock(status_code=401, reason='Unauthorized', cookies={}),
+        ]
+        connection = hive.connect(
+            host='web', port=10001, scheme='https', username='u', fast_connect=True,
+            http_transport='requests', requests_session=session, requests_kwargs={'timeout': 5})
+        connection.close()
+        url, = {call[0][0].url for call in adapter.send.call_args_list}
+        self.assertEqual(url, 'https://web:10001/cliservice/')
+        request, kwargs = adapter.send.call_args
+        self.assertEqual((kwargs['timeout'], kwargs['verify']), (5, False))
+        self.assertEqual(request[0].headers['Content-Type'], 'application/x-thrift')
+        self.assertTrue(request[0].headers['Authorization'].startswith('Basic '))
+        self.assertEqual(request[0].body[:4], b'\x80\x01\x00\x01')
+
+        transport = connection._transport
+        transport.write(b'x')
+        self.assertRaisesRegexp(TTransportException, '401 Unauthorized', transport.flush)
+
+    def test_requests_transport_cookie_auth(self):
+        def response(status, cookie=None):
+            r = requests.Response()
+            r.status_code = status
+            r.reason = 'OK' if status == 200 else 'Unauthorized'
+            r._content = b''
+            if cookie:
+                r.cookies.set('hive.server2.auth', cookie)
+            return r
+
+        session = requests.Session()
+        adapter = mock.Mock()
+        session.mount('https://', adapter)
+        adapter.send.side_effect = [
+            response(200, 'c1'),
+            # The cookie and then the token expired
+            response(401), response(401), response(200, 'c2'),
+            response(200),
+        ]
+        negotiate = mock.Mock(side_effect=['Negotiate a', 'Negotiate b'])
+        url = 'https://web:10001/cliservice/'
+        credentials = http_transport.HttpCredentials(negotiate=negotiate)
+        first = http_transport.RequestsTransport(url, session, credentials=credentials)
+        second = http_transport.RequestsTransport(url, session, credentials=credentials)
+        for transport in [first, second, first]:
+            transport.write(b'x')
+            transport.flush()
+        sent = [(call[0][0].headers.get('Authorization'), call[0][0].headers.get('Cookie'))
+                for call in adapter.send.call_args_list]
+        self.assertEqual(sent, [
+            ('Negotiate a', None),
+            (None, 'hive.server2.auth=c1'),
+            ('Negotiate a', None),
+            ('Negotiate b', None),
+            (None, 'hive.server2.auth=c2'),
+        ])
+
+    def test_requests_transport_users_share_session(self):
+        sent = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                sent.append((self.headers.get('Authorization'), self.headers.get('Cookie')))
+                self.send_response(200)
+                if self.headers.get('Authorization'):
+                    self.send_header('Set-Cookie', 'hive.server2.auth=c{}'.format(len(sent)))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('localhost', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = 'http://localhost:{}/cliservice/'.format(server.server_port)
+        session = requests.Session()
+        authorizations = {user: hive.Connection._basic_authorization(user, 'p')
+                          for user in ['a', 'b']}
+        for user in ['a', 'b', 'a', 'b']:
+            credentials = hive.Connection._requests_credentials(
+                url, authorizations[user], None, session)
+            transport = http_transport.RequestsTransport(url, session, credentials=credentials)
+            transport.write(b'x')
+            transport.flush()
+        # Each user sends its own cookie, which stays out of the session
+        self.assertEqual(sent, [
+            (authorizations['a'], None),
+            (authorizations['b'], None),
+            (None, 'hive.server2.auth=c1'),
+            (None, 'hive.server2.auth=c2'),
+        ])
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_requests_shared_credentials(self):
+        url = 'https://web:10001/cliservice/'
+        ldap = hive.Connection._basic_authorization('u', 'secret')
+
+        def credentials(session, authorization=ldap, negotiate=None):
+            return hive.Connection._requests_credentials(url, authorization, negotiate, session)
+
+        session = requests.Session()
+        shared = credentials(session)
+        self.assertIs(credentials(session), shared)
+        self.assertIsNot(credentials(session, hive.Connection._basic_authorization('v', 'x')),
+                         shared)
+        self.assertIsNot(credentials(requests.Session()), shared)
+        self.assertNotIn(ldap, repr(list(http_transport._shared_credentials[session])))
+        # The Kerberos principal may differ between connections
+        negotiate = mock.Mock()
+        self.assertIsNot(credentials(session, None, negotiate),
+                         credentials(session, None, negotiate))
+        # Forgotten with the session
+        del session
+        gc.collect()
+        self.assertNotIn(shared, [
+            c for by_key in http_transport._shared_credentials.values() for c in by_key.values()])
+
+    def test_negotiate_http_client(self):
+        negotiate = mock.Mock(side_effect=['Negotiate a', 'Negotiate b', 'Negotiate c'])
+        client = hive._NegotiateHttpClient(negotiate, uri_or_host='http://web:10001/cliservice/')
+        codes = iter([200, 401, 200, 401, 401])
+        sent = []
+
+        def flush(self):
+            self.code = next(codes)
+
+        base = THttpClient.THttpClient
+        with mock.patch.object(base, 'setCustomHeaders', autospec=True, side_effect=lambda _self,
+                               headers: sent.append(headers['Authorization'])), \
+                mock.patch.object(base, 'write', autospec=True, side_effect=lambda _self,
+                                  data: sent.append(data)), \
+                mock.patch.object(base, 'flush', autospec=True, side_effect=flush):
+            for data in [b'x', b'y', b'z']:
+                client.write(data)
+                client.flush()
+        self.assertEqual(sent, [
+            'Negotiate a', b'x',
+            # Rejected tokens are renewed once
+            'Negotiate a', b'y', 'Negotiate b', b'y',
+            'Negotiate b', b'z', 'Negotiate c', b'z',
+        ])
+        self.assertEqual(client.code, 401)
+
+    def test_binary_columns(self):
+        connection = mock_connection(
+            [('a', ttypes.TTypeId.INT_TYPE), ('b', ttypes.TTypeId.STRING_TYPE)])
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+
+        def response(ints, nulls, strings):
+            buf = TMemoryBuffer()
+            oprot = TCompactProtocol(buf)
+            ttypes.TColumn(i32Val=ttypes.TI32Column(values=ints, nulls=nulls)).write(oprot)
+            ttypes.TColumn(stringVal=ttypes.TStringColumn(values=strings, nulls=b'')).write(oprot)
+            return ttypes.TFetchResultsResp(status=status, results=ttypes.TRowSet(
+                startRowOffset=0, rows=[], binaryColumns=buf.getvalue(),
+                columnCount=2))
+        connection.client.FetchResults.side_effect = [
+            response([1, 0], b'\x02', ['x', 'y']), response([], b'', [])]
+        cursor = connection.cursor()
+        cursor.execute('SELECT a, b FROM t')
+        self.assertEqual(cursor.fetchall(), [(1, 'x'), (None, 'y')])
+
+    def _mock_pool_connect(self):
+        status = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+
+        def connect(**kwargs):
+            connection = mock.Mock(kwargs=kwargs)
+            connection.client.GetInfo.return_value = ttypes.TGetInfoResp(status=status)
+            return connection
+        return mock.patch.object(hive, 'connect', side_effect=connect)
+
+    def test_connection_pool(self):
+        with self._mock_pool_connect() as connect:
+            pool = hive.ConnectionPool(host='localhost', max_size=2, prewarm=1)
+            self.assertEqual(connect.call_count, 1)
+            with pool.connection() as first:
+                self.assertEqual(first.kwargs, {'host': 'localhost'})
+            with pool.connection() as second:
+                self.assertIs(second, first)
+                with pool.connection(database='other') as other:
+                    self.assertEqual(other.kwargs, {'host': 'localhost', 'database': 'other'})
+            self.assertEqual(pool.stats()['idle'], 2)
+
+            # a broken connection is replaced
+            first.client.GetInfo.side_effect = IOError
+            with pool.connection() as third:
+                self.assertIsNot(third, first)
+            first.close.assert_called_once_with()
+
+            # an idle connection for other arguments makes room when the pool is full
+            with pool.connection(database='more'):
+                other.close.assert_called_once_with()
+                with pool.connection():
+                    pool._timeout = 0
+                    self.assertRaises(hive.OperationalError, pool.acquire, database='other')
+
+            stats = pool.stats()
+            self.assertEqual((stats['hits'], stats['misses'], stats['timeouts']), (3, 3, 1))
+            self.assertEqual(stats['discarded'], 2)
+            pool.close()
+            self.assertEqual(pool.stats()['size'], 0)
+
+    def test_connection_pool_unhashable_arguments(self):
+        with self._mock_pool_connect() as connect:
+            configuration = {'a': ['x', 'y'], 'b': {'c': {1, 2}}}
+            pool = hive.ConnectionPool(host='localhost', configuration=configuration)
+            with pool.connection() as first:
+                pass
+            with pool.connection(configuration={'b': {'c': {2, 1}}, 'a': ['x', 'y']}) as second:
+                self.assertIs(second, first)
+            with pool.connection(configuration={'a': ['y', 'x']}) as third:
+                self.assertIsNot(third, first)
+            self.assertEqual(connect.call_count, 2)
+
+    def test_connection_pool_expiry(self):
+        with self._mock_pool_connect():
+            pool = hive.ConnectionPool(host='localhost', max_age=60, max_idle=10)
+            with mock.patch('time.time', return_value=1000):
+                first = pool.acquire()
+                pool.release(first)
+            with mock.patch('time.time', return_value=1005):
+                self.assertIs(pool.acquire(), first)
+            with mock.patch('time.time', return_value=1080):
+                # too old, so it's closed instead of pooled
+                pool.release(first)
+                first.close.assert_called_once_with()
+                second = pool.acquire()
+                pool.release(second)
+            with mock.patch('time.time', return_value=1090):
+                self.assertIsNot(pool.acquire(), second)
+                second.close.assert_called_once_with()
+
+    def test_connection_pool_fork(self):
+        with self._mock_pool_connect():
+            pool = hive.ConnectionPool(host='localhost', prewarm=1)
+            parent = pool.acquire()
+            pool.release(parent)
+            with mock.patch('os.getpid', return_value=-1):
+                # the parent's connection is neither reused nor closed
+                child = pool.acquire()
+                self.assertIsNot(child, parent)
+                self.assertEqual(pool.stats()['misses'], 1)
+                pool.release(child)
+                pool.close()
+            parent.close.assert_not_called()
+            child.close.assert_called_once_with()
+
     def test_invalid_transport(self):
         """transport and auth are incompatible"""
         socket = thrift.transport.TSocket.TSocket('localhost', 10000)
@@ -203,7 +1029,10 @@ class TestHive(unittest.TestCase, DBAPITestCase):
         socket = thrift.transport.TSocket.TSocket('localhost', 10000)
         sasl_auth = 'PLAIN'
 
-        transport = thrift_sasl.TSaslClientTransport(lambda: hive.get_installed_sasl(host='localhost', sasl_auth=sasl_auth, username='test_username', password='x'), sasl_auth, socket)
+        transport = sasl_transport.TSaslClientTransport(
+            lambda: hive.get_installed_sasl(
+                host='localhost', sasl_auth=sasl_auth, username='test_username', password='x'),
+            sasl_auth, socket)
         conn = hive.connect(thrift_transport=transport)
         with contextlib.closing(conn):
             with contextlib.closing(conn.cursor()) as cursor:
@@ -0,0 +1,119 @@
+"""Tests for the parallel split reader, against fake connections."""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import random
+import threading
+import time
+import unittest
+
+from TCLIService import ttypes
+from pyhive import parallel
+from pyhive.tests.mock_hive import mock_connection
+
+
+class _FakeCursor(object):
+    """Returns ``rows`` rows of the number at the end of the query, in batches"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._rows = []
+
+    def execute(self, sql):
+        self._connection.queries.append(sql)
+        if 'fail' in sql:
+            raise ValueError(sql)
+        split = int(sql.rsplit(' ', 1)[1].rstrip(')'))
+        self._rows = [(split, i) for i in range(self._connection.rows)]
+
+    def fetchmany(self, size):
+        # Let other splits get ahead
+        time.sleep(random.random() / 100)
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class _FakeConnection(object):
+    def __init__(self, queries, rows):
+        self.queries = queries
+        self.rows = rows
+        self.closed = False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+class TestParallel(unittest.TestCase):
+    def read(self, splits, rows=5, **kwargs):
+        queries = []
+        connections = []
+        lock = threading.Lock()
+
+        def connect():
+            with lock:
+                connections.append(_FakeConnection(queries, rows))
+                return connections[-1]
+
+        batches = list(parallel.read_table(connect, 't', splits, arraysize=2, **kwargs))
+        self.assertTrue(all(connection.closed for connection in connections))
+        return batches, sorted(queries), connections
+
+    def test_read_table(self):
+        splits = ['s = {}'.format(i) for i in range(5)]
+        batches, queries, connections = self.read(
+            splits, columns=['a', 'b'], where='a > 0 OR b > 0', concurrency=3)
+        self.assertEqual(len(connections), 3)
+        self.assertEqual(queries, [
+            'SELECT a, b FROM t WHERE (a > 0 OR b > 0) AND (s = {})'.format(i) for i in range(5)])
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual(sorted(row for batch in batches for row in batch),
+                         [(split, i) for split in range(5) for i in range(5)])
+
+    def test_read_table_ordered(self):
+        splits = ['s = {}'.format(i) for i in range(5)]
+        batches, queries, _connections = self.read(splits, concurrency=5, ordered=True)
+        self.assertEqual(queries, ['SELECT * FROM t WHERE s = {}'.format(i) for i in range(5)])
+        self.assertEqual([row for batch in batches for row in batch],
+                         [(split, i) for split in range(5) for i in range(5)])
+
+    def test_read_table_error(self):
+        self.assertRaises(ValueError, self.read, ['s = 0', 'fail = 1', 's = 2'], concurrency=2)
+
+    def test_read_table_stop(self):
+        connection = _FakeConnection([], 1000)
+        batches = parallel.read_table(lambda: connection, 't', ['s = 1'], arraysize=2)
+        self.assertEqual(next(batches), [(1, 0), (1, 1)])
+        batches.close()
+        self.assertTrue(connection.closed)
+
+    def test_partition_splits(self):
+        connection = mock_connection(
+            [('partition', ttypes.TTypeId.STRING_TYPE)],
+            [['ds=2020-01-01/hr=00', "ds=it%27s/hr=__HIVE_DEFAULT_PARTITION__"]])
+        self.assertEqual(parallel.partition_splits(connection, 'logs'), [
+            "ds = '2020-01-01' AND hr = '00'",
+            "ds = 'it\\'s' AND hr IS NULL",
+        ])
+        req = connection.client.ExecuteStatement.call_args[0][0]
+        self.assertEqual(req.statement, 'SHOW PARTITIONS logs')
+
+    def test_hash_splits(self):
+        self.assertEqual(parallel.hash_splits('id', 2), [
+            'pmod(hash(id), 2) = 0', 'pmod(hash(id), 2) = 1'])
+        hashed = 'from_big_endian_64(xxhash64(to_utf8(CAST(id AS varchar))))'
+        self.assertEqual(parallel.hash_splits('id', 2, dialect='presto'), [
+            'mod({}, 2) IN (0, -2) OR id IS NULL'.format(hashed),
+            'mod({}, 2) IN (1, -1)'.format(hashed),
+        ])
+
+    def test_range_splits(self):
+        self.assertEqual(parallel.range_splits('n', [10, 20]), [
+            'n < 10 OR n IS NULL', 'n >= 10 AND n < 20', 'n >= 20'])
+        self.assertEqual(parallel.range_splits('n', []), ['TRUE'])
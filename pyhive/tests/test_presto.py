@@ -132,6 +132,39 @@ class TestPresto(unittest.TestCase, DBAPITestCase):
         post.return_value.status_code = 404
         self.assertRaises(exc.OperationalError, lambda: cursor.execute('show tables'))
 
+    @mock.patch('requests.post')
+    def test_executemany_batches(self, post):
+        post.return_value.status_code = 200
+        post.return_value.json.return_value = {'id': 'query', 'stats': {'state': 'FINISHED'}}
+        cursor = presto.Cursor(_HOST, port=_PORT)
+        results = []
+        cursor.executemany('INSERT INTO t VALUES (%s, %s)', [(i, 'x') for i in range(6)],
+                           max_statement_size=50, concurrency=2, callback=results.append)
+        statements = sorted(call[1]['data'].decode('utf-8') for call in post.call_args_list)
+        self.assertEqual(statements, [
+            "INSERT INTO t VALUES (0, 'x'), (1, 'x'), (2, 'x')",
+            "INSERT INTO t VALUES (3, 'x'), (4, 'x'), (5, 'x')",
+        ])
+        self.assertEqual(sorted((r.index, r.rows, r.error) for r in results),
+                         [(0, 3, None), (1, 3, None)])
+
+    @mock.patch('requests.post')
+    def test_lazy_conversion(self, post):
+        post.return_value.status_code = 200
+        post.return_value.json.return_value = {
+            'id': 'query',
+            'columns': [{'name': 'a', 'type': 'decimal(2,1)'}, {'name': 'b', 'type': 'varbinary'}],
+            'data': [['0.5', 'YQ=='], [None, 'Yg==']],
+        }
+        cursor = presto.Cursor(_HOST, port=_PORT, lazy_conversion=True)
+        decode = mock.Mock(side_effect=presto.TYPES_CONVERTER['varbinary'])
+        with mock.patch.dict(presto.TYPES_CONVERTER, {'varbinary': decode}):
+            cursor.execute('SELECT a, b FROM t')
+        self.assertEqual(cursor.fetchone()[0], Decimal('0.5'))
+        decode.assert_not_called()
+        self.assertEqual(cursor.fetchall(), [(None, b'b')])
+        decode.assert_called_once_with('Yg==')
+
     @with_cursor
     def test_poll(self, cursor):
         self.assertRaises(presto.ProgrammingError, cursor.poll)
@@ -0,0 +1,174 @@
+"""Tests for the SASL transport, against a fake server on a socket pair."""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import socket
+import struct
+import threading
+import unittest
+
+from thrift.protocol.TBinaryProtocol import TBinaryProtocol
+from thrift.protocol.TBinaryProtocol import TBinaryProtocolAccelerated
+from thrift.transport import TSocket
+from thrift.transport.TTransport import TMemoryBuffer
+from thrift.transport.TTransport import TTransportException
+
+from TCLIService import ttypes
+from pyhive import hive
+from pyhive.sasl_transport import TSaslClientTransport
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError()
+        data += chunk
+    return data
+
+
+class _Server(threading.Thread):
+    """Accepts PLAIN authentication, then answers each frame with ``respond(payload)``, sent in
+    frames of up to ``frame_size`` bytes
+    """
+
+    def __init__(self, sock, respond, frame_size=None, status=TSaslClientTransport.COMPLETE):
+        super(_Server, self).__init__()
+        self.daemon = True
+        self._sock = sock
+        self._respond = respond
+        self._frame_size = frame_size
+        self._status = status
+        self.messages = []
+
+    def run(self):
+        try:
+            for _ in range(2):
+                status, length = struct.unpack('>BI', _recv_exactly(self._sock, 5))
+                self.messages.append((status, _recv_exactly(self._sock, length)))
+            self._sock.sendall(struct.pack('>BI', self._status, 0))
+            while True:
+                length, = struct.unpack('>I', _recv_exactly(self._sock, 4))
+                data = self._respond(_recv_exactly(self._sock, length))
+                size = self._frame_size or len(data)
+                for i in range(0, len(data), size):
+                    self._sock.sendall(struct.pack('>I', len(data[i:i + size])) + data[i:i + size])
+        except (EOFError, socket.error):
+            pass
+        finally:
+            self._sock.close()
+
+
+def _status(data):
+    """Return a TStatus with messages as long as the number in ``data``"""
+    out = TMemoryBuffer()
+    ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS,
+                   infoMessages=['x' * int(data)]).write(TBinaryProtocol(out))
+    return out.getvalue()
+
+
+class TestSaslTransport(unittest.TestCase):
+    def connect(self, respond, sasl_client=None, **kwargs):
+        client_sock, server_sock = socket.socketpair()
+        server = _Server(server_sock, respond, **kwargs)
+        server.start()
+        sock = TSocket.TSocket()
+        sock.handle = client_sock
+        transport = TSaslClientTransport(
+            lambda: sasl_client or hive.get_pure_sasl_client(
+                host='localhost', sasl_auth='PLAIN', username='u', password='p'),
+            'PLAIN', sock)
+        self.addCleanup(transport.close)
+        transport.open()
+        return transport, server
+
+    def test_plain(self):
+        transport, server = self.connect(lambda data: data)
+        self.assertEqual(server.messages, [(1, b'PLAIN'), (2, b'\0u\0p')])
+        self.assertFalse(transport._wrap)
+        transport.write(b'hello ')
+        transport.write(b'world')
+        transport.flush()
+        self.assertEqual(transport.read(3), b'hel')
+        self.assertEqual(transport.read(8), b'lo world')
+        transport.write(b'again')
+        transport.flush()
+        self.assertEqual(transport.read(5), b'again')
+
+    def test_accelerated_protocol(self):
+        try:
+            from thrift.protocol import fastbinary  # noqa: F401
+        except ImportError:
+            self.skipTest("Thrift C extension isn't installed")
+        # Responses span several frames, so the C extension has to ask for more
+        for frame_size in [None, 7]:
+            transport, _server = self.connect(_status, frame_size=frame_size)
+            protocol = TBinaryProtocolAccelerated(transport)
+            for size in [1, 5000, 20]:
+                transport.write(str(size).encode('ascii'))
+                transport.flush()
+                status = ttypes.TStatus()
+                # Like newer generated bindings call it
+                protocol._fast_decode(
+                    status, protocol, [ttypes.TStatus, ttypes.TStatus.thrift_spec])
+                self.assertEqual(status.infoMessages, ['x' * size])
+
+    def test_wrap(self):
+        class SaslClient(object):
+            """Negotiates a security layer that reverses messages"""
+            qop = b'auth-conf'
+
+            def start(self, mechanism):
+                return True, mechanism, b''
+
+            def encode(self, data):
+                return True, struct.pack('>I', len(data)) + data[::-1]
+
+            def decode(self, data):
+                return True, data[4:][::-1]
+
+        transport, _server = self.connect(lambda data: data + b'!', SaslClient())
+        self.assertTrue(transport._wrap)
+        transport.write(b'abc')
+        transport.flush()
+        self.assertEqual(transport.read(4), b'!abc')
+
+    def test_wrap_unknown(self):
+        class SaslClient(object):
+            """Negotiates a security layer without saying so, and numbers messages like GSSAPI"""
+            def __init__(self):
+                self.sequence = 0
+
+            def start(self, mechanism):
+                return True, mechanism, b''
+
+            def encode(self, data):
+                data = struct.pack('>I', self.sequence) + data
+                self.sequence += 1
+                return True, struct.pack('>I', len(data)) + data
+
+            def decode(self, data):
+                return True, data[8:]
+
+        received = []
+
+        def respond(data):
+            received.append(data)
+            return data
+
+        transport, _server = self.connect(respond, SaslClient())
+        self.assertIsNone(transport._wrap)
+        for message in [b'abc', b'de']:
+            transport.write(message)
+            transport.flush()
+            self.assertEqual(transport.read(len(message)), message)
+        self.assertTrue(transport._wrap)
+        # Each message was encoded once
+        self.assertEqual(received, [b'\0\0\0\0abc', b'\0\0\0\x01de'])
+
+    def test_bad_status(self):
+        self.assertRaisesRegexp(
+            TTransportException, 'Bad status: 4', self.connect, lambda data: data,
+            status=TSaslClientTransport.ERROR)
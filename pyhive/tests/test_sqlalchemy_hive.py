@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from builtins import str
 from pyhive.sqlalchemy_hive import HiveDate
+from pyhive.sqlalchemy_hive import HiveDialect
 from pyhive.sqlalchemy_hive import HiveDecimal
 from pyhive.sqlalchemy_hive import HiveTimestamp
 from sqlalchemy.exc import NoSuchTableError, OperationalError
@@ -16,6 +17,7 @@ from sqlalchemy.sql import text
 import contextlib
 import datetime
 import decimal
+import mock
 import sqlalchemy.types
 import unittest
 import re
@@ -236,3 +238,107 @@ class TestSqlAlchemyHive(unittest.TestCase, SqlAlchemyTestCase):
     @with_engine_connection
     def test_supports_san_rowcount(self, engine, connection):
         self.assertFalse(engine.dialect.supports_sane_rowcount_returning)
+
+
+class TestHiveDialectReflection(unittest.TestCase):
+    """Reflection against mocked metadata calls, without a server"""
+
+    def setUp(self):
+        self.dialect = HiveDialect()
+        self.dialect.default_schema_name = 'default'
+        self.connection = mock.Mock()
+        self.metadata = {
+            'tables': [
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'one_row', 'TABLE_TYPE': 'TABLE'},
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'view_1', 'TABLE_TYPE': 'VIEW'},
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'mv', 'TABLE_TYPE': 'MATERIALIZED_VIEW'},
+                # Matched by the LIKE pattern one_row
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'oneXrow', 'TABLE_TYPE': 'TABLE'},
+            ],
+            'columns': [
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'one_row', 'COLUMN_NAME': 'b',
+                 'TYPE_NAME': 'STRING', 'ORDINAL_POSITION': 2},
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'one_row', 'COLUMN_NAME': 'a',
+                 'TYPE_NAME': 'DECIMAL(10,1)', 'ORDINAL_POSITION': 1},
+                {'TABLE_SCHEM': 'default', 'TABLE_NAME': 'oneXrow', 'COLUMN_NAME': 'x',
+                 'TYPE_NAME': 'INT', 'ORDINAL_POSITION': 1},
+            ],
+        }
+        self.calls = []
+
+        def get_metadata(connection, method, **kwargs):
+            self.calls.append((method, kwargs))
+            return [dict(row) for row in self.metadata[method]]
+        self.dialect._get_metadata = get_metadata
+
+    def test_default_schema_name(self):
+        self.connection.execute.return_value.scalar.return_value = 'db'
+        self.assertEqual(self.dialect._get_default_schema_name(self.connection), 'db')
+        self.assertEqual(
+            str(self.connection.execute.call_args[0][0]), 'SELECT current_database()')
+
+    def test_table_and_view_names(self):
+        info_cache = {}
+        self.assertEqual(
+            self.dialect.get_table_names(self.connection, info_cache=info_cache),
+            ['one_row', 'oneXrow'])
+        self.assertEqual(
+            self.dialect.get_view_names(self.connection, info_cache=info_cache),
+            ['view_1', 'mv'])
+        self.assertEqual(self.calls, [('tables', {'schema': 'default', 'table': None})])
+
+    def test_has_table(self):
+        self.assertTrue(self.dialect.has_table(self.connection, 'one_row'))
+        self.assertTrue(self.dialect.has_table(self.connection, 'ONE_ROW', schema='DEFAULT'))
+        self.metadata['tables'] = self.metadata['tables'][-1:]
+        self.assertFalse(self.dialect.has_table(self.connection, 'one_row'))
+        self.assertFalse(self.dialect.has_table(self.connection, 'one_row', schema='d_fault'))
+
+    def test_get_columns(self):
+        columns = self.dialect.get_columns(self.connection, 'one_row')
+        self.assertEqual([c['name'] for c in columns], ['a', 'b'])
+        self.assertEqual([c['type'] for c in columns], [HiveDecimal, types.String])
+        self.assertEqual(self.calls, [('columns', {'schema': 'default', 'table': 'one_row'})])
+        self.metadata['columns'] = self.metadata['columns'][-1:]
+        self.assertRaises(NoSuchTableError, self.dialect.get_columns, self.connection, 'one_row')
+
+    def test_get_columns_cached(self):
+        info_cache = {}
+        for table in ['one_row', 'oneXrow', 'one_row']:
+            self.dialect.get_columns(self.connection, table, info_cache=info_cache)
+        self.assertRaises(
+            NoSuchTableError, self.dialect.get_columns, self.connection, 'view_1',
+            info_cache=info_cache)
+        # One call for the whole schema
+        self.assertEqual(self.calls, [('columns', {'schema': 'default'})])
+
+    @unittest.skipIf(sqlalchemy_version < 2.0, "get_multi_columns is new in SQLAlchemy 2.0")
+    def test_get_multi_columns(self):
+        self.metadata['tables'] = self.metadata['tables'][:1]
+        from sqlalchemy.engine.reflection import ObjectKind, ObjectScope
+        columns = dict(self.dialect.get_multi_columns(
+            self.connection, schema=None, filter_names=None, kind=ObjectKind.TABLE,
+            scope=ObjectScope.DEFAULT, info_cache={}))
+        self.assertEqual(
+            [c['name'] for c in columns[(None, 'one_row')]], ['a', 'b'])
+        self.assertEqual(
+            [method for method, _kwargs in self.calls if method == 'columns'], ['columns'])
+
+    def test_get_indexes_cached(self):
+        self.connection.execute.return_value.fetchall.return_value = [
+            ('tableName:one_row',),
+            ('partitionColumns:struct partition_columns { string ds, decimal(2,0) hr}',),
+            ('',),
+            ('tableName:onexrow',),
+            ('partitionColumns:',),
+        ]
+        info_cache = {}
+        self.assertEqual(
+            self.dialect.get_indexes(self.connection, 'one_row', info_cache=info_cache),
+            [{'name': 'partition', 'column_names': ['ds', 'hr'], 'unique': False}])
+        self.assertEqual(
+            self.dialect.get_indexes(self.connection, 'oneXrow', info_cache=info_cache), [])
+        self.assertEqual(self.connection.execute.call_count, 1)
+        self.assertEqual(
+            str(self.connection.execute.call_args[0][0]),
+            "SHOW TABLE EXTENDED IN default LIKE '*'")
@@ -62,6 +62,7 @@ class Cursor(PrestoCursor):
     Cursors are not isolated, i.e., any changes done to the database by a cursor are immediately
     visible by other cursors or connections.
     """
+    _escaper = _escaper
 
     def execute(self, operation, parameters=None):
         """Prepare and execute a database operation (query or command).
@@ -123,9 +124,7 @@ class Cursor(PrestoCursor):
             self._session_props[propname] = propval
         if 'data' in response_json:
             assert self._columns
-            new_data = response_json['data']
-            self._process_data(new_data)
-            self._data += map(tuple, new_data)
+            self._data += self._rows(response_json['data'])
         if 'nextUri' not in response_json:
             self._state = self._STATE_FINISHED
         if 'error' in response_json:
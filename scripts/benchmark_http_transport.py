@@ -0,0 +1,119 @@
+"""Measure the latency of Thrift calls over HTTP with ``THttpClient`` and with
+:py:class:`pyhive.http_transport.RequestsTransport`.
+
+Starts a local HTTP/1.1 server answering ``GetInfo`` calls, then makes the same calls with each
+transport. Pass a certificate and key file to use HTTPS, which makes the cost of connecting for
+every call more visible.
+
+Usage::
+
+    PYTHONPATH=. python scripts/benchmark_http_transport.py [CALLS] [CERTFILE KEYFILE]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import ssl
+import sys
+import threading
+import time
+import warnings
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+import requests
+from thrift.protocol.TBinaryProtocol import TBinaryProtocol
+from thrift.transport.THttpClient import THttpClient
+from thrift.transport.TTransport import TBufferedTransport
+from thrift.transport.TTransport import TMemoryBuffer
+
+from TCLIService import TCLIService
+from TCLIService import ttypes
+from pyhive.http_transport import RequestsTransport
+
+
+class Handler(object):
+    def GetInfo(self, req):
+        return ttypes.TGetInfoResp(
+            status=ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS),
+            infoValue=ttypes.TGetInfoValue(stringValue='Hive'))
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, which would wait for delayed ACKs on kept-alive
+    # connections. Real servers buffer the response instead.
+    disable_nagle_algorithm = True
+    processor = TCLIService.Processor(Handler())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        out = TMemoryBuffer()
+        self.processor.process(TBinaryProtocol(TMemoryBuffer(body)), TBinaryProtocol(out))
+        data = out.getvalue()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-thrift')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def measure(client, calls):
+    req = ttypes.TGetInfoReq(
+        sessionHandle=ttypes.TSessionHandle(), infoType=ttypes.TGetInfoType.CLI_DBMS_NAME)
+    latencies = []
+    for _ in range(calls):
+        start = time.time()
+        client.GetInfo(req)
+        latencies.append(time.time() - start)
+    latencies.sort()
+    return (sum(latencies) / calls, latencies[calls // 2], latencies[int(calls * 0.99)])
+
+
+def main(calls=2000, certfile=None, keyfile=None):
+    # The test certificate isn't verified
+    warnings.simplefilter('ignore')
+    server = Server(('127.0.0.1', 0), RequestHandler)
+    scheme = 'http'
+    client_context = None
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+        client_context = ssl._create_unverified_context()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = '{}://127.0.0.1:{}/cliservice/'.format(scheme, server.server_address[1])
+
+    thrift_transport = TBufferedTransport(THttpClient(url, ssl_context=client_context))
+    session = requests.Session()
+    requests_transport = RequestsTransport(url, session, {'verify': False})
+    print('{} calls over {}'.format(calls, scheme))
+    print('{:<16} {:>10} {:>10} {:>10}'.format('transport', 'mean ms', 'p50 ms', 'p99 ms'))
+    for name, transport in [('THttpClient', thrift_transport),
+                            ('RequestsTransport', requests_transport)]:
+        transport.open()
+        client = TCLIService.Client(TBinaryProtocol(transport))
+        measure(client, 10)
+        stats = measure(client, calls)
+        print('{:<16} {:10.3f} {:10.3f} {:10.3f}'.format(name, *[s * 1000 for s in stats]))
+        transport.close()
+    session.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(*([int(args[0])] + args[1:] if args else []))
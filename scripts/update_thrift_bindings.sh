@@ -17,5 +17,5 @@ curl -o $tmpdir/TCLIService.thrift \
 # Apply patch that adds legacy GetLog methods
 patch -d $tmpdir < $scriptdir/thrift-patches/TCLIService.patch
 
-thrift -r --gen py -out $scriptdir/../ $tmpdir/TCLIService.thrift
+thrift -r --gen py:slots -out $scriptdir/../ $tmpdir/TCLIService.thrift
 rm $scriptdir/../__init__.py
@@ -31,7 +31,7 @@ setup(
     author="Jing Wang",
     author_email="jing@dropbox.com",
     license="Apache License, Version 2.0",
-    packages=['pyhive', 'TCLIService'],
+    packages=['pyhive', 'pyhive.aio', 'TCLIService'],
     classifiers=[
         "Intended Audience :: Developers",
         "License :: OSI Approved :: Apache Software License",
@@ -45,13 +45,19 @@ setup(
     extras_require={
         'presto': ['requests>=1.0.0'],
         'trino': ['requests>=1.0.0'],
-        'hive': ['sasl>=0.2.1', 'thrift>=0.10.0', 'thrift_sasl>=0.1.0'],
-        'hive_pure_sasl': ['pure-sasl>=0.6.2', 'thrift>=0.10.0', 'thrift_sasl>=0.1.0'],
+        'aio': ['aiohttp>=3.0', 'requests>=1.0.0'],
+        'hive': ['sasl>=0.2.1', 'thrift>=0.10.0'],
+        'hive_pure_sasl': ['pure-sasl>=0.6.2', 'thrift>=0.10.0'],
+        'hive_http': ['requests>=1.0.0', 'thrift>=0.10.0'],
         'sqlalchemy': ['sqlalchemy>=1.3.0'],
         'kerberos': ['requests_kerberos>=0.12.0'],
     },
     tests_require=[
+        'aiohttp',
         'mock>=1.0.0',
+        'numpy',
+        'pandas',
+        'pyarrow',
         'pytest',
         'pytest-cov',
         'requests>=1.0.0',